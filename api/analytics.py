@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análises de preço das obras (/api/v1/analytics) calculadas com NumPy
+As colunas numéricas de obras (valor, lances) e os códigos das dimensões (artista, categoria,
+leiloeiro, scraper) são carregados em blocos para arrays NumPy e mantidos em memória; todos os
+cálculos (percentis, agrupamentos, correlações) são vetorizados sobre esses arrays
+
+O cache vale até chegarem dados novos: cada requisição confere (total de obras, maior id, última
+atualização de preço); obras novas são anexadas aos arrays sem recarregar as antigas e mudanças
+de preço ou exclusões recarregam tudo
+"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, case, cast, Float
+from sqlalchemy.orm import Session
+
+from database import get_db, Obra, Artista
+from database.blocos import iterar_em_blocos
+
+
+# Valor da obra como número no SQL, no formato brasileiro ("1.234,56") ou com ponto decimal
+# ("1,234.56", comum no LeilõesBR); valores vazios, N/A ou zero viram NULL (fora das médias)
+_VALOR_SEM_MOEDA = func.trim(func.replace(Obra.valor, 'R$', ''))
+VALOR_NUMERICO = func.nullif(
+    cast(case(
+        (_VALOR_SEM_MOEDA.like('%.__'), func.replace(_VALOR_SEM_MOEDA, ',', '')),
+        else_=func.replace(func.replace(_VALOR_SEM_MOEDA, '.', ''), ',', '.')
+    ), Float), 0
+)
+
+TAMANHO_BLOCO_ANALISE = 50000
+PERCENTIS = (5, 10, 25, 50, 75, 90, 95, 99)
+FAIXAS_PRECO = (0, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 500000, np.inf)
+FAIXAS_LANCES = (0, 1, 3, 6, 11, 21, np.inf)
+VALORES_VAZIOS = ('', 'N/A', 'nao tem')
+
+router = APIRouter()
+
+
+class _Dimensao:
+    """Códigos inteiros (-1 = vazio) para uma coluna de texto: categoria, leiloeiro ou scraper"""
+    
+    def __init__(self):
+        self.nomes: List[str] = []
+        self._codigos: Dict[str, int] = {}
+    
+    def codificar(self, valores: pd.Series) -> np.ndarray:
+        locais, unicos = pd.factorize(valores.where(~valores.isin(VALORES_VAZIOS)))
+        if not len(unicos):
+            return np.full(len(valores), -1, dtype=np.int32)
+        globais = np.array([self._codigo(nome) for nome in unicos], dtype=np.int32)
+        return np.where(locais >= 0, globais[locais], -1).astype(np.int32)
+    
+    def _codigo(self, nome: str) -> int:
+        codigo = self._codigos.get(nome)
+        if codigo is None:
+            codigo = self._codigos[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        return codigo
+    
+    def codigo(self, nome: str) -> int:
+        return self._codigos.get(nome, -2)  # -2: não casa com nenhuma obra
+
+
+class DadosObras:
+    """Arrays paralelos (um elemento por obra) com as colunas usadas nas análises"""
+    
+    COLUNAS = ('id', 'valor', 'numero_lances', 'artista_id', 'categoria', 'leiloeiro', 'scraper_name')
+    
+    def __init__(self):
+        self.valor = np.empty(0, dtype=np.float64)  # NaN = sem valor
+        self.lances = np.empty(0, dtype=np.float64)  # NaN = sem informação
+        self.artista = np.empty(0, dtype=np.int64)  # -1 = sem artista
+        self.categoria = np.empty(0, dtype=np.int32)
+        self.leiloeiro = np.empty(0, dtype=np.int32)
+        self.scraper = np.empty(0, dtype=np.int32)
+        self.categorias = _Dimensao()
+        self.leiloeiros = _Dimensao()
+        self.scrapers = _Dimensao()
+        self.maior_id = 0
+    
+    def __len__(self) -> int:
+        return len(self.valor)
+    
+    def carregar(self, db: Session, tamanho_bloco: int = TAMANHO_BLOCO_ANALISE):
+        """Anexa as obras com id maior que o último carregado"""
+        consulta = db.query(
+            Obra.id, VALOR_NUMERICO.label('valor'), Obra.numero_lances, Obra.artista_id,
+            Obra.categoria, Obra.leiloeiro, Obra.scraper_name
+        ).filter(Obra.id > self.maior_id)
+        
+        partes: Dict[str, List[np.ndarray]] = {nome: [] for nome in ('valor', 'lances', 'artista', 'categoria', 'leiloeiro', 'scraper')}
+        for bloco in iterar_em_blocos(db, consulta, tamanho_bloco=tamanho_bloco):
+            tabela = pd.DataFrame.from_records(bloco, columns=self.COLUNAS)
+            partes['valor'].append(pd.to_numeric(tabela['valor'], errors='coerce').to_numpy(np.float64))
+            partes['lances'].append(pd.to_numeric(tabela['numero_lances'], errors='coerce').to_numpy(np.float64))
+            partes['artista'].append(tabela['artista_id'].fillna(-1).to_numpy(np.int64))
+            partes['categoria'].append(self.categorias.codificar(tabela['categoria']))
+            partes['leiloeiro'].append(self.leiloeiros.codificar(tabela['leiloeiro']))
+            partes['scraper'].append(self.scrapers.codificar(tabela['scraper_name']))
+            self.maior_id = int(tabela['id'].iloc[-1])
+        
+        if partes['valor']:
+            self.valor = np.concatenate([self.valor] + partes['valor'])
+            self.lances = np.concatenate([self.lances] + partes['lances'])
+            self.artista = np.concatenate([self.artista] + partes['artista'])
+            self.categoria = np.concatenate([self.categoria] + partes['categoria'])
+            self.leiloeiro = np.concatenate([self.leiloeiro] + partes['leiloeiro'])
+            self.scraper = np.concatenate([self.scraper] + partes['scraper'])
+
+
+def _quantis_ordenados(valores: np.ndarray, inicios: np.ndarray, contagens: np.ndarray, q: float) -> np.ndarray:
+    """Quantil q (interpolação linear) de cada grupo de um array ordenado por grupo e valor"""
+    posicao = inicios + (contagens - 1) * q
+    baixo = np.floor(posicao).astype(np.int64)
+    alto = np.ceil(posicao).astype(np.int64)
+    return valores[baixo] + (valores[alto] - valores[baixo]) * (posicao - baixo)
+
+
+def estatisticas_por_grupo(codigos: np.ndarray, valores: np.ndarray, minimo_obras: int = 1,
+                           limite: Optional[int] = None, ordenados: bool = False) -> List[Dict]:
+    """
+    Contagem, média, mediana, p25 e p75 dos valores por código de grupo (códigos < 0 ignorados),
+    dos grupos com mais obras primeiro
+    ordenados: valores já em ordem crescente (evita ordenar os valores de novo a cada dimensão)
+    """
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+    if not len(valores):
+        return []
+    
+    # Ordena por grupo mantendo a ordem dos valores dentro do grupo (argsort estável)
+    if not ordenados:
+        ordem = np.argsort(valores, kind='stable')
+        codigos, valores = codigos[ordem], valores[ordem]
+    ordem = np.argsort(codigos, kind='stable')
+    codigos, valores = codigos[ordem], valores[ordem]
+    grupos, inicios, contagens = np.unique(codigos, return_index=True, return_counts=True)
+    somas = np.add.reduceat(valores, inicios)
+    
+    selecionados = np.flatnonzero(contagens >= minimo_obras)
+    selecionados = selecionados[np.argsort(-contagens[selecionados], kind='stable')]
+    if limite:
+        selecionados = selecionados[:limite]
+    grupos, inicios, contagens, somas = grupos[selecionados], inicios[selecionados], contagens[selecionados], somas[selecionados]
+    
+    medianas = _quantis_ordenados(valores, inicios, contagens, 0.5)
+    p25 = _quantis_ordenados(valores, inicios, contagens, 0.25)
+    p75 = _quantis_ordenados(valores, inicios, contagens, 0.75)
+    return [
+        {
+            'codigo': int(grupos[i]),
+            'obras': int(contagens[i]),
+            'media': round(float(somas[i] / contagens[i]), 2),
+            'mediana': round(float(medianas[i]), 2),
+            'p25': round(float(p25[i]), 2),
+            'p75': round(float(p75[i]), 2)
+        }
+        for i in range(len(grupos))
+    ]
+
+
+def _correlacao(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+    if len(x) < 3 or np.std(x) == 0 or np.std(y) == 0:
+        return None
+    return round(float(np.corrcoef(x, y)[0, 1]), 4)
+
+
+def _rotulo_faixa(inicio: float, fim: float, inteiros: bool = False) -> str:
+    if np.isinf(fim):
+        return f"{inicio:g}+"
+    if inteiros:
+        return f"{inicio:g}" if fim - inicio == 1 else f"{inicio:g}-{fim - 1:g}"
+    return f"{inicio:g}-{fim:g}"
+
+
+def calcular_analises(dados: DadosObras, nomes_artistas, scraper: Optional[str] = None,
+                      limite: int = 20, minimo_obras: int = 3) -> Dict:
+    """
+    Distribuição de preços, estatísticas por artista/categoria/leiloeiro e relação lances x preço
+    nomes_artistas: função que recebe os ids de artista e retorna {id: nome}
+    """
+    do_scraper = dados.scraper == dados.scrapers.codigo(scraper) if scraper else np.ones(len(dados), dtype=bool)
+    filtro = do_scraper & ~np.isnan(dados.valor)
+    # Valores em ordem crescente; as colunas das dimensões seguem a mesma ordem
+    ordem = np.argsort(dados.valor[filtro], kind='stable')
+    valores = dados.valor[filtro][ordem]
+    
+    resultado = {
+        'total_obras': int(np.count_nonzero(do_scraper)),
+        'obras_com_valor': int(len(valores)),
+        'distribuicao': None,
+        'por_artista': [],
+        'por_categoria': [],
+        'por_leiloeiro': [],
+        'lances_x_preco': None
+    }
+    if not len(valores):
+        return resultado
+    
+    # Distribuição
+    contagens, _ = np.histogram(valores, bins=FAIXAS_PRECO)
+    resultado['distribuicao'] = {
+        'minimo': round(float(valores.min()), 2),
+        'maximo': round(float(valores.max()), 2),
+        'media': round(float(valores.mean()), 2),
+        'percentis': {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTIS, np.percentile(valores, PERCENTIS))},
+        'faixas': [
+            {'faixa': _rotulo_faixa(FAIXAS_PRECO[i], FAIXAS_PRECO[i + 1]), 'obras': int(contagens[i])}
+            for i in range(len(contagens))
+        ]
+    }
+    
+    # Por dimensão
+    por_artista = estatisticas_por_grupo(dados.artista[filtro][ordem], valores, minimo_obras, limite, ordenados=True)
+    nomes = nomes_artistas([grupo['codigo'] for grupo in por_artista])
+    for grupo in por_artista:
+        grupo['artista_id'] = grupo.pop('codigo')
+        grupo['nome'] = nomes.get(grupo['artista_id'])
+    resultado['por_artista'] = por_artista
+    
+    for chave, codigos, dimensao in (('por_categoria', dados.categoria, dados.categorias),
+                                     ('por_leiloeiro', dados.leiloeiro, dados.leiloeiros)):
+        grupos = estatisticas_por_grupo(codigos[filtro][ordem], valores, minimo_obras, limite, ordenados=True)
+        for grupo in grupos:
+            grupo['nome'] = dimensao.nomes[grupo.pop('codigo')]
+        resultado[chave] = grupos
+    
+    # Lances x preço final
+    lances = dados.lances[filtro][ordem]
+    com_lances = ~np.isnan(lances)
+    x, y = lances[com_lances], valores[com_lances]
+    if len(x):
+        postos_x = pd.Series(x).rank().to_numpy()
+        postos_y = pd.Series(y).rank().to_numpy()
+        faixas = np.searchsorted(FAIXAS_LANCES, x, side='right') - 1
+        por_faixa = sorted(estatisticas_por_grupo(faixas, y, ordenados=True), key=lambda grupo: grupo['codigo'])
+        for grupo in por_faixa:
+            indice = grupo.pop('codigo')
+            grupo['lances'] = _rotulo_faixa(FAIXAS_LANCES[indice], FAIXAS_LANCES[indice + 1], inteiros=True)
+        resultado['lances_x_preco'] = {
+            'obras': int(len(x)),
+            'pearson': _correlacao(x, y),
+            'pearson_log_preco': _correlacao(x, np.log10(y)),
+            'spearman': _correlacao(postos_x, postos_y),
+            'por_faixa_de_lances': por_faixa
+        }
+    return resultado
+
+
+class AnaliseMercado:
+    """Arrays das obras e resultados das análises em cache até chegarem dados novos (thread-safe)"""
+    
+    def __init__(self):
+        self.dados = DadosObras()
+        self.versao: Optional[Tuple] = None
+        self.resultados: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _versao(db: Session) -> Tuple:
+        total, maior_id, ultima_atualizacao = db.query(
+            func.count(Obra.id), func.max(Obra.id), func.max(Obra.ultima_atualizacao)
+        ).one()
+        return total, maior_id or 0, ultima_atualizacao
+    
+    def _atualizar(self, db: Session):
+        versao = self._versao(db)
+        if versao == self.versao:
+            return
+        
+        # Só obras novas (mesmos preços, mais obras): anexar; senão recarregar tudo
+        if (self.versao is not None and versao[2] == self.versao[2] and versao[1] > self.versao[1]
+                and versao[0] > self.versao[0]):
+            self.dados.carregar(db)
+            if len(self.dados) != versao[0]:
+                self.dados = DadosObras()
+                self.dados.carregar(db)
+        else:
+            self.dados = DadosObras()
+            self.dados.carregar(db)
+        self.versao = versao
+        self.resultados = {}
+    
+    def obter(self, db: Session, scraper: Optional[str] = None, limite: int = 20, minimo_obras: int = 3) -> Dict:
+        with self._lock:
+            self._atualizar(db)
+            chave = (scraper, limite, minimo_obras)
+            if chave not in self.resultados:
+                def nomes_artistas(ids):
+                    if not ids:
+                        return {}
+                    return dict(db.query(Artista.id, Artista.nome).filter(Artista.id.in_(ids)).all())
+                
+                resultado = calcular_analises(self.dados, nomes_artistas, scraper, limite, minimo_obras)
+                resultado['calculado_em'] = datetime.utcnow().isoformat()
+                self.resultados[chave] = resultado
+            return self.resultados[chave]
+
+
+ANALISE_MERCADO = AnaliseMercado()
+
+
+@router.get("/api/v1/analytics")
+def analises_de_preco(
+    scraper: Optional[str] = None,
+    limite: int = Query(20, ge=1, le=500),
+    minimo_obras: int = Query(3, ge=1),
+    db: Session = Depends(get_db)
+):
+    """
+    Distribuição de preços, mediana/percentis por artista, categoria e leiloeiro e correlação
+    entre número de lances e preço final (limite: grupos por dimensão; minimo_obras: obras por grupo)
+    """
+    inicio = time.perf_counter()
+    try:
+        resultado = dict(ANALISE_MERCADO.obter(db, scraper, limite, minimo_obras))
+    except Exception as e:
+        import traceback
+        print(f"[ANALYTICS] ERRO ao calcular análises: {e}")
+        print(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Erro ao calcular análises: {str(e)}")
+    resultado['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+    return resultado
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportação das obras (/api/v1/obras/export) em CSV, Excel ou JSON numa única requisição
+As obras são lidas em blocos paginados por id, cada um numa leitura curta (o banco não fica
+bloqueado para os scrapers durante o download), e enviadas conforme são lidas: CSV e JSON saem
+em blocos (chunked), o Excel é gravado com o modo write-only do openpyxl (linha a linha, sem
+manter a planilha na memória) num arquivo temporário enviado em blocos no fim.
+Memória constante no servidor, sem paginar /api/v1/obras nem repetir o count() a cada página
+"""
+
+import io
+import os
+import csv
+import json
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from sqlalchemy import select
+
+from database import engine, Obra, iterar_select_em_blocos
+
+
+LINHAS_POR_LEITURA = 1000  # Linhas por bloco lido do banco
+LINHAS_POR_BLOCO = 1000  # Linhas de CSV/JSON por bloco enviado
+BYTES_POR_BLOCO = 64 * 1024  # Blocos do arquivo Excel
+
+# Colunas lidas do banco (e campos do formato json)
+CAMPOS_OBRA = (
+    'id', 'scraper_name', 'nome_artista', 'titulo', 'categoria', 'valor', 'valor_atualizado',
+    'numero_lances', 'lote', 'data_leilao', 'data_inicio_leilao', 'leiloeiro', 'local',
+    'url', 'url_original', 'data_coleta'
+)
+
+# Colunas das planilhas (CSV e Excel): cabeçalho, valor a partir da linha e largura no Excel
+COLUNAS_PLANILHA = (
+    ('ID', lambda obra: obra['id'], 8),
+    ('Artista', lambda obra: obra['nome_artista'] or 'N/A', 25),
+    ('Título', lambda obra: obra['titulo'] or 'N/A', 40),
+    ('Categoria', lambda obra: obra['categoria'] or 'N/A', 20),
+    ('Valor', lambda obra: obra['valor'] or 'N/A', 15),
+    ('Lances', lambda obra: obra['numero_lances'] if obra['numero_lances'] is not None else 0, 10),
+    ('Lote', lambda obra: obra['lote'] or 'N/A', 10),
+    ('Data Início Leilão', lambda obra: obra['data_inicio_leilao'] or obra['data_leilao'] or 'N/A', 18),
+    ('Data Coleta', lambda obra: obra['data_coleta'].strftime('%d/%m/%Y') if obra['data_coleta'] else 'N/A', 12),
+    ('Leiloeiro', lambda obra: obra['leiloeiro'] or 'N/A', 25),
+    ('Local', lambda obra: obra['local'] or 'N/A', 20),
+    ('URL', lambda obra: obra['url_original'] or obra['url'] or 'N/A', 50),
+    ('Scraper', lambda obra: obra['scraper_name'] or 'N/A', 15),
+)
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'json': 'application/json',
+}
+
+router = APIRouter()
+
+
+def filtrar_obras(consulta, scraper: Optional[str] = None, categoria: Optional[str] = None,
+                  artista: Optional[str] = None, artista_id: Optional[int] = None):
+    """Filtros de /api/v1/obras (vale para Query do ORM e para select)"""
+    if scraper:
+        consulta = consulta.filter(Obra.scraper_name == scraper)
+    if categoria:
+        consulta = consulta.filter(Obra.categoria == categoria)
+    if artista_id:
+        consulta = consulta.filter(Obra.artista_id == artista_id)
+    if artista:
+        consulta = consulta.filter(Obra.nome_artista.ilike(f"%{artista}%"))
+    return consulta
+
+
+def _linhas_obras(consulta, limite: Optional[int] = None) -> Iterator[Dict]:
+    """Linhas da consulta, mais recentes (maior id) primeiro, lidas em blocos de LINHAS_POR_LEITURA"""
+    for bloco in iterar_select_em_blocos(engine, consulta, Obra.id, tamanho_bloco=LINHAS_POR_LEITURA,
+                                         limite=limite, decrescente=True):
+        for linha in bloco:
+            yield linha._mapping
+
+
+def _valores_planilha(obra) -> List:
+    return [valor(obra) for _, valor, _ in COLUNAS_PLANILHA]
+
+
+def gerar_csv(consulta, limite: Optional[int] = None) -> Iterator[bytes]:
+    """CSV com BOM (abre com acentos no Excel), enviado a cada LINHAS_POR_BLOCO linhas"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write('\ufeff')
+    escritor.writerow([cabecalho for cabecalho, _, _ in COLUNAS_PLANILHA])
+    
+    for numero, obra in enumerate(_linhas_obras(consulta, limite), 1):
+        escritor.writerow(_valores_planilha(obra))
+        if numero % LINHAS_POR_BLOCO == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue().encode('utf-8')
+
+
+def gerar_json(consulta, limite: Optional[int] = None) -> Iterator[bytes]:
+    """Array JSON de obras (campos de CAMPOS_OBRA), enviado a cada LINHAS_POR_BLOCO obras"""
+    bloco = []
+    separador = ''
+    yield b'['
+    for obra in _linhas_obras(consulta, limite):
+        dados = dict(obra)
+        dados['data_coleta'] = dados['data_coleta'].isoformat() if dados['data_coleta'] else None
+        bloco.append(json.dumps(dados, ensure_ascii=False))
+        if len(bloco) >= LINHAS_POR_BLOCO:
+            yield (separador + ','.join(bloco)).encode('utf-8')
+            separador = ','
+            bloco = []
+    if bloco:
+        yield (separador + ','.join(bloco)).encode('utf-8')
+    yield b']'
+
+
+def gerar_xlsx(consulta, limite: Optional[int] = None) -> Iterator[bytes]:
+    """Planilha Excel gravada em modo write-only num arquivo temporário e enviada em blocos"""
+    descritor, caminho = tempfile.mkstemp(suffix='.xlsx')
+    os.close(descritor)
+    try:
+        livro = Workbook(write_only=True)
+        planilha = livro.create_sheet('Obras')
+        for indice, (_, _, largura) in enumerate(COLUNAS_PLANILHA, 1):
+            planilha.column_dimensions[get_column_letter(indice)].width = largura
+        planilha.freeze_panes = 'A2'
+        
+        cabecalho = []
+        for texto, _, _ in COLUNAS_PLANILHA:
+            celula = WriteOnlyCell(planilha, value=texto)
+            celula.font = Font(bold=True)
+            cabecalho.append(celula)
+        planilha.append(cabecalho)
+        
+        for obra in _linhas_obras(consulta, limite):
+            # Caracteres de controle vindos das páginas não são aceitos no XML do Excel
+            planilha.append([ILLEGAL_CHARACTERS_RE.sub('', valor) if isinstance(valor, str) else valor
+                             for valor in _valores_planilha(obra)])
+        livro.save(caminho)
+        
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(BYTES_POR_BLOCO), b''):
+                yield bloco
+    finally:
+        os.remove(caminho)
+
+
+GERADORES = {'csv': gerar_csv, 'xlsx': gerar_xlsx, 'json': gerar_json}
+
+
+@router.get("/api/v1/obras/export")
+def exportar_obras(
+    formato: str = Query("csv", alias="format", pattern="^(csv|xlsx|json)$"),
+    scraper: Optional[str] = None,
+    categoria: Optional[str] = None,
+    artista: Optional[str] = None,
+    artista_id: Optional[int] = None,
+    limite: Optional[int] = Query(None, ge=1),
+):
+    """
+    Todas as obras dos filtros de /api/v1/obras numa única resposta em streaming
+    format: csv, xlsx ou json (array com os campos brutos); limite: número máximo de obras (mais recentes primeiro)
+    """
+    consulta = select(*(getattr(Obra, campo) for campo in CAMPOS_OBRA))
+    consulta = filtrar_obras(consulta, scraper, categoria, artista, artista_id)
+    
+    nome_arquivo = f"obras_{scraper or 'todas'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+    return StreamingResponse(
+        GERADORES[formato](consulta, limite),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    )
@@ -5,15 +5,17 @@ API FastAPI Profissional - Sistema de Web Scraping
 Interface moderna com banco de dados, paginação e dashboard
 """
 
+import os
 import sys
 import json
+import time
 import threading
 from pathlib import Path
 from typing import Optional, List
 from datetime import datetime, timedelta
 
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Depends, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
@@ -26,11 +28,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.iarremate_scraper import IArremateScraper
 from src.leiloes_br_scraper import LeiloesBRScraper
-from database import init_db, get_db, ScrapingSession, Obra, engine
+from src.normalizacao import chave_artista
+from src.metricas import REGISTRO, API_REQUISICOES, API_REQUISICAO_SEGUNDOS, BANCO_ESCRITA_SEGUNDOS, FILA_PROFUNDIDADE
+from database import atualizar_schema, get_db, ScrapingSession, Obra, CheckpointScraping, Artista, engine, salvar_obras_coletadas
+from api.analytics import router as router_analytics, VALOR_NUMERICO
+from api.exportacao import router as router_exportacao, filtrar_obras
 
 # Inicializar banco de dados
 try:
-    init_db()
+    atualizar_schema()
     print("✅ Banco de dados inicializado com sucesso")
 except Exception as e:
     print(f"⚠️ Erro ao inicializar banco de dados: {e}")
@@ -72,6 +78,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def medir_requisicoes(request: Request, call_next):
+    """Contagem e latência das requisições por rota (template da rota, não a URL com IDs)"""
+    inicio = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        rota = request.scope.get("route")
+        caminho = rota.path if rota is not None else "nao_encontrada"
+        API_REQUISICAO_SEGUNDOS.observar(time.perf_counter() - inicio, metodo=request.method, rota=caminho)
+        API_REQUISICOES.inc(metodo=request.method, rota=caminho, status=status)
+
 # Templates e arquivos estáticos (para fallback)
 templates_dir = Path(__file__).parent.parent / "templates"
 templates_dir.mkdir(exist_ok=True)
@@ -81,6 +103,10 @@ static_dir = Path(__file__).parent.parent / "static"
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# Análises de preço (/api/v1/analytics) e exportação das obras (/api/v1/obras/export)
+app.include_router(router_analytics)
+app.include_router(router_exportacao)
+
 
 # ==================== MODELOS PYDANTIC ====================
 
@@ -90,7 +116,7 @@ class ScraperRequest(BaseModel):
     categorias: Optional[List[str]] = Field(None, description="Lista de categorias (iArremate: ['quadros', 'esculturas'], LeilõesBR: ['quadros', 'esculturas'])")
     delay_between_requests: float = Field(1.0, ge=0.1, le=10.0, description="Delay entre requisições (segundos)")
     max_retries: int = Field(3, ge=1, le=10, description="Número máximo de tentativas")
-
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -121,7 +147,7 @@ class ObraResponse(BaseModel):
     local: Optional[str] = None
     ultima_atualizacao: Optional[str] = None
     scraper_name: str
-
+    
     class Config:
         from_attributes = True
 
@@ -138,7 +164,8 @@ class SessionResponse(BaseModel):
     arquivo_saida: Optional[str] = None
     erro: Optional[str] = None
     categorias: Optional[str] = None
-
+    relatorio_desempenho: Optional[dict] = None  # Ver DesempenhoSessao.resumo (src/metricas.py)
+    
     class Config:
         from_attributes = True
 
@@ -147,23 +174,89 @@ class SessionResponse(BaseModel):
 
 # Armazenar scrapers ativos para poder parar
 _scrapers_ativos = {}
+FILA_PROFUNDIDADE.definir_funcao(lambda: len(_scrapers_ativos), fila="api_scrapers_ativos")
 
-def executar_iarremate(session_id: int, request: ScraperRequest):
-    """Executa o scraper do iArremate e salva no banco"""
+# Scrapers disponíveis por nome (scraper_name da sessão)
+SCRAPERS = {
+    "iarremate": IArremateScraper,
+    "leiloes_br": LeiloesBRScraper,
+}
+NOMES_EXIBICAO = {
+    "iarremate": "iArremate",
+    "leiloes_br": "LeilõesBR",
+}
+
+# Retomar automaticamente, ao iniciar a API, sessões órfãs que têm checkpoint
+RETOMAR_SESSOES_AO_INICIAR = os.getenv("RETOMAR_SESSOES_AO_INICIAR", "1") == "1"
+
+
+def _salvar_checkpoint(db: Session, session_id: int, scraper_name: str, estado: dict, parametros: dict):
+    """Grava (ou atualiza) o checkpoint da sessão (sem commit)"""
+    checkpoint = db.query(CheckpointScraping).filter(CheckpointScraping.session_id == session_id).first()
+    if not checkpoint:
+        checkpoint = CheckpointScraping(session_id=session_id, scraper_name=scraper_name)
+        db.add(checkpoint)
+    
+    checkpoint.categoria = estado.get("categoria")
+    checkpoint.ultima_pagina = estado.get("ultima_pagina") or 0
+    checkpoint.total_paginas = estado.get("total_paginas")
+    checkpoint.urls_pendentes = json.dumps(estado.get("urls_pendentes") or [])
+    checkpoint.parametros = json.dumps(parametros)
+    checkpoint.atualizado_em = datetime.utcnow()
+
+
+def _carregar_checkpoint(db: Session, session_id: int) -> Optional[dict]:
+    """Retorna o estado salvo no checkpoint da sessão (formato de BaseScraper.progresso)"""
+    checkpoint = db.query(CheckpointScraping).filter(CheckpointScraping.session_id == session_id).first()
+    if not checkpoint:
+        return None
+    
+    return {
+        "categoria": checkpoint.categoria,
+        "ultima_pagina": checkpoint.ultima_pagina or 0,
+        "total_paginas": checkpoint.total_paginas,
+        "urls_pendentes": json.loads(checkpoint.urls_pendentes or "[]")
+    }
+
+
+def _request_do_checkpoint(checkpoint: CheckpointScraping) -> ScraperRequest:
+    """Reconstrói a requisição original a partir dos parâmetros salvos no checkpoint"""
+    try:
+        return ScraperRequest(**json.loads(checkpoint.parametros or "{}"))
+    except Exception:
+        return ScraperRequest()
+
+
+def executar_scraper(session_id: int, request: ScraperRequest, scraper_name: str, retomar: bool = False):
+    """
+    Executa um scraper e salva no banco incrementalmente
+    
+    As obras são gravadas junto com o checkpoint (categoria, última página e URLs pendentes)
+    a cada página/10 obras, então uma sessão interrompida pode ser retomada com retomar=True
+    """
     from database import get_db_sync
     db = get_db_sync()
+    nome = NOMES_EXIBICAO.get(scraper_name, scraper_name)
     scraper = None
+    
     try:
         # Atualizar status
         session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
         if not session:
             return
         
+        retomar_de = _carregar_checkpoint(db, session_id) if retomar else None
+        if retomar_de:
+            print(f"[{nome}] Retomando sessão {session_id}: {retomar_de['categoria']}, "
+                  f"página {retomar_de['ultima_pagina'] + 1}")
+            session.erro = None
+            session.fim = None
+        
         session.status = "executando"
         db.commit()
         
         # Executar scraper com acesso ao banco para verificar duplicatas
-        scraper = IArremateScraper(
+        scraper = SCRAPERS[scraper_name](
             delay_between_requests=request.delay_between_requests,
             max_retries=request.max_retries,
             db_session=db,
@@ -175,96 +268,84 @@ def executar_iarremate(session_id: int, request: ScraperRequest):
         
         # Passar categorias (padrão: quadros e esculturas)
         categorias = request.categorias if request.categorias else ["quadros", "esculturas"]
-        scraper.executar_scraping(categorias=categorias, max_paginas=request.max_paginas)
-        
-        # Salvar obras no banco (incrementalmente)
-        # IMPORTANTE: Salvar mesmo se foi interrompido!
-        total_obras = 0
-        obras_duplicadas = 0
+        parametros = request.model_dump()
         
-        print(f"[iArremate] Salvando {len(scraper.dados_obras)} obras coletadas no banco...")
+        contadores = {
+            "persistidas": 0,  # Índice em scraper.dados_obras até onde já foi gravado
+            "novas": (session.total_obras or 0) if retomar_de else 0,
+            "duplicadas": 0
+        }
         
-        for dados_obra in scraper.dados_obras:
+        def persistir(estado: Optional[dict] = None):
+            """Grava as obras coletadas desde a última chamada e o checkpoint na mesma transação"""
+            pendentes = scraper.dados_obras[contadores["persistidas"]:]
             try:
-                url_obra = dados_obra.get("URL", "")
-                
-                # Verificar se já existe (dupla verificação)
-                obra_existente = db.query(Obra).filter(
-                    Obra.url == url_obra,
-                    Obra.scraper_name == "iarremate"
-                ).first()
-                
-                if obra_existente:
-                    obras_duplicadas += 1
-                    continue
-                
-                # Parse da data
-                data_coleta_str = dados_obra.get("Data_Coleta", "")
-                if data_coleta_str:
-                    try:
-                        data_coleta = datetime.strptime(data_coleta_str, "%d/%m/%Y %H:%M:%S")
-                    except ValueError:
-                        data_coleta = datetime.utcnow()
-                else:
-                    data_coleta = datetime.utcnow()
-                
-                obra = Obra(
-                    session_id=session_id,
-                    scraper_name="iarremate",
-                    categoria=dados_obra.get("Categoria", "Quadros"),
-                    nome_artista=dados_obra.get("Nome_Artista"),
-                    titulo=dados_obra.get("Titulo"),
-                    descricao=dados_obra.get("Descricao"),
-                    valor=dados_obra.get("Valor"),
-                    lote=dados_obra.get("Lote"),
-                    data_inicio_leilao=dados_obra.get("Data_Inicio_Leilao"),
-                    url=url_obra,
-                    pagina=dados_obra.get("Pagina"),
-                    data_coleta=data_coleta
-                )
-                db.add(obra)
-                total_obras += 1
-                
-                # Commit a cada 10 obras para aparecer em tempo real
-                if total_obras % 10 == 0:
+                with BANCO_ESCRITA_SEGUNDOS.cronometrar(operacao="api_salvar_obras"):
+                    novas, duplicadas = salvar_obras_coletadas(db, session_id, scraper_name, pendentes)
+                    session.total_obras = contadores["novas"] + novas
+                    session.relatorio_desempenho = json.dumps(scraper.desempenho.resumo(
+                        len(scraper.dados_obras), contadores["duplicadas"] + duplicadas))
+                    if estado is not None:
+                        _salvar_checkpoint(db, session_id, scraper_name, estado, parametros)
                     db.commit()
-                    print(f"[iArremate] {total_obras} obras salvas...")
-                    # Atualizar contador na sessão
-                    session.total_obras = total_obras
-                    db.commit()
-            except Exception as e:
-                print(f"Erro ao salvar obra: {e}")
-                continue
+            except Exception:
+                db.rollback()
+                raise
+            
+            contadores["persistidas"] += len(pendentes)
+            contadores["novas"] += novas
+            contadores["duplicadas"] += duplicadas
+            if novas:
+                print(f"[{nome}] {contadores['novas']} obras salvas...")
         
-        # Commit final
-        db.commit()
+        scraper.ao_registrar_checkpoint = persistir
+        scraper.executar_scraping(
+            categorias=categorias,
+            max_paginas=request.max_paginas,
+            retomar_de=retomar_de
+        )
+        
+        # Salvar obras restantes (IMPORTANTE: salvar mesmo se foi interrompido!)
+        persistir()
         
         # Salvar planilha também
         arquivo = scraper.salvar_planilha()
         
         # Atualizar sessão
         if scraper._parar_scraping:
+            # Checkpoint mantido: a sessão pode ser retomada em /api/v1/sessions/{id}/resume
             session.status = "interrompido"
-            session.erro = f"Scraping interrompido pelo usuário. {total_obras} obras coletadas."
+            session.erro = f"Scraping interrompido pelo usuário. {contadores['novas']} obras coletadas."
         else:
             session.status = "concluido"
+            db.query(CheckpointScraping).filter(CheckpointScraping.session_id == session_id).delete()
         
-        session.total_obras = total_obras
+        session.total_obras = contadores["novas"]
         session.fim = datetime.utcnow()
         session.arquivo_saida = str(arquivo) if arquivo else None
+        session.categorias = json.dumps(categorias)
         db.commit()
         
-        print(f"[iArremate] Concluído: {total_obras} obras novas, {obras_duplicadas} duplicadas ignoradas")
-        
+        print(f"[{nome}] Concluído: {contadores['novas']} obras novas, "
+              f"{contadores['duplicadas']} duplicadas ignoradas")
+    
     except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        error_msg = f"{str(e)}\n\n{error_trace}"
+        
+        print(f"[ERRO {nome}] {error_msg}")
+        
+        db.rollback()
         session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
         if session:
             session.status = "erro"
-            session.erro = str(e)
+            # Limitar tamanho da mensagem de erro (alguns bancos têm limite)
+            session.erro = error_msg[:1000] if len(error_msg) > 1000 else error_msg
             session.fim = datetime.utcnow()
+            if scraper is not None:
+                session.relatorio_desempenho = json.dumps(scraper.desempenho.resumo(len(scraper.dados_obras)))
             db.commit()
-        import traceback
-        traceback.print_exc()
     finally:
         # Remover scraper dos ativos
         if session_id in _scrapers_ativos:
@@ -272,149 +353,69 @@ def executar_iarremate(session_id: int, request: ScraperRequest):
         db.close()
 
 
-def executar_leiloes_br(session_id: int, request: ScraperRequest):
+def executar_iarremate(session_id: int, request: ScraperRequest, retomar: bool = False):
+    """Executa o scraper do iArremate e salva no banco"""
+    executar_scraper(session_id, request, "iarremate", retomar=retomar)
+
+
+def executar_leiloes_br(session_id: int, request: ScraperRequest, retomar: bool = False):
     """Executa o scraper do LeilõesBR e salva no banco"""
+    executar_scraper(session_id, request, "leiloes_br", retomar=retomar)
+
+
+def varrer_sessoes_orfas():
+    """
+    Trata sessões que ficaram 'executando'/'iniciando' sem scraper ativo (processo reiniciado)
+    Sessões com checkpoint são retomadas; as demais são marcadas como interrompidas
+    """
     from database import get_db_sync
     db = get_db_sync()
     try:
-        # Atualizar status
-        session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-        if not session:
-            return
-        
-        session.status = "executando"
-        db.commit()
-        
-        # Executar scraper
-        scraper = LeiloesBRScraper(
-            delay_between_requests=request.delay_between_requests,
-            max_retries=request.max_retries,
-            db_session=db,
-            session_id=session_id
-        )
+        orfas = db.query(ScrapingSession).filter(
+            ScrapingSession.status.in_(["executando", "iniciando"])
+        ).all()
         
-        # Armazenar scraper para poder parar
-        _scrapers_ativos[session_id] = scraper
-        
-        scraper.executar_scraping(
-            categorias=request.categorias or ["quadros", "esculturas"],
-            max_paginas=request.max_paginas
-        )
-        
-        # Salvar obras no banco (incrementalmente)
-        total_obras = 0
-        obras_duplicadas = 0
-        
-        for dados_obra in scraper.dados_obras:
-            # Verificar se deve parar
-            if scraper._parar_scraping:
-                session.status = "interrompido"
-                session.total_obras = total_obras
-                session.erro = f"Scraping interrompido pelo usuário. {total_obras} obras coletadas."
-                db.commit()
-                return
+        for sessao in orfas:
+            if sessao.id in _scrapers_ativos:
+                continue
             
-            try:
-                # Verificar duplicata por URL
-                url_obra = dados_obra.get("URL", "")
-                if not url_obra:
-                    continue
-                
-                obra_existente = db.query(Obra).filter(
-                    Obra.url == url_obra,
-                    Obra.scraper_name == "leiloes_br"
-                ).first()
-                
-                if obra_existente:
-                    obras_duplicadas += 1
-                    continue
-                
-                # Parse da data
-                data_coleta_str = dados_obra.get("Data_Coleta", "")
-                if data_coleta_str:
-                    try:
-                        data_coleta = datetime.strptime(data_coleta_str, "%d/%m/%Y %H:%M:%S")
-                    except ValueError:
-                        data_coleta = datetime.utcnow()
+            checkpoint = db.query(CheckpointScraping).filter(
+                CheckpointScraping.session_id == sessao.id
+            ).first()
+            
+            if checkpoint and RETOMAR_SESSOES_AO_INICIAR and sessao.scraper_name in SCRAPERS:
+                sessao.status = "iniciando"
+                db.commit()
+                threading.Thread(
+                    target=executar_scraper,
+                    args=(sessao.id, _request_do_checkpoint(checkpoint), sessao.scraper_name, True),
+                    daemon=True
+                ).start()
+                print(f"♻️ Sessão {sessao.id} ({sessao.scraper_name}) retomada do checkpoint: "
+                      f"{checkpoint.categoria}, página {checkpoint.ultima_pagina + 1}")
+            else:
+                sessao.status = "interrompido"
+                sessao.fim = datetime.utcnow()
+                if checkpoint:
+                    sessao.erro = "Processo reiniciado durante o scraping. Checkpoint disponível para retomar."
                 else:
-                    data_coleta = datetime.utcnow()
-                
-                obra = Obra(
-                    session_id=session_id,
-                    scraper_name="leiloes_br",
-                    categoria=dados_obra.get("Categoria"),
-                    nome_artista=dados_obra.get("Nome_Artista"),
-                    titulo=dados_obra.get("Titulo"),
-                    descricao=dados_obra.get("Descricao"),
-                    valor=dados_obra.get("Valor"),
-                    url=url_obra,
-                    url_original=dados_obra.get("URL_Original"),
-                    site_redirecionado=dados_obra.get("Site_Redirecionado"),
-                    lote=dados_obra.get("Lote"),
-                    data_inicio_leilao=dados_obra.get("Data_Inicio_Leilao"),
-                    data_leilao=dados_obra.get("Data_Leilao"),
-                    leiloeiro=dados_obra.get("Leiloeiro"),
-                    local=dados_obra.get("Local"),
-                    pagina=dados_obra.get("Pagina"),
-                    data_coleta=data_coleta
-                )
-                db.add(obra)
-                total_obras += 1
-                
-                # Commit a cada 10 obras para aparecer em tempo real
-                if total_obras % 10 == 0:
-                    db.commit()
-                    session.total_obras = total_obras
-                    db.commit()
-                    print(f"[LeilõesBR] {total_obras} obras salvas...")
-            except Exception as e:
-                print(f"Erro ao salvar obra LeilõesBR: {e}")
-                continue
-        
-        # Salvar planilha também
-        arquivo = scraper.salvar_planilha()
-        
-        # Atualizar sessão
-        if scraper._parar_scraping:
-            session.status = "interrompido"
-            session.erro = f"Scraping interrompido pelo usuário. {total_obras} obras coletadas."
-        else:
-            session.status = "concluido"
-        
-        session.total_obras = total_obras
-        session.fim = datetime.utcnow()
-        session.arquivo_saida = str(arquivo) if arquivo else None
-        session.categorias = json.dumps(request.categorias or [])
-        db.commit()
-        
-        print(f"[LeilõesBR] Concluído: {total_obras} obras novas, {obras_duplicadas} duplicadas ignoradas")
-        
-        # Remover scraper da lista de ativos
-        if session_id in _scrapers_ativos:
-            del _scrapers_ativos[session_id]
-        
+                    sessao.erro = "Processo reiniciado durante o scraping (sem checkpoint)."
+                db.commit()
+                print(f"⚠️ Sessão órfã {sessao.id} ({sessao.scraper_name}) marcada como interrompida")
     except Exception as e:
+        print(f"⚠️ Erro ao verificar sessões órfãs: {e}")
         import traceback
-        error_trace = traceback.format_exc()
-        error_msg = f"{str(e)}\n\n{error_trace}"
-        
-        print(f"[ERRO LeilõesBR] {error_msg}")
-        
-        session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
-        if session:
-            session.status = "erro"
-            # Limitar tamanho da mensagem de erro (alguns bancos têm limite)
-            session.erro = error_msg[:1000] if len(error_msg) > 1000 else error_msg
-            session.fim = datetime.utcnow()
-            db.commit()
-        
-        # Remover scraper da lista de ativos em caso de erro
-        if session_id in _scrapers_ativos:
-            del _scrapers_ativos[session_id]
+        traceback.print_exc()
     finally:
         db.close()
 
 
+@app.on_event("startup")
+async def ao_iniciar():
+    """Ao iniciar a API, retoma ou encerra sessões que ficaram órfãs"""
+    varrer_sessoes_orfas()
+
+
 # ==================== ROTAS WEB (INTERFACE) ====================
 
 @app.get("/", response_class=HTMLResponse)
@@ -557,6 +558,12 @@ async def health_check():
     }
 
 
+@app.get("/api/v1/metrics", response_class=PlainTextResponse)
+async def metricas():
+    """Métricas de desempenho (HTTP, parse, extratores, banco, filas, API) no formato de texto do Prometheus"""
+    return PlainTextResponse(REGISTRO.renderizar(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/api/v1/atualizar-precos")
 async def atualizar_precos_endpoint(background_tasks: BackgroundTasks):
     """Endpoint para atualizar preços das obras manualmente"""
@@ -571,6 +578,59 @@ async def atualizar_precos_endpoint(background_tasks: BackgroundTasks):
     }
 
 
+@app.post("/api/v1/exportacoes/parquet")
+async def exportar_parquet_endpoint(background_tasks: BackgroundTasks):
+    """Gera um novo snapshot Parquet da tabela obras (em background)"""
+    import exportar_parquet
+    
+    if exportar_parquet.pa is None:
+        raise HTTPException(status_code=503, detail="Exportação Parquet requer o pacote pyarrow")
+    
+    background_tasks.add_task(exportar_parquet.exportar_obras_parquet)
+    
+    return {
+        "message": "Exportação Parquet iniciada em background",
+        "status": "processando",
+        "snapshot": "/api/v1/exportacoes/parquet/ultima"
+    }
+
+
+@app.get("/api/v1/exportacoes/parquet/ultima")
+async def ultima_exportacao_parquet():
+    """Manifesto do snapshot Parquet mais recente, com a URL de download de cada arquivo"""
+    from exportar_parquet import ultimo_snapshot
+    
+    snapshot = ultimo_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Nenhum snapshot Parquet gerado (POST /api/v1/exportacoes/parquet)")
+    
+    _, manifesto = snapshot
+    for arquivo in manifesto["arquivos"]:
+        arquivo["url"] = f"/api/v1/exportacoes/parquet/ultima/{arquivo['caminho']}"
+    return manifesto
+
+
+@app.get("/api/v1/exportacoes/parquet/ultima/{caminho:path}")
+async def baixar_arquivo_parquet(caminho: str):
+    """Arquivo de uma partição do snapshot Parquet mais recente (caminho como no manifesto)"""
+    from exportar_parquet import ultimo_snapshot
+    
+    snapshot = ultimo_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Nenhum snapshot Parquet gerado")
+    
+    diretorio, manifesto = snapshot
+    arquivo = next((arquivo for arquivo in manifesto["arquivos"] if arquivo["caminho"] == caminho), None)
+    if arquivo is None:
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado no snapshot")
+    
+    return FileResponse(
+        str(diretorio / arquivo["caminho"]),
+        media_type="application/vnd.apache.parquet",
+        filename=f"{manifesto['snapshot']}_{arquivo['scraper_name']}_{arquivo['mes']}.parquet"
+    )
+
+
 @app.post("/api/v1/iarremate")
 async def iniciar_iarremate(
     request: ScraperRequest,
@@ -653,6 +713,30 @@ async def iniciar_leiloes_br(
         raise HTTPException(status_code=500, detail=f"Erro ao iniciar scraping: {str(e)}")
 
 
+def _sessao_para_dict(sessao: ScrapingSession) -> dict:
+    """Converte a sessão para o formato de SessionResponse (datas em ISO, relatório como objeto)"""
+    relatorio = None
+    if sessao.relatorio_desempenho:
+        try:
+            relatorio = json.loads(sessao.relatorio_desempenho)
+        except ValueError:
+            relatorio = None
+    
+    return {
+        "id": sessao.id,
+        "scraper_name": sessao.scraper_name or "",
+        "status": sessao.status or "desconhecido",
+        "total_obras": int(sessao.total_obras) if sessao.total_obras is not None else 0,
+        "paginas_processadas": int(sessao.paginas_processadas) if sessao.paginas_processadas is not None else 0,
+        "inicio": sessao.inicio.isoformat() if sessao.inicio else None,
+        "fim": sessao.fim.isoformat() if sessao.fim else None,
+        "arquivo_saida": sessao.arquivo_saida or None,
+        "erro": sessao.erro or None,
+        "categorias": sessao.categorias or None,
+        "relatorio_desempenho": relatorio
+    }
+
+
 @app.get("/api/v1/sessions", response_model=List[SessionResponse])
 async def listar_sessoes_api(
     page: int = Query(1, ge=1),
@@ -677,18 +761,7 @@ async def listar_sessoes_api(
         result = []
         for sessao in sessoes:
             try:
-                result.append({
-                    "id": sessao.id,
-                    "scraper_name": sessao.scraper_name or "",
-                    "status": sessao.status or "desconhecido",
-                    "total_obras": int(sessao.total_obras) if sessao.total_obras is not None else 0,
-                    "paginas_processadas": int(sessao.paginas_processadas) if sessao.paginas_processadas is not None else 0,
-                    "inicio": sessao.inicio.isoformat() if sessao.inicio else None,
-                    "fim": sessao.fim.isoformat() if sessao.fim else None,
-                    "arquivo_saida": sessao.arquivo_saida or None,
-                    "erro": sessao.erro or None,
-                    "categorias": sessao.categorias or None
-                })
+                result.append(_sessao_para_dict(sessao))
             except Exception as e:
                 print(f"Erro ao serializar sessão {sessao.id}: {e}")
                 continue
@@ -709,7 +782,7 @@ async def obter_sessao(session_id: int, db: Session = Depends(get_db)):
     session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Sessão não encontrada")
-    return session
+    return _sessao_para_dict(session)
 
 
 @app.post("/api/v1/sessions/{session_id}/stop")
@@ -763,6 +836,47 @@ async def parar_scraping(session_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Erro ao parar scraping: {str(e)}")
 
 
+@app.post("/api/v1/sessions/{session_id}/resume")
+async def retomar_scraping(
+    session_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Retoma uma sessão de scraping interrompida a partir do último checkpoint"""
+    session = db.query(ScrapingSession).filter(ScrapingSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada")
+    
+    if session_id in _scrapers_ativos or session.status == "iniciando":
+        raise HTTPException(status_code=409, detail="Sessão já está em execução")
+    
+    if session.status == "concluido":
+        raise HTTPException(status_code=400, detail="Sessão já foi concluída")
+    
+    if session.scraper_name not in SCRAPERS:
+        raise HTTPException(status_code=400, detail=f"Scraper desconhecido: {session.scraper_name}")
+    
+    checkpoint = db.query(CheckpointScraping).filter(CheckpointScraping.session_id == session_id).first()
+    if not checkpoint:
+        raise HTTPException(status_code=400, detail="Sessão não possui checkpoint para retomar")
+    
+    request = _request_do_checkpoint(checkpoint)
+    session.status = "iniciando"
+    db.commit()
+    
+    # Executar em background (não bloqueia a resposta)
+    background_tasks.add_task(executar_scraper, session_id, request, session.scraper_name, True)
+    
+    return {
+        "message": "Sessão retomada a partir do checkpoint",
+        "session_id": session_id,
+        "categoria": checkpoint.categoria,
+        "proxima_pagina": (checkpoint.ultima_pagina or 0) + 1,
+        "urls_pendentes": len(json.loads(checkpoint.urls_pendentes or "[]")),
+        "status_url": f"/api/v1/sessions/{session_id}"
+    }
+
+
 @app.get("/api/v1/obras")
 async def listar_obras_api(
     page: int = Query(1, ge=1),
@@ -770,18 +884,12 @@ async def listar_obras_api(
     scraper: Optional[str] = None,
     categoria: Optional[str] = None,
     artista: Optional[str] = None,
+    artista_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Lista obras com paginação e filtros"""
+    """Lista obras com paginação e filtros (artista_id usa o índice de artistas; artista busca no texto)"""
     try:
-        query = db.query(Obra)
-        
-        if scraper:
-            query = query.filter(Obra.scraper_name == scraper)
-        if categoria:
-            query = query.filter(Obra.categoria == categoria)
-        if artista:
-            query = query.filter(Obra.nome_artista.ilike(f"%{artista}%"))
+        query = filtrar_obras(db.query(Obra), scraper, categoria, artista, artista_id)
         
         offset = (page - 1) * per_page
         obras = query.order_by(desc(Obra.data_coleta)).offset(offset).limit(per_page).all()
@@ -888,6 +996,68 @@ async def listar_obras_api(
         }
 
 
+@app.get("/api/v1/artistas")
+async def listar_artistas(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=500),
+    busca: Optional[str] = None,
+    scraper: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Artistas com número de obras e agregados de preço (mínimo, médio, máximo), agrupados por
+    Obra.artista_id; busca filtra pelo início da chave normalizada (sem acentos/caixa)
+    """
+    try:
+        query = db.query(
+            Artista.id,
+            Artista.nome,
+            Artista.aliases,
+            func.count(Obra.id).label('total_obras'),
+            func.count(VALOR_NUMERICO).label('obras_com_valor'),
+            func.min(VALOR_NUMERICO).label('valor_minimo'),
+            func.avg(VALOR_NUMERICO).label('valor_medio'),
+            func.max(VALOR_NUMERICO).label('valor_maximo')
+        ).join(Obra, Obra.artista_id == Artista.id)
+        
+        if busca:
+            chave = chave_artista(busca)
+            if chave:
+                query = query.filter(Artista.chave.like(f"{chave}%"))
+        if scraper:
+            query = query.filter(Obra.scraper_name == scraper)
+        
+        query = query.group_by(Artista.id)
+        total = query.count()
+        linhas = query.order_by(desc('total_obras'), Artista.nome).offset((page - 1) * per_page).limit(per_page).all()
+        
+        artistas = [
+            {
+                "id": linha.id,
+                "nome": linha.nome,
+                "aliases": json.loads(linha.aliases) if linha.aliases else [],
+                "total_obras": linha.total_obras,
+                "obras_com_valor": linha.obras_com_valor,
+                "valor_minimo": round(linha.valor_minimo, 2) if linha.valor_minimo is not None else None,
+                "valor_medio": round(linha.valor_medio, 2) if linha.valor_medio is not None else None,
+                "valor_maximo": round(linha.valor_maximo, 2) if linha.valor_maximo is not None else None
+            }
+            for linha in linhas
+        ]
+        return {
+            "artistas": artistas,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": (total + per_page - 1) // per_page
+        }
+    except Exception as e:
+        import traceback
+        print(f"[ARTISTAS] ERRO ao listar artistas: {e}")
+        print(traceback.format_exc())
+        return {"artistas": [], "total": 0, "page": page, "per_page": per_page, "total_pages": 0}
+
+
 @app.get("/api/v1/stats")
 async def estatisticas(db: Session = Depends(get_db)):
     """Retorna estatísticas gerais"""
@@ -943,7 +1113,7 @@ async def estatisticas(db: Session = Depends(get_db)):
         except Exception as e:
             print(f"[STATS] Erro ao obter obras por scraper: {e}")
             response["obras_por_scraper"] = {}
-        
+    
     except Exception as e:
         import traceback
         print(f"[STATS] ERRO CRITICO: {e}")
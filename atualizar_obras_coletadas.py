@@ -2,34 +2,81 @@
 # -*- coding: utf-8 -*-
 """
 Sistema de Atualização Automática de Obras Coletadas
-Verifica todas as obras coletadas e atualiza dados se houver mudanças
+Verifica as obras coletadas em ordem de prioridade e atualiza dados se houver mudanças
+(leilões em andamento e próximos do encerramento primeiro, leilões encerrados são ignorados)
 Roda automaticamente todos os dias às 00:00
 """
 
 import sys
 import re
-import time
+import heapq
+import queue
+import threading
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database.database import SessionLocal
+from database.database import SessionLocal, atualizar_schema
 from database.models import Obra
+from database.persistencia import obter_artista_id
+from database.blocos import iterar_em_blocos, iterar_por_ids, EscritorEmBlocos
 from src.iarremate_scraper import IArremateScraper
 from src.leiloes_br_scraper import LeiloesBRScraper
+from src.metricas import FILA_PROFUNDIDADE
+from src.rate_limiter import LimitadorPorHost, LIMITADOR_GLOBAL
+
+
+# Datas dos leilões são exibidas no horário de Brasília (UTC-3, sem horário de verão desde 2019).
+# A fila compara tudo em UTC, a base de ultima_verificacao, ultima_atualizacao e data_coleta
+FUSO_LEILOES = timezone(timedelta(hours=-3))
 
 
 class AtualizadorObras:
     """Classe para atualizar obras coletadas verificando mudanças nos sites"""
     
-    def __init__(self):
-        self.scraper_iarremate = IArremateScraper()
-        self.scraper_leiloes_br = LeiloesBRScraper()
-        self.delay_entre_requisicoes = 1.0  # Delay entre requisições para não sobrecarregar
-        
+    # Níveis de prioridade da fila de atualização (menor = mais urgente)
+    PRIORIDADE_EM_ANDAMENTO = 0
+    PRIORIDADE_PROXIMO = 1
+    PRIORIDADE_AGENDADO = 2
+    PRIORIDADE_DESCONHECIDO = 3
+    PRIORIDADE_ENCERRADO = 4
+    
+    # Colunas que atualizar_obra_iarremate/atualizar_obra_leiloes_br podem alterar
+    CAMPOS_ATUALIZAVEIS = (
+        'titulo', 'descricao', 'nome_artista', 'valor', 'valor_atualizado', 'ultima_atualizacao',
+        'lote', 'data_inicio_leilao', 'data_leilao', 'leiloeiro', 'local'
+    )
+    
+    def __init__(self, orcamento_requisicoes: Optional[int] = 2000, tamanho_bloco: int = 500,
+                 concorrente: bool = False, delay_por_host: Optional[Dict[str, float]] = None):
+        # O ritmo por site vem do limitador compartilhado (src/rate_limiter.py), que coordena este
+        # job com as sessões da API e os monitores do processo. delay_por_host (segundos entre
+        # requisições, 0 = sem intervalo extra) só acrescenta um intervalo mínimo a estes scrapers:
+        # a vez é reservada nos dois limitadores e o compartilhado nunca é ultrapassado
+        self.limitador_extra = None
+        if delay_por_host:
+            self.limitador_extra = LimitadorPorHost(taxa_padrao=None, rajada_padrao=1, taxas_por_host={})
+            for host, delay in delay_por_host.items():
+                self.limitador_extra.configurar(host, taxa=1 / delay if delay > 0 else None)
+        scrapers = self.criar_scrapers(['iarremate', 'leiloes_br'])
+        self.scraper_iarremate = scrapers['iarremate']
+        self.scraper_leiloes_br = scrapers['leiloes_br']
+        self.concorrente = concorrente  # Um worker por site
+        self.orcamento_requisicoes = orcamento_requisicoes  # Máximo de requisições por execução
+        self.tamanho_bloco = tamanho_bloco  # Obras lidas do banco por bloco
+        self.janela_proximo = timedelta(hours=48)  # Leilões que encerram nas próximas 48h
+        self.janela_encerramento = timedelta(days=1)  # Tolerância após a data do leilão
+        self.espera_falha = timedelta(hours=1)  # Espera após uma falha, dobrada a cada falha seguida
+        self.espera_falha_maxima = timedelta(days=7)
+        self.max_falhas_encerrado = 5  # Leilão encerrado: desistir após estas falhas seguidas
+        self.obras_encerradas_ignoradas = 0
+        self.obras_em_espera = 0
+    
     def normalizar_valor(self, valor: str) -> float:
         """Normaliza valor para comparação numérica"""
         if not valor or valor == "N/A":
@@ -50,22 +97,24 @@ class AtualizadorObras:
         
         return valor_antigo_num != valor_novo_num
     
-    def atualizar_obra_iarremate(self, obra: Obra, soup: BeautifulSoup) -> Tuple[bool, Dict[str, str]]:
+    def atualizar_obra_iarremate(self, obra: Obra, soup: BeautifulSoup,
+                                 scraper: Optional[IArremateScraper] = None) -> Tuple[bool, Dict[str, str]]:
         """
         Atualiza uma obra do iArremate
         Retorna (houve_mudanca, campos_atualizados)
         """
         mudancas = {}
         houve_mudanca = False
+        scraper = scraper or self.scraper_iarremate
         
         try:
             # Extrair novos dados
-            novo_titulo = self.scraper_iarremate.extrair_titulo_iarremate(soup)
-            nova_descricao = self.scraper_iarremate.extrair_descricao_iarremate(soup, novo_titulo)
-            novo_nome_artista = self.scraper_iarremate.extrair_nome_artista(novo_titulo, nova_descricao)
-            novo_valor = self.scraper_iarremate.extrair_valor_iarremate(soup)
-            novo_lote = self.scraper_iarremate.extrair_lote_iarremate(soup)
-            nova_data_inicio = self.scraper_iarremate.extrair_data_inicio_leilao_iarremate(soup)
+            novo_titulo = scraper.extrair_titulo_iarremate(soup)
+            nova_descricao = scraper.extrair_descricao_iarremate(soup, novo_titulo)
+            novo_nome_artista = scraper.extrair_nome_artista(novo_titulo, nova_descricao)
+            novo_valor = scraper.extrair_valor_iarremate(soup)
+            novo_lote = scraper.extrair_lote_iarremate(soup)
+            nova_data_inicio = scraper.extrair_data_inicio_leilao_iarremate(soup)
             
             # Comparar e atualizar título
             if novo_titulo and novo_titulo != "N/A" and novo_titulo != obra.titulo:
@@ -107,31 +156,33 @@ class AtualizadorObras:
                 mudancas['data_inicio_leilao'] = f"{obra.data_inicio_leilao} -> {nova_data_inicio}"
                 obra.data_inicio_leilao = nova_data_inicio
                 houve_mudanca = True
-                
+        
         except Exception as e:
             print(f"    [ERRO] Erro ao extrair dados iArremate: {e}")
         
         return houve_mudanca, mudancas
     
-    def atualizar_obra_leiloes_br(self, obra: Obra, soup: BeautifulSoup) -> Tuple[bool, Dict[str, str]]:
+    def atualizar_obra_leiloes_br(self, obra: Obra, soup: BeautifulSoup,
+                                  scraper: Optional[LeiloesBRScraper] = None) -> Tuple[bool, Dict[str, str]]:
         """
         Atualiza uma obra do LeilõesBR
         Retorna (houve_mudanca, campos_atualizados)
         """
         mudancas = {}
         houve_mudanca = False
+        scraper = scraper or self.scraper_leiloes_br
         
         try:
             # Extrair novos dados
-            novo_titulo = self.scraper_leiloes_br.extrair_titulo_leiloes_br(soup, obra.titulo or "N/A")
-            nova_descricao = self.scraper_leiloes_br.extrair_descricao_leiloes_br(soup, novo_titulo)
-            novo_nome_artista = self.scraper_leiloes_br.extrair_nome_artista(novo_titulo, nova_descricao)
-            novo_valor = self.scraper_leiloes_br.extrair_valor_leiloes_br(soup, obra.valor or "N/A")
-            novo_lote = self.scraper_leiloes_br.extrair_lote_leiloes_br(soup, obra.url)
-            nova_data_inicio = self.scraper_leiloes_br.extrair_data_inicio_leilao_leiloes_br(soup)
-            nova_data_leilao = self.scraper_leiloes_br.extrair_data_leilao_leiloes_br(soup)
-            novo_leiloeiro = self.scraper_leiloes_br.extrair_leiloeiro_leiloes_br(soup)
-            novo_local = self.scraper_leiloes_br.extrair_local_leiloes_br(soup)
+            novo_titulo = scraper.extrair_titulo_leiloes_br(soup, obra.titulo or "N/A", obra.url)
+            nova_descricao = scraper.extrair_descricao_leiloes_br(soup, novo_titulo)
+            novo_nome_artista = scraper.extrair_nome_artista(novo_titulo, nova_descricao)
+            novo_valor = scraper.extrair_valor_leiloes_br(soup, obra.valor or "N/A")
+            novo_lote = scraper.extrair_lote_leiloes_br(soup, obra.url)
+            nova_data_inicio = scraper.extrair_data_inicio_leilao_leiloes_br(soup)
+            nova_data_leilao = scraper.extrair_data_leilao_leiloes_br(soup)
+            novo_leiloeiro = scraper.extrair_leiloeiro_leiloes_br(soup, obra.url)
+            novo_local = scraper.extrair_local_leiloes_br(soup, obra.url)
             
             # Comparar e atualizar título
             if novo_titulo and novo_titulo != "N/A" and novo_titulo != obra.titulo:
@@ -191,18 +242,413 @@ class AtualizadorObras:
                 mudancas['local'] = f"{obra.local} -> {novo_local}"
                 obra.local = novo_local
                 houve_mudanca = True
-                
+        
         except Exception as e:
             print(f"    [ERRO] Erro ao extrair dados LeilõesBR: {e}")
         
         return houve_mudanca, mudancas
     
-    def atualizar_todas_obras(self, scraper_name: Optional[str] = None, limite: Optional[int] = None):
+    def parsear_data(self, data_str: Optional[str], referencia: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Parseia as datas gravadas pelos scrapers (DD/MM/YYYY [HH:MM] ou countdown), em UTC
+        Datas absolutas estão no horário dos sites (FUSO_LEILOES); countdowns são relativos à
+        data de referência (data da coleta)
+        """
+        if not data_str or data_str in ("nao tem", "N/A"):
+            return None
+        
+        match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})(?:\s*[-–]?\s*(\d{1,2}):(\d{2}))?', data_str)
+        if match:
+            try:
+                dia, mes, ano = int(match.group(1)), int(match.group(2)), int(match.group(3))
+                hora = int(match.group(4)) if match.group(4) else 0
+                minuto = int(match.group(5)) if match.group(5) else 0
+                data = datetime(ano, mes, dia, hora, minuto, tzinfo=FUSO_LEILOES)
+                return data.astimezone(timezone.utc).replace(tzinfo=None)
+            except ValueError:
+                return None
+        
+        match = re.search(r'(\d+)D\s+(\d+)H\s+(\d+)M(?:\s+(\d+)S)?', data_str)
+        if match and referencia:
+            return referencia + timedelta(
+                days=int(match.group(1)),
+                hours=int(match.group(2)),
+                minutes=int(match.group(3)),
+                seconds=int(match.group(4) or 0)
+            )
+        
+        return None
+    
+    def calcular_prioridade(self, candidato, agora: datetime) -> Optional[Tuple]:
+        """
+        Calcula a prioridade de atualização de uma obra (menor = mais urgente)
+        Retorna None para obras cujo leilão já encerrou e já foram verificadas com sucesso após o
+        encerramento (ou falharam max_falhas_encerrado vezes seguidas)
+        
+        Ordem: status do leilão, tempo até o encerramento, última mudança e última verificação
+        agora: horário atual em UTC (mesma base de parsear_data e ultima_verificacao)
+        """
+        data_encerramento = (
+            self.parsear_data(candidato.data_leilao, candidato.data_coleta) or
+            self.parsear_data(candidato.data_inicio_leilao, candidato.data_coleta)
+        )
+        
+        if data_encerramento is None:
+            status = self.PRIORIDADE_DESCONHECIDO
+            segundos_ate_fim = float('inf')
+        else:
+            segundos_ate_fim = (data_encerramento - agora).total_seconds()
+            if segundos_ate_fim < -self.janela_encerramento.total_seconds():
+                # Leilão encerrado: uma última verificação para capturar o valor final
+                falhas = candidato.falhas_verificacao or 0
+                if falhas >= self.max_falhas_encerrado:
+                    return None
+                if (not falhas and candidato.ultima_verificacao and
+                        candidato.ultima_verificacao >= data_encerramento + self.janela_encerramento):
+                    return None
+                status = self.PRIORIDADE_ENCERRADO
+            elif segundos_ate_fim <= 0:
+                status = self.PRIORIDADE_EM_ANDAMENTO
+            elif segundos_ate_fim <= self.janela_proximo.total_seconds():
+                status = self.PRIORIDADE_PROXIMO
+            else:
+                status = self.PRIORIDADE_AGENDADO
+        
+        # Obras que mudaram recentemente tendem a mudar de novo (mais recente primeiro)
+        ultima_mudanca = candidato.ultima_atualizacao.timestamp() if candidato.ultima_atualizacao else 0.0
+        # Obras verificadas há mais tempo primeiro (nunca verificadas antes de todas)
+        ultima_verificacao = candidato.ultima_verificacao.timestamp() if candidato.ultima_verificacao else 0.0
+        
+        return (status, abs(segundos_ate_fim), -ultima_mudanca, ultima_verificacao, candidato.id)
+    
+    def em_espera_apos_falha(self, candidato, agora: datetime) -> bool:
+        """
+        True se a última verificação falhou e a espera ainda não passou (1h, 2h, 4h... até
+        espera_falha_maxima): URLs fora do ar não ocupam o orçamento de todas as execuções
+        """
+        falhas = candidato.falhas_verificacao or 0
+        if not falhas or not candidato.ultima_verificacao:
+            return False
+        espera = min(self.espera_falha * 2 ** min(falhas - 1, 16), self.espera_falha_maxima)
+        return candidato.ultima_verificacao + espera > agora
+    
+    def montar_fila_prioridade(self, db, scraper_name: Optional[str] = None,
+                               orcamento: Optional[int] = None) -> List[int]:
+        """
+        Monta a fila de atualização priorizada
+        Lê apenas as colunas necessárias em blocos (sem carregar as obras inteiras) e
+        mantém em memória só as `orcamento` obras mais prioritárias
+        """
+        agora = datetime.utcnow()
+        query = db.query(
+            Obra.id,
+            Obra.data_leilao,
+            Obra.data_inicio_leilao,
+            Obra.data_coleta,
+            Obra.ultima_atualizacao,
+            Obra.ultima_verificacao,
+            Obra.falhas_verificacao
+        )
+        if scraper_name:
+            query = query.filter(Obra.scraper_name == scraper_name)
+        
+        self.obras_encerradas_ignoradas = 0
+        self.obras_em_espera = 0
+        
+        def prioridades():
+            for bloco in iterar_em_blocos(db, query, tamanho_bloco=self.tamanho_bloco):
+                for candidato in bloco:
+                    if self.em_espera_apos_falha(candidato, agora):
+                        self.obras_em_espera += 1
+                        continue
+                    prioridade = self.calcular_prioridade(candidato, agora)
+                    if prioridade is None:
+                        self.obras_encerradas_ignoradas += 1
+                        continue
+                    yield prioridade
+        
+        if orcamento:
+            selecionadas = heapq.nsmallest(orcamento, prioridades())
+        else:
+            selecionadas = sorted(prioridades())
+        
+        return [prioridade[-1] for prioridade in selecionadas]
+    
+    def extrair_host(self, url: Optional[str]) -> str:
+        """Retorna o host da URL sem 'www.' (chave do particionamento por site)"""
+        if not url:
+            return ""
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith('www.') else host
+    
+    def delay_para_host(self, host: str) -> float:
+        """Intervalo médio entre requisições para um site (o maior entre o compartilhado e delay_por_host)"""
+        intervalo = LIMITADOR_GLOBAL.intervalo(host)
+        if self.limitador_extra:
+            intervalo = max(intervalo, self.limitador_extra.intervalo(host))
+        return intervalo
+    
+    def criar_scrapers(self, nomes) -> Dict:
+        """Cria instâncias próprias dos scrapers (sessões HTTP próprias, conexões do REGISTRO_HTTP)"""
+        fabricas = {'iarremate': IArremateScraper, 'leiloes_br': LeiloesBRScraper}
+        # Com delay_por_host, o intervalo próprio dos scrapers (delay_between_requests) fica de fora:
+        # valem só o limitador compartilhado e o extra
+        opcoes = {'limitador_extra': self.limitador_extra, 'delay_between_requests': 0} if self.limitador_extra else {}
+        return {nome: fabricas[nome](**opcoes) for nome in nomes if nome in fabricas}
+    
+    def verificar_obra(self, obra: Obra, scrapers: Optional[Dict] = None) -> Dict:
+        """
+        Busca a página da obra e compara com os dados gravados
+        Não acessa o banco: a obra é um objeto desanexado e as colunas a gravar vão em 'valores'
+        
+        Retorna dict com 'status' ('atualizada', 'sem_mudanca', 'nao_encontrada' ou 'pulada'),
+        'valores', 'mudancas' e 'requisicao' (se foi feita requisição ao site)
+        """
+        if scrapers is None:
+            scrapers = {'iarremate': self.scraper_iarremate, 'leiloes_br': self.scraper_leiloes_br}
+        
+        resultado = {
+            'obra_id': obra.id,
+            'status': 'pulada',
+            'valores': {},
+            'mudancas': {},
+            'requisicao': False
+        }
+        
+        scraper = scrapers.get(obra.scraper_name)
+        if scraper is None:
+            resultado['erro'] = f"Scraper desconhecido: {obra.scraper_name}"
+            return resultado
+        
+        # Fazer requisição
+        resultado['requisicao'] = True
+        response = scraper.fazer_requisicao(obra.url)
+        if not response:
+            # Marcar a falha: a obra espera antes da próxima tentativa (em_espera_apos_falha)
+            resultado.update(status='nao_encontrada', valores={
+                'ultima_verificacao': datetime.utcnow(),
+                'falhas_verificacao': (obra.falhas_verificacao or 0) + 1
+            })
+            return resultado
+        
+        soup = scraper.criar_soup(response.text)
+        
+        # Atualizar obra (objeto desanexado: as mudanças vão para 'valores')
+        if obra.scraper_name == "iarremate":
+            houve_mudanca, mudancas = self.atualizar_obra_iarremate(obra, soup, scraper)
+        else:
+            houve_mudanca, mudancas = self.atualizar_obra_leiloes_br(obra, soup, scraper)
+        
+        valores = {'ultima_verificacao': datetime.utcnow()}
+        if obra.falhas_verificacao:
+            valores['falhas_verificacao'] = 0
+        if houve_mudanca:
+            valores.update({campo: getattr(obra, campo) for campo in self.CAMPOS_ATUALIZAVEIS})
+        
+        resultado.update(
+            status='atualizada' if houve_mudanca else 'sem_mudanca',
+            valores=valores,
+            mudancas=mudancas
+        )
+        return resultado
+    
+    def registrar_resultado(self, resultado: Dict, escritor: EscritorEmBlocos, estatisticas: Dict[str, int]):
+        """Exibe o resultado da verificação, agenda a gravação e atualiza as estatísticas"""
+        if resultado['requisicao']:
+            estatisticas['requisicoes'] += 1
+        
+        status = resultado['status']
+        if status == 'pulada':
+            print(f"  [PULAR] {resultado.get('erro')}")
+            return
+        if status == 'erro':
+            print(f"  [ERRO] Erro ao processar obra {resultado['obra_id']}: {resultado.get('erro')}")
+            estatisticas['erros'] += 1
+            return
+        if status == 'nao_encontrada':
+            print(f"  [ERRO] Não foi possível acessar a URL")
+            escritor.atualizar(resultado['obra_id'], **resultado['valores'])
+            estatisticas['nao_encontradas'] += 1
+            estatisticas['erros'] += 1
+            return
+        
+        valores = resultado['valores']
+        if 'nome_artista' in resultado['mudancas']:
+            valores['artista_id'] = obter_artista_id(escritor.db, valores.get('nome_artista'))
+        escritor.atualizar(resultado['obra_id'], **valores)
+        
+        if status == 'atualizada':
+            mudancas = resultado['mudancas']
+            print(f"  [ATUALIZADO] {len(mudancas)} campo(s) alterado(s):")
+            for campo, mudanca in mudancas.items():
+                print(f"    - {campo}: {mudanca}")
+            estatisticas['atualizadas'] += 1
+        else:
+            print(f"  [SEM MUDANÇA] Dados mantidos")
+            estatisticas['sem_mudanca'] += 1
+    
+    def _descrever_obra(self, obra: Obra) -> str:
+        titulo_display = (obra.titulo[:50] + "...") if obra.titulo and len(obra.titulo) > 50 else (obra.titulo or "N/A")
+        return f"obra ID {obra.id} ({obra.scraper_name}): {titulo_display}"
+    
+    def particionar_por_host(self, db, fila: List[int]) -> Dict[str, Dict]:
+        """
+        Separa a fila por site, preservando a ordem de prioridade dentro de cada site
+        Retorna {host: {'ids': [...], 'scrapers': {nomes dos scrapers}}}
+        """
+        particoes: Dict[str, Dict] = {}
+        for inicio in range(0, len(fila), self.tamanho_bloco):
+            ids_bloco = fila[inicio:inicio + self.tamanho_bloco]
+            linhas = {
+                linha.id: linha
+                for linha in db.query(Obra.id, Obra.url, Obra.scraper_name).filter(Obra.id.in_(ids_bloco))
+            }
+            for id_obra in ids_bloco:
+                linha = linhas.get(id_obra)
+                if linha is None:
+                    continue
+                particao = particoes.setdefault(self.extrair_host(linha.url), {'ids': [], 'scrapers': set()})
+                particao['ids'].append(id_obra)
+                particao['scrapers'].add(linha.scraper_name)
+        return particoes
+    
+    def _processar_host(self, host: str, ids: List[int], nomes_scrapers, resultados: "queue.Queue",
+                        parar: threading.Event):
+        """
+        Worker do modo concorrente: verifica as obras de um único site (o ritmo é dado pelo limitador do host)
+        Usa sessão do banco e scrapers próprios; os resultados são gravados pela thread principal
         """
-        Atualiza todas as obras coletadas
+        db = SessionLocal()
+        try:
+            scrapers = self.criar_scrapers(nomes_scrapers)
+            for bloco in iterar_por_ids(db, Obra, ids, tamanho_bloco=self.tamanho_bloco):
+                for obra in bloco:
+                    if parar.is_set():
+                        return
+                    try:
+                        resultado = self.verificar_obra(obra, scrapers)
+                    except Exception as e:
+                        resultado = {
+                            'obra_id': obra.id,
+                            'status': 'erro',
+                            'erro': e,
+                            'valores': {},
+                            'mudancas': {},
+                            'requisicao': True
+                        }
+                    resultado['descricao'] = self._descrever_obra(obra)
+                    resultado['host'] = host
+                    resultados.put(resultado)
+        finally:
+            db.close()
+            resultados.put(None)  # Sinaliza fim do worker
+    
+    def verificar_sequencial(self, db, fila: List[int], escritor: EscritorEmBlocos,
+                             estatisticas: Dict[str, int], orcamento: Optional[int] = None):
+        """Verifica a fila uma obra por vez (ordem de prioridade preservada, um commit por bloco)"""
+        total_obras = len(fila)
+        i = 0
+        
+        for bloco in iterar_por_ids(db, Obra, fila, tamanho_bloco=self.tamanho_bloco):
+            for obra in bloco:
+                if orcamento and estatisticas['requisicoes'] >= orcamento:
+                    break
+                i += 1
+                
+                try:
+                    # Log de progresso
+                    if i % 50 == 0 or i == 1:
+                        print(f"\n[PROGRESSO] {i}/{total_obras} obras processadas | "
+                              f"Atualizadas: {estatisticas['atualizadas']} | "
+                              f"Sem mudança: {estatisticas['sem_mudanca']} | Erros: {estatisticas['erros']}")
+                    
+                    print(f"\n[{i}/{total_obras}] Verificando {self._descrever_obra(obra)}")
+                    
+                    resultado = self.verificar_obra(obra)
+                    self.registrar_resultado(resultado, escritor, estatisticas)
+                
+                except Exception as e:
+                    print(f"  [ERRO] Erro ao processar obra {obra.id}: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    estatisticas['erros'] += 1
+                    continue
+            
+            # Um commit por bloco
+            escritor.gravar()
+            
+            if orcamento and estatisticas['requisicoes'] >= orcamento:
+                print(f"\n[INFO] Orçamento de {orcamento} requisições atingido")
+                break
+    
+    def verificar_concorrente(self, db, fila: List[int], escritor: EscritorEmBlocos,
+                              estatisticas: Dict[str, int]):
+        """
+        Verifica a fila com um worker por site, cada um no ritmo do limitador do seu host
+        O tempo total fica próximo do tempo do site mais lento (e não da soma dos sites);
+        a thread principal é a única que grava no banco
+        """
+        particoes = self.particionar_por_host(db, fila)
+        total_obras = sum(len(particao['ids']) for particao in particoes.values())
+        
+        print(f"[INFO] Modo concorrente: {len(particoes)} site(s) em paralelo")
+        for host, particao in particoes.items():
+            print(f"  - {host or 'sem host'}: {len(particao['ids'])} obras (delay {self.delay_para_host(host)}s)")
+        
+        if not particoes:
+            return
+        
+        resultados = queue.Queue(maxsize=self.tamanho_bloco)
+        parar = threading.Event()
+        FILA_PROFUNDIDADE.definir_funcao(resultados.qsize, fila="atualizador_resultados")
+        
+        with ThreadPoolExecutor(max_workers=len(particoes), thread_name_prefix="atualizador") as executor:
+            futuros = {
+                executor.submit(self._processar_host, host, particao['ids'], particao['scrapers'],
+                                resultados, parar): host
+                for host, particao in particoes.items()
+            }
+            workers_ativos = len(futuros)
+            i = 0
+            
+            try:
+                while workers_ativos:
+                    resultado = resultados.get()
+                    if resultado is None:
+                        workers_ativos -= 1
+                        continue
+                    
+                    i += 1
+                    FILA_PROFUNDIDADE.definir(total_obras - i, fila="atualizador_obras_pendentes")
+                    if i % 50 == 0 or i == 1:
+                        print(f"\n[PROGRESSO] {i}/{total_obras} obras processadas | "
+                              f"Atualizadas: {estatisticas['atualizadas']} | "
+                              f"Sem mudança: {estatisticas['sem_mudanca']} | Erros: {estatisticas['erros']}")
+                    print(f"\n[{i}/{total_obras}] [{resultado['host']}] Verificada {resultado['descricao']}")
+                    self.registrar_resultado(resultado, escritor, estatisticas)
+            except BaseException:
+                # Interromper os workers e esvaziar a fila para que possam terminar
+                parar.set()
+                while workers_ativos:
+                    if resultados.get() is None:
+                        workers_ativos -= 1
+                raise
+            finally:
+                escritor.gravar()
+            
+            for futuro, host in futuros.items():
+                erro = futuro.exception()
+                if erro:
+                    print(f"[ERRO] Worker do site {host} falhou: {erro}")
+    
+    def atualizar_todas_obras(self, scraper_name: Optional[str] = None, limite: Optional[int] = None,
+                              orcamento_requisicoes: Optional[int] = None):
+        """
+        Atualiza as obras coletadas em ordem de prioridade
         Args:
             scraper_name: 'iarremate', 'leiloes_br' ou None para ambos
             limite: Número máximo de obras para processar (None = todas)
+            orcamento_requisicoes: Máximo de requisições nesta execução (None = self.orcamento_requisicoes)
         """
         print("=" * 80)
         print("SISTEMA DE ATUALIZAÇÃO DE OBRAS COLETADAS")
@@ -210,101 +656,62 @@ class AtualizadorObras:
         print(f"Iniciado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
         print()
         
+        atualizar_schema()
+        
+        orcamento = orcamento_requisicoes or self.orcamento_requisicoes
+        if limite:
+            orcamento = min(orcamento, limite) if orcamento else limite
+        
         db = SessionLocal()
         
         try:
-            # Buscar obras
-            query = db.query(Obra)
-            
-            if scraper_name:
-                query = query.filter(Obra.scraper_name == scraper_name)
-            
-            if limite:
-                query = query.limit(limite)
+            # Montar fila priorizada (leilões em andamento/próximos primeiro, encerrados ignorados)
+            fila = self.montar_fila_prioridade(db, scraper_name=scraper_name, orcamento=orcamento)
             
-            obras = query.all()
-            
-            total_obras = len(obras)
-            print(f"[INFO] Encontradas {total_obras} obras para verificar")
+            total_obras = len(fila)
+            print(f"[INFO] {total_obras} obras na fila de atualização (orçamento: {orcamento or 'ilimitado'} requisições)")
+            if self.obras_encerradas_ignoradas:
+                print(f"[INFO] {self.obras_encerradas_ignoradas} obras ignoradas (leilão encerrado e já verificado)")
+            if self.obras_em_espera:
+                print(f"[INFO] {self.obras_em_espera} obras aguardando nova tentativa após falha de acesso")
             
             if total_obras == 0:
                 print("[OK] Nenhuma obra para atualizar")
                 return
             
             # Estatísticas
-            atualizadas = 0
-            sem_mudanca = 0
-            erros = 0
-            nao_encontradas = 0
+            estatisticas = {
+                'atualizadas': 0,
+                'sem_mudanca': 0,
+                'erros': 0,
+                'nao_encontradas': 0,
+                'requisicoes': 0
+            }
             
-            # Processar cada obra
-            for i, obra in enumerate(obras, 1):
-                try:
-                    # Log de progresso
-                    if i % 50 == 0 or i == 1:
-                        print(f"\n[PROGRESSO] {i}/{total_obras} obras processadas | "
-                              f"Atualizadas: {atualizadas} | Sem mudança: {sem_mudanca} | Erros: {erros}")
-                    
-                    titulo_display = (obra.titulo[:50] + "...") if obra.titulo and len(obra.titulo) > 50 else (obra.titulo or "N/A")
-                    print(f"\n[{i}/{total_obras}] Verificando obra ID {obra.id} ({obra.scraper_name}): {titulo_display}")
-                    
-                    # Escolher scraper apropriado
-                    if obra.scraper_name == "iarremate":
-                        scraper = self.scraper_iarremate
-                    elif obra.scraper_name == "leiloes_br":
-                        scraper = self.scraper_leiloes_br
-                    else:
-                        print(f"  [PULAR] Scraper desconhecido: {obra.scraper_name}")
-                        continue
-                    
-                    # Fazer requisição
-                    response = scraper.fazer_requisicao(obra.url)
-                    if not response:
-                        print(f"  [ERRO] Não foi possível acessar a URL")
-                        nao_encontradas += 1
-                        erros += 1
-                        continue
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Atualizar obra
-                    if obra.scraper_name == "iarremate":
-                        houve_mudanca, mudancas = self.atualizar_obra_iarremate(obra, soup)
-                    else:
-                        houve_mudanca, mudancas = self.atualizar_obra_leiloes_br(obra, soup)
-                    
-                    if houve_mudanca:
-                        db.commit()
-                        print(f"  [ATUALIZADO] {len(mudancas)} campo(s) alterado(s):")
-                        for campo, mudanca in mudancas.items():
-                            print(f"    - {campo}: {mudanca}")
-                        atualizadas += 1
-                    else:
-                        print(f"  [SEM MUDANÇA] Dados mantidos")
-                        sem_mudanca += 1
-                    
-                    # Delay entre requisições
-                    time.sleep(self.delay_entre_requisicoes)
-                    
-                except Exception as e:
-                    print(f"  [ERRO] Erro ao processar obra {obra.id}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    erros += 1
-                    continue
+            escritor = EscritorEmBlocos(db, Obra, tamanho_bloco=self.tamanho_bloco)
+            
+            if self.concorrente:
+                # Um worker por site (a fila já respeita o orçamento de requisições)
+                self.verificar_concorrente(db, fila, escritor, estatisticas)
+            else:
+                self.verificar_sequencial(db, fila, escritor, estatisticas, orcamento)
             
             # Resumo final
             print("\n" + "=" * 80)
             print("RESUMO DA ATUALIZAÇÃO")
             print("=" * 80)
-            print(f"  Total de obras verificadas: {total_obras}")
-            print(f"  Obras atualizadas: {atualizadas}")
-            print(f"  Obras sem mudança: {sem_mudanca}")
-            print(f"  Obras não encontradas: {nao_encontradas}")
-            print(f"  Erros: {erros}")
+            total_verificadas = estatisticas['atualizadas'] + estatisticas['sem_mudanca'] + estatisticas['erros']
+            print(f"  Total de obras verificadas: {total_verificadas}")
+            print(f"  Obras atualizadas: {estatisticas['atualizadas']}")
+            print(f"  Obras sem mudança: {estatisticas['sem_mudanca']}")
+            print(f"  Obras não encontradas: {estatisticas['nao_encontradas']}")
+            print(f"  Obras encerradas ignoradas: {self.obras_encerradas_ignoradas}")
+            print(f"  Obras aguardando após falha: {self.obras_em_espera}")
+            print(f"  Requisições feitas: {estatisticas['requisicoes']}")
+            print(f"  Erros: {estatisticas['erros']}")
             print(f"Concluído em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
             print("=" * 80)
-            
+        
         except Exception as e:
             print(f"\n[ERRO CRÍTICO] Erro durante atualização: {e}")
             import traceback
@@ -313,21 +720,31 @@ class AtualizadorObras:
             db.close()
 
 
-def atualizar_obras_coletadas(scraper_name: Optional[str] = None, limite: Optional[int] = None):
+def atualizar_obras_coletadas(scraper_name: Optional[str] = None, limite: Optional[int] = None,
+                              orcamento_requisicoes: Optional[int] = None, concorrente: bool = False):
     """
     Função principal para atualizar obras coletadas
     Args:
         scraper_name: 'iarremate', 'leiloes_br' ou None para ambos
         limite: Número máximo de obras para processar (None = todas)
+        orcamento_requisicoes: Máximo de requisições nesta execução (None = padrão do atualizador)
+        concorrente: Verifica os sites em paralelo (um worker por site)
     """
-    atualizador = AtualizadorObras()
-    atualizador.atualizar_todas_obras(scraper_name=scraper_name, limite=limite)
+    atualizador = AtualizadorObras(concorrente=concorrente)
+    atualizador.atualizar_todas_obras(scraper_name=scraper_name, limite=limite,
+                                      orcamento_requisicoes=orcamento_requisicoes)
 
 
 if __name__ == "__main__":
     # Permitir passar parâmetros via linha de comando
+    # Uso: python atualizar_obras_coletadas.py [scraper] [limite] [orcamento_requisicoes] [--concorrente]
+    concorrente = '--concorrente' in sys.argv
+    if concorrente:
+        sys.argv.remove('--concorrente')
+    
     scraper_name = None
     limite = None
+    orcamento_requisicoes = None
     
     if len(sys.argv) > 1:
         scraper_name = sys.argv[1] if sys.argv[1] in ['iarremate', 'leiloes_br'] else None
@@ -338,5 +755,12 @@ if __name__ == "__main__":
         except ValueError:
             limite = None
     
-    atualizar_obras_coletadas(scraper_name=scraper_name, limite=limite)
+    if len(sys.argv) > 3:
+        try:
+            orcamento_requisicoes = int(sys.argv[3])
+        except ValueError:
+            orcamento_requisicoes = None
+    
+    atualizar_obras_coletadas(scraper_name=scraper_name, limite=limite,
+                              orcamento_requisicoes=orcamento_requisicoes, concorrente=concorrente)
 
@@ -6,14 +6,14 @@ Roda automaticamente à meia-noite para verificar e atualizar preços
 """
 
 import sys
-import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database.database import SessionLocal
+from database.database import SessionLocal, atualizar_schema
 from database.models import Obra
+from database.blocos import iterar_em_blocos, EscritorEmBlocos
 from src.iarremate_scraper import IArremateScraper
 
 def atualizar_precos_obras():
@@ -23,19 +23,23 @@ def atualizar_precos_obras():
     print("=" * 60)
     print(f"Iniciado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
     
+    # Garantir que o schema está atualizado (o modelo Obra inclui ultima_verificacao)
+    atualizar_schema()
+    
     db = SessionLocal()
     
     try:
-        # Buscar todas as obras do iArremate que têm data de início de leilão
-        obras = db.query(Obra).filter(
+        # Buscar obras do iArremate que têm data de início de leilão (em blocos, sem .all())
+        query = db.query(Obra).filter(
             Obra.scraper_name == "iarremate",
             Obra.data_inicio_leilao.isnot(None),
             Obra.data_inicio_leilao != "nao tem"
-        ).all()
+        )
         
-        print(f"\n[INFO] Encontradas {len(obras)} obras com data de leilão")
+        total_obras = query.count()
+        print(f"\n[INFO] Encontradas {total_obras} obras com data de leilão")
         
-        if len(obras) == 0:
+        if total_obras == 0:
             print("[OK] Nenhuma obra para atualizar")
             return
         
@@ -45,72 +49,68 @@ def atualizar_precos_obras():
         atualizadas = 0
         sem_mudanca = 0
         erros = 0
+        processadas = 0
         
-        for obra in obras:
-            try:
-                print(f"\n[PROCESSANDO] Obra ID {obra.id}: {obra.titulo[:50] if obra.titulo else 'N/A'}...")
-                
-                # Fazer requisição para obter o valor atual
-                response = scraper.fazer_requisicao(obra.url)
-                if not response:
-                    print(f"  [ERRO] Nao foi possivel acessar a URL")
-                    erros += 1
-                    continue
-                
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extrair novo valor
-                novo_valor = scraper.extrair_valor_iarremate(soup)
-                
-                if novo_valor and novo_valor != "N/A":
-                    valor_antigo = obra.valor or "N/A"
+        escritor = EscritorEmBlocos(db, Obra)
+        for bloco in iterar_em_blocos(db, query):
+            for obra in bloco:
+                processadas += 1
+                try:
+                    print(f"\n[PROCESSANDO] Obra ID {obra.id}: {obra.titulo[:50] if obra.titulo else 'N/A'}...")
+                    
+                    # Fazer requisição para obter o valor atual
+                    response = scraper.fazer_requisicao(obra.url)
+                    if not response:
+                        print(f"  [ERRO] Nao foi possivel acessar a URL")
+                        erros += 1
+                        continue
                     
-                    # Comparar valores (remover formatação para comparar)
-                    valor_antigo_num = valor_antigo.replace('.', '').replace(',', '.').replace('R$', '').strip()
-                    novo_valor_num = novo_valor.replace('.', '').replace(',', '.').replace('R$', '').strip()
+                    soup = scraper.criar_soup(response.text)
                     
-                    try:
-                        valor_antigo_float = float(valor_antigo_num) if valor_antigo_num and valor_antigo_num != "N/A" else 0
-                        novo_valor_float = float(novo_valor_num) if novo_valor_num else 0
+                    # Extrair novo valor
+                    novo_valor = scraper.extrair_valor_iarremate(soup)
+                    
+                    if novo_valor and novo_valor != "N/A":
+                        valor_antigo = obra.valor or "N/A"
+                        
+                        # Comparar valores (remover formatação para comparar)
+                        valor_antigo_num = valor_antigo.replace('.', '').replace(',', '.').replace('R$', '').strip()
+                        novo_valor_num = novo_valor.replace('.', '').replace(',', '.').replace('R$', '').strip()
                         
-                        if novo_valor_float != valor_antigo_float and novo_valor_float > 0:
+                        try:
+                            valor_antigo_float = float(valor_antigo_num) if valor_antigo_num and valor_antigo_num != "N/A" else 0
+                            novo_valor_float = float(novo_valor_num) if novo_valor_num else 0
+                            mudou = novo_valor_float != valor_antigo_float and novo_valor_float > 0
+                        except ValueError:
+                            # Se não conseguir converter, atualizar mesmo assim se for diferente
+                            mudou = novo_valor != valor_antigo
+                        
+                        if mudou:
                             # Atualizar valor (mover valor antigo para valor_atualizado se ainda não tiver)
+                            valores = {
+                                'valor': novo_valor,
+                                'ultima_atualizacao': datetime.utcnow()
+                            }
                             if not obra.valor_atualizado:
-                                obra.valor_atualizado = obra.valor
-                            # Atualizar valor principal com o novo
-                            obra.valor = novo_valor
-                            obra.ultima_atualizacao = datetime.utcnow()
-                            db.commit()
+                                valores['valor_atualizado'] = obra.valor
+                            escritor.atualizar(obra.id, **valores)
                             
                             print(f"  [ATUALIZADO] Valor: R$ {valor_antigo} -> R$ {novo_valor}")
                             atualizadas += 1
                         else:
                             print(f"  [SEM MUDANCA] Valor mantido: R$ {valor_antigo}")
                             sem_mudanca += 1
-                    except ValueError:
-                        # Se não conseguir converter, atualizar mesmo assim se for diferente
-                        if novo_valor != valor_antigo:
-                            if not obra.valor_atualizado:
-                                obra.valor_atualizado = obra.valor
-                            obra.valor = novo_valor
-                            obra.ultima_atualizacao = datetime.utcnow()
-                            db.commit()
-                            print(f"  [ATUALIZADO] Valor: {valor_antigo} -> {novo_valor}")
-                            atualizadas += 1
-                        else:
-                            sem_mudanca += 1
-                else:
-                    print(f"  [SEM VALOR] Nao foi possivel extrair novo valor")
-                    sem_mudanca += 1
+                    else:
+                        print(f"  [SEM VALOR] Nao foi possivel extrair novo valor")
+                        sem_mudanca += 1
                 
-                # Delay entre requisições
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"  [ERRO] Erro ao processar obra {obra.id}: {e}")
-                erros += 1
-                continue
+                except Exception as e:
+                    print(f"  [ERRO] Erro ao processar obra {obra.id}: {e}")
+                    erros += 1
+                    continue
+            
+            # Um commit por bloco
+            escritor.gravar()
         
         print("\n" + "=" * 60)
         print("RESUMO DA ATUALIZACAO")
@@ -118,8 +118,8 @@ def atualizar_precos_obras():
         print(f"  Obras atualizadas: {atualizadas}")
         print(f"  Obras sem mudanca: {sem_mudanca}")
         print(f"  Erros: {erros}")
-        print(f"  Total processado: {len(obras)}")
-        
+        print(f"  Total processado: {processadas}")
+    
     except Exception as e:
         print(f"\n[ERRO] Erro durante atualizacao: {e}")
         import traceback
@@ -0,0 +1,3 @@
+"""
+Benchmarks do pipeline de scraping (servidor local com páginas gravadas)
+"""
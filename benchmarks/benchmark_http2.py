@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do transporte HTTP/2 (AdaptadorHTTP2) contra o HTTP/1.1 do requests
+
+Busca as páginas de obras do iArremate e do LeilõesBR (as mesmas páginas geradas de
+executar_benchmarks.py) com BaseScraper.fazer_requisicao, a partir de várias threads com um
+scraper cada (como os monitores e o extrator), primeiro em um servidor local HTTP/1.1
+(ServidorFixtures) e depois em um servidor local HTTP/2 (ServidorFixturesH2), com a mesma
+latência simulada por resposta. Reporta requisições/s, latência p50/p95 e conexões abertas
+
+Os servidores rodam em um processo separado: a CPU gasta por eles (o h2 é Python puro) não
+disputa o GIL com as threads dos scrapers e não entra na medição
+
+Requer httpx com h2 (pip install "httpx[http2]")
+
+Uso:
+    python benchmarks/benchmark_http2.py
+    python benchmarks/benchmark_http2.py --threads 32 --latencia-ms 50 --paginas 10
+    python benchmarks/benchmark_http2.py --salvar benchmarks/http2.json
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote, urlparse
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmarks.gerador_fixtures import ConjuntoFixtures, adicionar_listagem_iarremate, adicionar_listagem_leiloes_br
+from benchmarks.executar_benchmarks import url_pagina_leiloes_br
+from benchmarks.servidor_local import ServidorFixtures
+from src.http_client import HTTP2_DISPONIVEL
+
+
+def gerar_paginas(args, diretorio: str) -> ConjuntoFixtures:
+    """Listagens de quadros e esculturas dos dois sites (só as páginas de obras são buscadas)"""
+    from src.iarremate_scraper import IArremateScraper
+    from src.leiloes_br_scraper import LeiloesBRScraper
+    
+    fixtures = ConjuntoFixtures()
+    iarremate = IArremateScraper(output_dir=diretorio, logs_dir=diretorio)
+    for categoria in ("quadros", "esculturas"):
+        url_categoria = iarremate._url_categoria(categoria)
+        adicionar_listagem_iarremate(
+            fixtures, lambda pagina, url=url_categoria: iarremate._url_pagina(url, pagina),
+            args.paginas, args.lotes_por_pagina
+        )
+    
+    leiloes_br = LeiloesBRScraper(output_dir=diretorio, logs_dir=diretorio)
+    for url_categoria in (leiloes_br.url_quadros, leiloes_br.url_esculturas):
+        adicionar_listagem_leiloes_br(
+            fixtures, lambda pagina, url=url_categoria: url_pagina_leiloes_br(url, pagina),
+            args.paginas, args.lotes_por_pagina
+        )
+    return fixtures
+
+
+class ServidorEmProcesso:
+    """Executa ServidorFixtures/ServidorFixturesH2 em um processo filho; os contadores voltam em parar()"""
+    
+    def __init__(self, classe, fixtures: ConjuntoFixtures, latencia: float):
+        self.classe = classe
+        self.fixtures = fixtures
+        self.latencia = latencia
+        self.endereco: Optional[str] = None
+        self.conexoes = 0
+        self.bytes_enviados = 0
+        self.requisicoes: Dict[str, int] = {}
+        self._conexao = None
+        self._processo = None
+    
+    @staticmethod
+    def _executar(classe, fixtures, latencia, conexao):
+        with classe(fixtures, latencia=latencia) as servidor:
+            conexao.send(servidor.endereco)
+            conexao.recv()  # Aguarda o pedido de parada
+            conexao.send((servidor.conexoes, servidor.bytes_enviados, dict(servidor.requisicoes)))
+    
+    def __enter__(self):
+        self._conexao, filho = multiprocessing.Pipe()
+        self._processo = multiprocessing.Process(
+            target=self._executar, args=(self.classe, self.fixtures, self.latencia, filho), daemon=True
+        )
+        self._processo.start()
+        self.endereco = self._conexao.recv()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._conexao.send("parar")
+        self.conexoes, self.bytes_enviados, self.requisicoes = self._conexao.recv()
+        self._processo.join(timeout=10)
+        return False
+
+
+def percentil(valores: List[float], fracao: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * fracao), len(ordenados) - 1)]
+
+
+def buscar_todas(urls: List[str], threads: int, diretorio: str,
+                 preparar_sessao: Callable) -> Dict:
+    """Busca as URLs com uma thread por scraper; retorna duração, falhas e latências"""
+    from src.base_scraper import BaseScraper
+    from src.leiloes_br_scraper import LeiloesBRScraper
+    from src.rate_limiter import LIMITADOR_GLOBAL
+    
+    # Servidor local: sem limite de taxa (só o transporte é medido)
+    LIMITADOR_GLOBAL.configurar(urlparse(urls[0]).netloc, taxa=1e9, rajada=1e9)
+    
+    local = threading.local()
+    latencias: List[float] = []
+    falhas = [0]
+    lock = threading.Lock()
+    
+    def buscar(url: str):
+        scraper = getattr(local, "scraper", None)
+        if scraper is None:
+            scraper = local.scraper = LeiloesBRScraper(output_dir=diretorio, logs_dir=diretorio,
+                                                       delay_between_requests=0)
+            preparar_sessao(scraper.session)
+        inicio = time.perf_counter()
+        response = scraper.fazer_requisicao(url)
+        duracao = time.perf_counter() - inicio
+        with lock:
+            latencias.append(duracao)
+            if response is None or not response.content:
+                falhas[0] += 1
+    
+    # Sem pausas de novas tentativas: falhas aparecem no relatório em vez de atrasar a medição
+    dormir_original = BaseScraper.dormir
+    BaseScraper.dormir = lambda self, segundos: None
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(buscar, urls))
+        duracao = time.perf_counter() - inicio
+    finally:
+        BaseScraper.dormir = dormir_original
+    
+    return {"duracao_s": duracao, "falhas": falhas[0], "latencias": latencias}
+
+
+def resultado(transporte: str, medicao: Dict, servidor) -> Dict:
+    duracao = medicao["duracao_s"]
+    requisicoes = len(medicao["latencias"])
+    return {
+        "transporte": transporte,
+        "requisicoes": requisicoes,
+        "falhas": medicao["falhas"],
+        "duracao_s": round(duracao, 3),
+        "requisicoes_por_s": round(requisicoes / duracao, 1) if duracao else 0.0,
+        "latencia_p50_ms": round(percentil(medicao["latencias"], 0.5) * 1000, 1),
+        "latencia_p95_ms": round(percentil(medicao["latencias"], 0.95) * 1000, 1),
+        "conexoes": servidor.conexoes,
+        "mb_enviados": round(servidor.bytes_enviados / (1024 * 1024), 2)
+    }
+
+
+def medir_http1(fixtures: ConjuntoFixtures, chaves: List[str], args, diretorio: str) -> Dict:
+    """requests + HTTPAdapter (transporte atual): uma conexão por requisição simultânea"""
+    from src.http_client import RegistroClientesHTTP
+    
+    # Pool do tamanho do número de threads, como CONEXOES_POR_HOST faz para os sites reais
+    registro = RegistroClientesHTTP(conexoes_padrao=args.threads)
+    with ServidorEmProcesso(ServidorFixtures, fixtures, args.latencia_ms / 1000) as servidor:
+        urls = [f"{servidor.endereco}/{quote(chave, safe='/?=&')}" for chave in chaves]
+        medicao = buscar_todas(urls, args.threads, diretorio, registro.montar)
+    return resultado("HTTP/1.1", medicao, servidor)
+
+
+def medir_http2(fixtures: ConjuntoFixtures, chaves: List[str], args, diretorio: str) -> Dict:
+    """requests + AdaptadorHTTP2: as requisições das threads dividem uma conexão multiplexada"""
+    from src.http_client import AdaptadorHTTP2
+    from benchmarks.servidor_h2 import ServidorFixturesH2
+    
+    # h2c sem negociação: o servidor local não tem TLS (os sites reais negociam HTTP/2 por ALPN)
+    adaptador = AdaptadorHTTP2(conexoes=args.threads, somente_http2=True)
+    with ServidorEmProcesso(ServidorFixturesH2, fixtures, args.latencia_ms / 1000) as servidor:
+        urls = [f"{servidor.endereco}/{quote(chave, safe='/?=&')}" for chave in chaves]
+        
+        def montar(session):
+            session.mount(f"{servidor.endereco}/", adaptador)
+        
+        try:
+            medicao = buscar_todas(urls, args.threads, diretorio, montar)
+        finally:
+            adaptador.encerrar()
+    return resultado("HTTP/2", medicao, servidor)
+
+
+def imprimir_resultado(r: Dict):
+    print(f"\n[{r['transporte']}] {r['requisicoes']} requisições ({r['falhas']} falhas) em {r['duracao_s']}s")
+    print(f"    {r['requisicoes_por_s']} req/s | latência p50 {r['latencia_p50_ms']} ms, "
+          f"p95 {r['latencia_p95_ms']} ms | {r['conexoes']} conexões | {r['mb_enviados']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP/2 x HTTP/1.1 nas páginas de obras (sem rede)")
+    parser.add_argument("--paginas", type=int, default=5,
+                        help="Páginas de listagem por categoria (padrão: 5)")
+    parser.add_argument("--lotes-por-pagina", type=int, default=20,
+                        help="Lotes por página de listagem (padrão: 20)")
+    parser.add_argument("--threads", type=int, default=16,
+                        help="Threads buscando páginas ao mesmo tempo, um scraper por thread (padrão: 16)")
+    parser.add_argument("--latencia-ms", type=float, default=20.0,
+                        help="Latência simulada de cada resposta em ms (padrão: 20)")
+    parser.add_argument("--salvar", default=None, help="Salvar os resultados em JSON")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar a saída dos scrapers")
+    args = parser.parse_args()
+    
+    if not HTTP2_DISPONIVEL:
+        print('[ERRO] HTTP/2 requer httpx com h2: pip install "httpx[http2]"')
+        return 1
+    
+    # Antes de criar os scrapers (BaseScraper._setup_logging não reconfigura o logging)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    
+    with tempfile.TemporaryDirectory(prefix="benchmark_http2_") as diretorio:
+        fixtures = gerar_paginas(args, diretorio)
+        chaves = [chave for chave, pagina in fixtures.paginas.items() if pagina.tipo == "obra"]
+        
+        print("=" * 80)
+        print("BENCHMARK HTTP/2 x HTTP/1.1")
+        print(f"{len(chaves)} páginas de obras | {args.threads} threads | latência {args.latencia_ms} ms")
+        print("=" * 80)
+        
+        resultados = [
+            medir_http1(fixtures, chaves, args, diretorio),
+            medir_http2(fixtures, chaves, args, diretorio)
+        ]
+    
+    for r in resultados:
+        imprimir_resultado(r)
+    
+    http1, http2 = resultados
+    if http1["requisicoes_por_s"]:
+        print(f"\n[INFO] HTTP/2: {http2['requisicoes_por_s'] / http1['requisicoes_por_s']:.2f}x a vazão do HTTP/1.1, "
+              f"{http2['conexoes']} conexão(ões) contra {http1['conexoes']}")
+    
+    if args.salvar:
+        Path(args.salvar).parent.mkdir(parents=True, exist_ok=True)
+        conteudo = {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "parametros": {"paginas": args.paginas, "lotes_por_pagina": args.lotes_por_pagina,
+                           "threads": args.threads, "latencia_ms": args.latencia_ms},
+            "resultados": resultados
+        }
+        Path(args.salvar).write_text(json.dumps(conteudo, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultados salvos em {args.salvar}")
+    
+    return 1 if any(r["falhas"] for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
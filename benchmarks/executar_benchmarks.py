@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do pipeline de scraping de ponta a ponta, sem acessar a rede
+
+Executa IArremateScraper.executar_scraping, LeiloesBRScraper.executar_scraping e
+ExtratorObrasEspecificas.extrair_todas_obras (+ gravação no banco) contra um servidor HTTP
+local que serve as páginas dos sites, e reporta páginas/s, lotes/s, divisão da CPU
+(fetch/parse/extract/persist) e pico de memória (RSS)
+
+Cada cenário roda em um processo separado, com banco SQLite, logs e saídas em um diretório
+temporário (o banco do projeto não é tocado). Os delays entre requisições e o limitador de
+taxa por host são ignorados e aparecem no relatório como "espera ignorada"
+
+Uso:
+    python benchmarks/executar_benchmarks.py
+    python benchmarks/executar_benchmarks.py --cenarios iarremate catalogos --paginas 10
+    python benchmarks/executar_benchmarks.py --salvar benchmarks/baseline.json
+    python benchmarks/executar_benchmarks.py --baseline benchmarks/baseline.json --tolerancia 0.2
+    python benchmarks/executar_benchmarks.py --gravacao cache/http   # páginas reais gravadas pelo cache HTTP
+    python benchmarks/executar_benchmarks.py --cenarios catalogos --processos-extracao 4
+
+Com --baseline, o comando termina com código 1 se algum cenário falhar ou ficar mais lento
+(lotes/s, páginas/s) ou usar mais memória que a baseline além da tolerância
+
+Com --processos-extracao N, o parse e a extração do cenário catalogos rodam nos processos do
+PipelineExtracao: a CPU e o perfil por estágio passam a contar só a thread principal (busca,
+orquestração e banco), e o pico de RSS não inclui os processos de extração
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmarks.gerador_fixtures import (
+    ConjuntoFixtures, adicionar_listagem_iarremate, adicionar_listagem_leiloes_br,
+    adicionar_catalogo_leiloes_br, carregar_gravacao, resumo
+)
+from benchmarks.perfil import PerfilEstagios, ESTAGIOS
+from benchmarks.servidor_local import ServidorFixtures
+
+
+CENARIOS = ["iarremate", "leiloes_br", "catalogos"]
+
+# Métodos de extração (prefixos) e os que apenas orquestram páginas (ficam em "outros")
+PREFIXOS_EXTRACAO = ("extrair_", "_extrair_", "_encontrar_", "_verificar_", "_validar_")
+METODOS_ORQUESTRACAO = (
+    "extrair_todas_obras",
+    "extrair_obras_do_catalogo_iarremate",
+    "extrair_obras_do_catalogo_leiloes_br"
+)
+
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (None se indisponível, ex.: Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    if sys.platform == "darwin":
+        return round(pico / (1024 * 1024), 1)
+    return round(pico / 1024, 1)
+
+
+def url_pagina_leiloes_br(url_categoria: str, pagina: int) -> str:
+    """URL de uma página da busca do LeilõesBR (mesma regra de LeiloesBRScraper.executar_scraping)"""
+    if pagina == 1:
+        return url_categoria
+    if 'busca_andamento' in url_categoria:
+        if '&b=' in url_categoria:
+            return re.sub(r'&b=\d+', f'&b={pagina - 1}', url_categoria)
+        return f"{url_categoria}&b={pagina - 1}"
+    if '?' in url_categoria:
+        return f"{url_categoria}&pagina={pagina}"
+    return f"{url_categoria}?pagina={pagina}"
+
+
+def instrumentar_pipeline(perfil: PerfilEstagios):
+    """Envolve fetch/parse/extract/persist dos scrapers e do extrator com os medidores do perfil"""
+    from src.base_scraper import BaseScraper
+    from src.iarremate_scraper import IArremateScraper
+    from src.leiloes_br_scraper import LeiloesBRScraper
+    from src.pipeline_extracao import ExtratorPaginaObra
+    from extrair_obras_especificas import ExtratorObrasEspecificas
+    
+    # fetch: requisições HTTP (inclui retries e redirecionamentos)
+    perfil.instrumentar(BaseScraper, ["fazer_requisicao"], "fetch")
+    
+    # parse: construção das árvores BeautifulSoup (todas passam por BaseScraper.criar_soup)
+    perfil.instrumentar(BaseScraper, ["criar_soup"], "parse")
+    
+    # extract: buscas na árvore e limpeza dos campos
+    for classe in (BaseScraper, IArremateScraper, LeiloesBRScraper, ExtratorPaginaObra, ExtratorObrasEspecificas):
+        perfil.instrumentar_por_prefixo(classe, PREFIXOS_EXTRACAO, "extract", excluir=METODOS_ORQUESTRACAO)
+    
+    # persist: consultas de duplicatas e gravação no banco
+    for classe in (IArremateScraper, LeiloesBRScraper, ExtratorObrasEspecificas):
+        perfil.instrumentar(classe, ["obra_ja_existe"], "persist")
+    perfil.instrumentar(ExtratorObrasEspecificas, ["salvar_obras_no_banco"], "persist")
+    
+    # Delays entre requisições: não dormir, apenas contabilizar
+    def dormir(self, segundos: float):
+        perfil.espera_ignorada += segundos
+    BaseScraper.dormir = dormir
+    
+    # Limitador de taxa: sem reservas (o relógio não avança entre requisições locais);
+    # contabiliza o intervalo que o limitador do host imporia em regime contínuo
+    def aguardar_vez(self, url: str):
+        perfil.espera_ignorada += max(self.limitador.intervalo(url), self.delay_between_requests)
+    BaseScraper.aguardar_vez = aguardar_vez
+
+
+def conectar_persistencia(scraper, db, perfil: PerfilEstagios) -> Dict:
+    """
+    Grava as obras coletadas a cada checkpoint, como a API (executar_scraper) faz
+    Retorna os contadores (persistidas/gravadas); a última gravação é feita com contadores['persistir']()
+    """
+    from database import ScrapingSession, salvar_obras_coletadas
+    
+    sessao = ScrapingSession(scraper_name=scraper.scraper_name, status="executando", inicio=datetime.utcnow())
+    db.add(sessao)
+    db.commit()
+    db.refresh(sessao)
+    scraper.session_id = sessao.id
+    
+    contadores = {"persistidas": 0, "gravadas": 0}
+    
+    def persistir(estado: Optional[dict] = None):
+        with perfil.medir("persist"):
+            pendentes = scraper.dados_obras[contadores["persistidas"]:]
+            novas, _ = salvar_obras_coletadas(db, sessao.id, scraper.scraper_name, pendentes)
+            db.commit()
+            contadores["persistidas"] += len(pendentes)
+            contadores["gravadas"] += novas
+    
+    scraper.ao_registrar_checkpoint = persistir
+    contadores["persistir"] = persistir
+    return contadores
+
+
+def preparar_cenario(nome: str, args, fixtures: ConjuntoFixtures, db):
+    """Cria os objetos do cenário e registra as páginas que ele vai buscar; retorna a função que executa"""
+    from src.iarremate_scraper import IArremateScraper
+    from src.leiloes_br_scraper import LeiloesBRScraper
+    import extrair_obras_especificas
+    
+    gerar = not args.gravacao
+    
+    if nome == "iarremate":
+        scraper = IArremateScraper(db_session=db)
+        if gerar:
+            for categoria in ("quadros", "esculturas"):
+                url_categoria = scraper._url_categoria(categoria)
+                adicionar_listagem_iarremate(
+                    fixtures, lambda pagina, url=url_categoria: scraper._url_pagina(url, pagina),
+                    args.paginas, args.lotes_por_pagina
+                )
+        sessoes = [scraper.session]
+        
+        def executar(perfil):
+            contadores = conectar_persistencia(scraper, db, perfil)
+            scraper.executar_scraping()
+            contadores["persistir"]()
+            return len(scraper.dados_obras), contadores["gravadas"]
+    
+    elif nome == "leiloes_br":
+        scraper = LeiloesBRScraper(db_session=db)
+        if gerar:
+            for url_categoria in (scraper.url_quadros, scraper.url_esculturas):
+                adicionar_listagem_leiloes_br(
+                    fixtures, lambda pagina, url=url_categoria: url_pagina_leiloes_br(url, pagina),
+                    args.paginas, args.lotes_por_pagina
+                )
+        sessoes = [scraper.session]
+        
+        def executar(perfil):
+            contadores = conectar_persistencia(scraper, db, perfil)
+            scraper.executar_scraping()
+            contadores["persistir"]()
+            return len(scraper.dados_obras), contadores["gravadas"]
+    
+    else:
+        extrator = extrair_obras_especificas.ExtratorObrasEspecificas(processos_extracao=args.processos_extracao)
+        if gerar:
+            catalogos = extrair_obras_especificas.URLS_CATALOGOS
+            for url_catalogo in catalogos['iarremate']:
+                adicionar_listagem_iarremate(
+                    fixtures,
+                    lambda pagina, url=url_catalogo: extrator.scraper_iarremate._url_pagina(url, pagina),
+                    args.paginas_catalogo, args.lotes_por_pagina, paginas_vazias=2
+                )
+            for url_catalogo in catalogos['leiloes_br']:
+                adicionar_catalogo_leiloes_br(
+                    fixtures,
+                    lambda pagina, url=url_catalogo: extrator._construir_url_pagina_leiloes_br(url, pagina),
+                    args.paginas_catalogo, args.lotes_por_pagina
+                )
+        sessoes = [extrator.scraper_iarremate.session, extrator.scraper_leiloes_br.session]
+        
+        def executar(perfil):
+            try:
+                obras = extrator.extrair_todas_obras()
+                extrator.salvar_obras_no_banco(obras)
+            finally:
+                extrator.db_session.close()
+            return len(obras), len(extrator.obras_ids_banco)
+    
+    return executar, sessoes
+
+
+def executar_cenario(nome: str, args) -> Dict:
+    """Executa um cenário no processo atual e retorna as métricas"""
+    from database import init_db, SessionLocal
+    
+    init_db()
+    db = SessionLocal()
+    perfil = PerfilEstagios()
+    instrumentar_pipeline(perfil)
+    
+    fixtures = carregar_gravacao(args.gravacao) if args.gravacao else ConjuntoFixtures()
+    
+    try:
+        executar, sessoes = preparar_cenario(nome, args, fixtures, db)
+        
+        with ServidorFixtures(fixtures) as servidor:
+            for sessao_http in sessoes:
+                servidor.montar(sessao_http)
+            
+            inicio_cpu, inicio = time.thread_time(), time.perf_counter()
+            lotes, gravados = executar(perfil)
+            duracao = time.perf_counter() - inicio
+            cpu_total = time.thread_time() - inicio_cpu
+    finally:
+        db.close()
+    
+    paginas = servidor.requisicoes.get("listagem", 0)
+    return {
+        "cenario": nome,
+        "duracao_s": round(duracao, 3),
+        "paginas": paginas,
+        "lotes": lotes,
+        "lotes_gravados": gravados,
+        "paginas_por_s": round(paginas / duracao, 2) if duracao else 0.0,
+        "lotes_por_s": round(lotes / duracao, 2) if duracao else 0.0,
+        "requisicoes": dict(servidor.requisicoes),
+        "mb_recebidos": round(servidor.bytes_enviados / (1024 * 1024), 2),
+        "cpu_s": round(cpu_total, 3),
+        "estagios": perfil.resumo(cpu_total),
+        "espera_ignorada_s": round(perfil.espera_ignorada, 1),
+        "pico_rss_mb": pico_rss_mb(),
+        "fixtures": resumo(fixtures)
+    }
+
+
+def executar_em_subprocesso(nome: str, args) -> Optional[Dict]:
+    """Executa o cenário em um processo próprio (pico de RSS isolado, banco e logs temporários)"""
+    with tempfile.TemporaryDirectory(prefix=f"benchmark_{nome}_") as diretorio:
+        diretorio = Path(diretorio)
+        saida = diretorio / "resultado.json"
+        
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{diretorio / 'benchmark.db'}"
+        env["PYTHONIOENCODING"] = "utf-8"
+        env.pop("SCRAPER_CACHE_DIR", None)
+        env.pop("SCRAPER_REPLAY", None)
+        
+        comando = [
+            sys.executable, str(Path(__file__).resolve()),
+            "--cenario-interno", nome,
+            "--saida-interna", str(saida),
+            "--paginas", str(args.paginas),
+            "--lotes-por-pagina", str(args.lotes_por_pagina),
+            "--paginas-catalogo", str(args.paginas_catalogo),
+            "--processos-extracao", str(args.processos_extracao)
+        ]
+        if args.gravacao:
+            comando += ["--gravacao", str(Path(args.gravacao).resolve())]
+        
+        processo = subprocess.run(
+            comando, cwd=diretorio, env=env,
+            capture_output=not args.verbose, text=True, encoding="utf-8", errors="replace"
+        )
+        
+        if processo.returncode != 0 or not saida.exists():
+            print(f"[ERRO] Cenário {nome} falhou (código {processo.returncode})")
+            if not args.verbose:
+                saida_erro = (processo.stderr or processo.stdout or "").strip().splitlines()
+                for linha in saida_erro[-15:]:
+                    print(f"    {linha}")
+            return None
+        
+        return json.loads(saida.read_text(encoding="utf-8"))
+
+
+def imprimir_resultado(resultado: Dict):
+    """Imprime as métricas de um cenário"""
+    pico = f"{resultado['pico_rss_mb']} MB" if resultado.get("pico_rss_mb") is not None else "n/d"
+    print(f"\n[{resultado['cenario']}] {resultado['paginas']} páginas, {resultado['lotes']} lotes "
+          f"({resultado['lotes_gravados']} gravados) em {resultado['duracao_s']}s")
+    print(f"    {resultado['paginas_por_s']} páginas/s | {resultado['lotes_por_s']} lotes/s | "
+          f"pico RSS {pico} | {resultado['mb_recebidos']} MB recebidos")
+    
+    cpu_total = resultado["cpu_s"] or 1e-9
+    partes = []
+    for estagio in ESTAGIOS + ("outros",):
+        cpu = resultado["estagios"][estagio]["cpu_s"]
+        partes.append(f"{estagio} {cpu:.2f}s ({cpu / cpu_total:.0%})")
+    print(f"    CPU {resultado['cpu_s']}s: " + " | ".join(partes))
+    
+    requisicoes = ", ".join(f"{tipo}: {total}" for tipo, total in sorted(resultado["requisicoes"].items()))
+    print(f"    Requisições: {requisicoes} | espera ignorada: {resultado['espera_ignorada_s']}s")
+
+
+def comparar_com_baseline(resultados: Dict[str, Dict], baseline: Dict, tolerancia: float) -> List[str]:
+    """Retorna as regressões em relação à baseline (vazão menor ou memória maior que a tolerância)"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get("cenarios", {}).get(nome)
+        if not base:
+            print(f"[AVISO] Cenário {nome} não está na baseline")
+            continue
+        
+        for metrica in ("lotes_por_s", "paginas_por_s"):
+            if base.get(metrica) and atual[metrica] < base[metrica] * (1 - tolerancia):
+                queda = 1 - atual[metrica] / base[metrica]
+                regressoes.append(f"{nome}: {metrica} {atual[metrica]} < {base[metrica]} (-{queda:.0%})")
+        
+        if base.get("pico_rss_mb") and atual.get("pico_rss_mb"):
+            if atual["pico_rss_mb"] > base["pico_rss_mb"] * (1 + tolerancia):
+                aumento = atual["pico_rss_mb"] / base["pico_rss_mb"] - 1
+                regressoes.append(f"{nome}: pico_rss_mb {atual['pico_rss_mb']} > {base['pico_rss_mb']} (+{aumento:.0%})")
+    
+    return regressoes
+
+
+def parametros(args) -> Dict:
+    return {
+        "paginas": args.paginas,
+        "lotes_por_pagina": args.lotes_por_pagina,
+        "paginas_catalogo": args.paginas_catalogo,
+        "processos_extracao": args.processos_extracao,
+        "gravacao": bool(args.gravacao)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline de scraping (sem rede)")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=CENARIOS,
+                        help="Cenários a executar (padrão: todos)")
+    parser.add_argument("--paginas", type=int, default=5,
+                        help="Páginas por categoria nos cenários iarremate e leiloes_br (padrão: 5)")
+    parser.add_argument("--lotes-por-pagina", type=int, default=20,
+                        help="Lotes por página de listagem (padrão: 20)")
+    parser.add_argument("--paginas-catalogo", type=int, default=3,
+                        help="Páginas por catálogo no cenário catalogos (padrão: 3)")
+    parser.add_argument("--processos-extracao", type=int, default=0,
+                        help="Processos de parse/extração (PipelineExtracao) no cenário catalogos; "
+                             "0 extrai na thread principal, com o perfil por estágio completo (padrão: 0)")
+    parser.add_argument("--gravacao", default=None,
+                        help="Diretório do cache HTTP (SCRAPER_CACHE_DIR) com páginas reais gravadas")
+    parser.add_argument("--salvar", default=None, help="Salvar os resultados em JSON (ex.: como nova baseline)")
+    parser.add_argument("--baseline", default=None, help="JSON de resultados anteriores para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Piora máxima aceita em relação à baseline (padrão: 0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar a saída dos scrapers")
+    parser.add_argument("--cenario-interno", help=argparse.SUPPRESS)
+    parser.add_argument("--saida-interna", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    # Processo filho: executa um único cenário e grava o resultado
+    if args.cenario_interno:
+        resultado = executar_cenario(args.cenario_interno, args)
+        Path(args.saida_interna).write_text(json.dumps(resultado, ensure_ascii=False), encoding="utf-8")
+        return 0
+    
+    print("=" * 80)
+    print("BENCHMARKS DO PIPELINE DE SCRAPING")
+    print(f"Cenários: {', '.join(args.cenarios)}")
+    if args.gravacao:
+        print(f"Páginas gravadas: {args.gravacao}")
+    else:
+        print(f"Páginas geradas: {args.paginas} por categoria, {args.lotes_por_pagina} lotes por página, "
+              f"{args.paginas_catalogo} por catálogo")
+    print("=" * 80)
+    
+    resultados = {}
+    falhas = []
+    for nome in args.cenarios:
+        print(f"\n[INFO] Executando cenário {nome}...")
+        resultado = executar_em_subprocesso(nome, args)
+        if resultado is None:
+            falhas.append(nome)
+            continue
+        resultados[nome] = resultado
+        imprimir_resultado(resultado)
+    
+    if args.salvar and resultados:
+        Path(args.salvar).parent.mkdir(parents=True, exist_ok=True)
+        conteudo = {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "parametros": parametros(args),
+            "cenarios": resultados
+        }
+        Path(args.salvar).write_text(json.dumps(conteudo, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultados salvos em {args.salvar}")
+    
+    regressoes = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("parametros") != parametros(args):
+            print(f"\n[AVISO] Parâmetros diferentes da baseline: {baseline.get('parametros')}")
+        regressoes = comparar_com_baseline(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n[ERRO] Regressões em relação à baseline (tolerância {args.tolerancia:.0%}):")
+            for regressao in regressoes:
+                print(f"    - {regressao}")
+        else:
+            print(f"\n[OK] Sem regressões em relação à baseline (tolerância {args.tolerancia:.0%})")
+    
+    if falhas:
+        print(f"\n[ERRO] Cenários com falha: {', '.join(falhas)}")
+    
+    return 1 if falhas or regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geração das páginas servidas pelo servidor local dos benchmarks
+As páginas são montadas a partir dos modelos HTML em benchmarks/fixtures (mesma estrutura
+dos sites reais) com dados determinísticos, ou carregadas de uma gravação feita com o
+cache HTTP dos scrapers (SCRAPER_CACHE_DIR)
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse, unquote
+
+
+DIRETORIO_MODELOS = Path(__file__).parent / "fixtures"
+
+ARTISTAS = [
+    "Candido Portinari", "Di Cavalcanti", "Tarsila do Amaral", "Alfredo Volpi", "Anita Malfatti",
+    "Guignard", "Djanira da Motta e Silva", "Aldo Bonadei", "Cicero Dias", "Ismael Nery",
+    "Lasar Segall", "Tomie Ohtake", "Burle Marx", "Carybé", "Aldemir Martins", "Inimá de Paula"
+]
+
+TITULOS = [
+    "Paisagem com casario", "Marinha ao entardecer", "Natureza morta com frutas", "Retrato de mulher",
+    "Bandeirinhas", "Figuras no cais", "Vista de Ouro Preto", "Composição abstrata",
+    "Mulata com flores", "Pescadores na praia", "Cena de fazenda", "Flores no vaso azul"
+]
+
+TECNICAS = [
+    "óleo sobre tela", "acrílica sobre tela", "aquarela sobre papel", "guache sobre cartão",
+    "escultura em bronze", "escultura em madeira policromada", "litografia assinada", "serigrafia numerada"
+]
+
+LEILOEIROS = {
+    "www.miguelsalles.com.br": "Miguel Salles",
+    "www.robertohaddad.lel.br": "Roberto Haddad"
+}
+
+
+@dataclass
+class PaginaFixture:
+    """Resposta servida pelo servidor local para uma URL"""
+    corpo: bytes = b""
+    tipo: str = "obra"  # listagem | obra | redirecionamento
+    status: int = 200
+    destino: Optional[str] = None  # Location dos redirecionamentos
+
+
+def chave_url(url: str) -> str:
+    """Chave de uma URL no conjunto de páginas: host + caminho + query (sem esquema e sem escapes)"""
+    partes = urlparse(url)
+    chave = partes.netloc.lower() + unquote(partes.path or "/")
+    if partes.query:
+        chave += "?" + unquote(partes.query)
+    return chave
+
+
+def carregar_modelo(nome: str) -> Template:
+    """Carrega um modelo HTML de benchmarks/fixtures"""
+    return Template((DIRETORIO_MODELOS / nome).read_text(encoding="utf-8"))
+
+
+class ConjuntoFixtures:
+    """Páginas servidas pelo servidor local, indexadas por chave_url"""
+    
+    def __init__(self, semente: int = 42):
+        self.paginas: Dict[str, PaginaFixture] = {}
+        self.rng = random.Random(semente)
+        self._proximo_id = 100000
+        self._modelos: Dict[str, Template] = {}
+        self.menu = "\n".join(
+            f'      <li><a href="/leiloes/categoria-{indice}">Categoria {indice}</a></li>'
+            for indice in range(1, 61)
+        )
+    
+    def modelo(self, nome: str) -> Template:
+        if nome not in self._modelos:
+            self._modelos[nome] = carregar_modelo(nome)
+        return self._modelos[nome]
+    
+    def adicionar(self, url: str, corpo: str, tipo: str):
+        """Registra uma página HTML para a URL"""
+        self.paginas[chave_url(url)] = PaginaFixture(corpo=corpo.encode("utf-8"), tipo=tipo)
+    
+    def redirecionar(self, url: str, destino: str):
+        """Registra um redirecionamento (302) da URL para o destino"""
+        self.paginas[chave_url(url)] = PaginaFixture(tipo="redirecionamento", status=302, destino=destino)
+    
+    def obter(self, chave: str) -> Optional[PaginaFixture]:
+        return self.paginas.get(chave)
+    
+    def novo_lote(self, numero_lote: int) -> Dict[str, str]:
+        """Dados determinísticos de um lote (título, valor, lances...)"""
+        self._proximo_id += 1
+        valor = self.rng.randint(300, 250000)
+        return {
+            "id": str(self._proximo_id),
+            "lote": str(numero_lote),
+            "titulo": f"{self.rng.choice(ARTISTAS)} - {self.rng.choice(TITULOS)}, {self.rng.choice(TECNICAS)}",
+            "descricao": f"Assinado no canto inferior direito. Medidas {self.rng.randint(20, 120)} x {self.rng.randint(20, 120)} cm.",
+            "valor": f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+            "lances": str(self.rng.randint(0, 40)),
+            "visitas": str(self.rng.randint(10, 3000)),
+            "data_inicio": f"{self.rng.randint(1, 28):02d}/11/2026 20:00",
+            "data_leilao": f"{self.rng.randint(1, 28):02d}/11/2026",
+            "menu": self.menu
+        }
+    
+    def __len__(self):
+        return len(self.paginas)
+
+
+def adicionar_listagem_iarremate(conjunto: ConjuntoFixtures, url_pagina: Callable[[int], str],
+                                 paginas: int, lotes_por_pagina: int, paginas_vazias: int = 1):
+    """
+    Listagem do iArremate (categoria do scraper ou catálogo de leiloeiro) e as páginas dos lotes
+    As páginas seguintes à última (paginas_vazias) não têm obras, como no site real
+    """
+    modelo_listagem = conjunto.modelo("iarremate_listagem.html")
+    modelo_card = conjunto.modelo("iarremate_card.html")
+    modelo_obra = conjunto.modelo("iarremate_obra.html")
+    
+    url_base = urlparse(url_pagina(1))
+    origem = f"{url_base.scheme}://{url_base.netloc}"
+    caminho_categoria = url_base.path.rstrip("/")
+    
+    numero_lote = 0
+    for pagina in range(1, paginas + paginas_vazias + 1):
+        cards = []
+        if pagina <= paginas:
+            for _ in range(lotes_por_pagina):
+                numero_lote += 1
+                lote = conjunto.novo_lote(numero_lote)
+                lote["href"] = f"{caminho_categoria}/lote-{lote['id']}"
+                cards.append(modelo_card.substitute(lote))
+                conjunto.adicionar(origem + lote["href"], modelo_obra.substitute(lote), "obra")
+        
+        corpo = modelo_listagem.substitute(menu=conjunto.menu, cards="\n".join(cards))
+        conjunto.adicionar(url_pagina(pagina), corpo, "listagem")
+
+
+def adicionar_listagem_leiloes_br(conjunto: ConjuntoFixtures, url_pagina: Callable[[int], str],
+                                  paginas: int, lotes_por_pagina: int):
+    """
+    Busca do LeilõesBR e as páginas dos lotes
+    Os links das peças redirecionam para o site do leiloeiro, como no site real
+    """
+    modelo_listagem = conjunto.modelo("leiloes_br_listagem.html")
+    modelo_card = conjunto.modelo("leiloes_br_card.html")
+    modelo_obra = conjunto.modelo("leiloes_br_obra.html")
+    
+    url_base = urlparse(url_pagina(1))
+    origem = f"{url_base.scheme}://{url_base.netloc}"
+    hosts_leiloeiros = list(LEILOEIROS)
+    
+    numero_lote = 0
+    for pagina in range(1, paginas + 1):
+        cards = []
+        for _ in range(lotes_por_pagina):
+            numero_lote += 1
+            lote = conjunto.novo_lote(numero_lote)
+            host = hosts_leiloeiros[numero_lote % len(hosts_leiloeiros)]
+            lote["leiloeiro"] = LEILOEIROS[host]
+            lote["leilao"] = str(50000 + pagina)
+            cards.append(modelo_card.substitute(lote))
+            
+            url_peca = f"{origem}/peca.asp?ID={lote['id']}&leilao={lote['leilao']}"
+            url_leiloeiro = f"https://{host}/peca.asp?ID={lote['id']}"
+            conjunto.redirecionar(url_peca, url_leiloeiro)
+            conjunto.adicionar(url_leiloeiro, modelo_obra.substitute(lote), "obra")
+        
+        corpo = modelo_listagem.substitute(
+            menu=conjunto.menu,
+            cards="\n".join(cards),
+            total_itens=paginas * lotes_por_pagina,
+            por_pagina=lotes_por_pagina
+        )
+        conjunto.adicionar(url_pagina(pagina), corpo, "listagem")
+
+
+def adicionar_catalogo_leiloes_br(conjunto: ConjuntoFixtures, url_pagina: Callable[[int], str],
+                                  paginas: int, lotes_por_pagina: int, paginas_vazias: int = 2):
+    """Catálogo de leiloeiro (Miguel Salles, Roberto Haddad) e as páginas dos lotes"""
+    modelo_catalogo = conjunto.modelo("catalogo_leiloes_br.html")
+    modelo_linha = conjunto.modelo("catalogo_leiloes_br_linha.html")
+    modelo_obra = conjunto.modelo("leiloes_br_obra.html")
+    
+    url_base = urlparse(url_pagina(1))
+    origem = f"{url_base.scheme}://{url_base.netloc}"
+    leilao = str(conjunto.rng.randint(50000, 59999))
+    
+    numero_lote = 0
+    for pagina in range(1, paginas + paginas_vazias + 1):
+        linhas = []
+        if pagina <= paginas:
+            for _ in range(lotes_por_pagina):
+                numero_lote += 1
+                lote = conjunto.novo_lote(numero_lote)
+                lote["leiloeiro"] = LEILOEIROS.get(url_base.netloc, url_base.netloc)
+                lote["leilao"] = leilao
+                linhas.append(modelo_linha.substitute(lote))
+                conjunto.adicionar(
+                    f"{origem}/peca.asp?ID={lote['id']}&Num={leilao}",
+                    modelo_obra.substitute(lote),
+                    "obra"
+                )
+        
+        corpo = modelo_catalogo.substitute(
+            menu=conjunto.menu,
+            linhas="\n".join(linhas),
+            leilao=leilao,
+            pagina=pagina,
+            total_paginas=paginas
+        )
+        conjunto.adicionar(url_pagina(pagina), corpo, "listagem")
+
+
+def carregar_gravacao(diretorio: str) -> ConjuntoFixtures:
+    """
+    Carrega páginas reais gravadas pelo cache HTTP dos scrapers (SCRAPER_CACHE_DIR)
+    Redirecionamentos gravados (url != url_final) são servidos como 302
+    """
+    conjunto = ConjuntoFixtures()
+    urls_listagem = ("pg", "busca", "catalogo.asp", "/quadros", "/esculturas")
+    
+    for caminho_meta in sorted(Path(diretorio).rglob("*.json")):
+        try:
+            meta = json.loads(caminho_meta.read_text(encoding="utf-8"))
+            corpo = caminho_meta.with_suffix(".body").read_bytes()
+        except (OSError, ValueError):
+            continue
+        
+        url = meta.get("url")
+        url_final = meta.get("url_final") or url
+        if not url:
+            continue
+        
+        tipo = "listagem" if any(trecho in url_final.lower() for trecho in urls_listagem) else "obra"
+        conjunto.paginas[chave_url(url_final)] = PaginaFixture(corpo=corpo, tipo=tipo)
+        if chave_url(url) != chave_url(url_final):
+            conjunto.redirecionar(url, url_final)
+    
+    return conjunto
+
+
+def resumo(conjunto: ConjuntoFixtures) -> Dict[str, int]:
+    """Quantidade de páginas por tipo"""
+    contagem: Dict[str, int] = {}
+    for pagina in conjunto.paginas.values():
+        contagem[pagina.tipo] = contagem.get(pagina.tipo, 0) + 1
+    return contagem
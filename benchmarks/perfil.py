@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medição do tempo gasto em cada estágio do pipeline (fetch, parse, extract, persist)
+Os métodos dos scrapers são envolvidos por medidores; o tempo é exclusivo (um estágio
+aninhado em outro, ex.: fetch dentro de extrair_obra_*, pausa o estágio de fora), medido
+em CPU da thread principal (time.thread_time) e em tempo de parede
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+ESTAGIOS = ("fetch", "parse", "extract", "persist")
+
+
+class PerfilEstagios:
+    """Acumula CPU, tempo de parede e número de chamadas por estágio"""
+    
+    def __init__(self):
+        self.cpu: Dict[str, float] = {estagio: 0.0 for estagio in ESTAGIOS}
+        self.parede: Dict[str, float] = {estagio: 0.0 for estagio in ESTAGIOS}
+        self.chamadas: Dict[str, int] = {estagio: 0 for estagio in ESTAGIOS}
+        self.espera_ignorada = 0.0
+        self._pilha: List[List] = []  # [estagio, inicio_cpu, inicio_parede]
+    
+    def _acumular_topo(self, agora_cpu: float, agora_parede: float):
+        estagio, inicio_cpu, inicio_parede = self._pilha[-1]
+        self.cpu[estagio] += agora_cpu - inicio_cpu
+        self.parede[estagio] += agora_parede - inicio_parede
+    
+    @contextmanager
+    def medir(self, estagio: str):
+        """Mede o bloco como tempo exclusivo do estágio"""
+        agora_cpu, agora_parede = time.thread_time(), time.perf_counter()
+        if self._pilha:
+            self._acumular_topo(agora_cpu, agora_parede)
+        self._pilha.append([estagio, agora_cpu, agora_parede])
+        self.chamadas[estagio] += 1
+        try:
+            yield
+        finally:
+            agora_cpu, agora_parede = time.thread_time(), time.perf_counter()
+            self._acumular_topo(agora_cpu, agora_parede)
+            self._pilha.pop()
+            if self._pilha:
+                # Retomar a contagem do estágio de fora
+                self._pilha[-1][1] = agora_cpu
+                self._pilha[-1][2] = agora_parede
+    
+    def envolver(self, funcao, estagio: str):
+        """Retorna a função envolvida pelo medidor do estágio"""
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            with self.medir(estagio):
+                return funcao(*args, **kwargs)
+        return medida
+    
+    def instrumentar(self, alvo, nomes: Iterable[str], estagio: str):
+        """Substitui atributos (métodos de classe ou funções de módulo) pelas versões medidas"""
+        for nome in nomes:
+            setattr(alvo, nome, self.envolver(getattr(alvo, nome), estagio))
+    
+    def instrumentar_por_prefixo(self, classe, prefixos: Iterable[str], estagio: str,
+                                 excluir: Iterable[str] = ()):
+        """Instrumenta os métodos definidos na própria classe cujo nome começa com um dos prefixos"""
+        prefixos = tuple(prefixos)
+        excluir = set(excluir)
+        nomes = [
+            nome for nome, valor in vars(classe).items()
+            if callable(valor) and nome.startswith(prefixos) and nome not in excluir
+        ]
+        self.instrumentar(classe, nomes, estagio)
+        return nomes
+    
+    def resumo(self, cpu_total: float) -> Dict[str, Dict[str, float]]:
+        """CPU/parede/chamadas por estágio; 'outros' é a CPU fora dos estágios (orquestração, logs)"""
+        resultado = {
+            estagio: {
+                "cpu_s": round(self.cpu[estagio], 4),
+                "parede_s": round(self.parede[estagio], 4),
+                "chamadas": self.chamadas[estagio]
+            }
+            for estagio in ESTAGIOS
+        }
+        resultado["outros"] = {
+            "cpu_s": round(max(cpu_total - sum(self.cpu.values()), 0.0), 4),
+            "parede_s": None,
+            "chamadas": None
+        }
+        return resultado
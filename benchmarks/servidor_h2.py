@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor HTTP/2 local (h2c, sem TLS) com as mesmas páginas de ServidorFixtures
+Usado por benchmark_http2.py para comparar o transporte HTTP/2 (AdaptadorHTTP2) com o
+HTTP/1.1 do requests; requer o pacote h2 (instalado com httpx[http2])
+"""
+
+import asyncio
+import threading
+from typing import Dict
+
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import ConnectionTerminated, RequestReceived, StreamReset, WindowUpdated
+from h2.exceptions import StreamClosedError
+
+from .gerador_fixtures import ConjuntoFixtures, chave_url
+
+
+class ServidorFixturesH2:
+    """
+    Servidor h2c em uma thread com loop asyncio próprio; cada stream é respondido em uma tarefa,
+    então várias requisições da mesma conexão são atendidas ao mesmo tempo
+    
+    Uso:
+        with ServidorFixturesH2(fixtures, latencia=0.02) as servidor:
+            requests para f"{servidor.endereco}/<host>/<caminho>"
+    """
+    
+    def __init__(self, fixtures: ConjuntoFixtures, host: str = "127.0.0.1", porta: int = 0,
+                 latencia: float = 0.0):
+        """
+        Args:
+            fixtures: Páginas servidas (GET /<host>/<caminho>)
+            latencia: Atraso de cada resposta em segundos (simula o tempo de resposta do site)
+        """
+        self.fixtures = fixtures
+        self.host = host
+        self.porta = porta
+        self.latencia = latencia
+        self.requisicoes: Dict[str, int] = {}
+        self.bytes_enviados = 0
+        self.conexoes = 0
+        self._loop = None
+        self._servidor = None
+        self._thread = None
+        self._pronto = threading.Event()
+        self._abertas = set()  # Conexões abertas (fechadas em parar)
+    
+    @property
+    def endereco(self) -> str:
+        return f"http://{self.host}:{self.porta}"
+    
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        self._pronto.wait()
+        return self
+    
+    def parar(self):
+        asyncio.run_coroutine_threadsafe(self._encerrar(), self._loop)
+        self._thread.join(timeout=5)
+    
+    async def _encerrar(self):
+        """Fecha o servidor e as conexões abertas antes de parar o loop"""
+        self._servidor.close()
+        for writer in list(self._abertas):
+            writer.close()
+        tarefas = [tarefa for tarefa in asyncio.all_tasks() if tarefa is not asyncio.current_task()]
+        if tarefas:
+            await asyncio.wait(tarefas, timeout=2)
+        self._loop.stop()
+    
+    def _executar(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._servidor = self._loop.run_until_complete(
+            asyncio.start_server(self._atender, self.host, self.porta)
+        )
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        self._pronto.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+    
+    def registrar(self, tipo: str, tamanho: int):
+        # Chamado apenas na thread do loop
+        self.requisicoes[tipo] = self.requisicoes.get(tipo, 0) + 1
+        self.bytes_enviados += tamanho
+    
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Uma conexão HTTP/2: lê os frames e dispara uma tarefa por requisição"""
+        self.conexoes += 1
+        self._abertas.add(writer)
+        conexao = H2Connection(config=H2Configuration(client_side=False))
+        conexao.initiate_connection()
+        writer.write(conexao.data_to_send())
+        janela = asyncio.Event()  # Sinaliza WINDOW_UPDATE para os streams aguardando controle de fluxo
+        tarefas = set()
+        
+        try:
+            while True:
+                dados = await reader.read(65536)
+                if not dados:
+                    break
+                for evento in conexao.receive_data(dados):
+                    if isinstance(evento, RequestReceived):
+                        tarefa = asyncio.create_task(
+                            self._responder(conexao, writer, janela, evento.stream_id, evento.headers)
+                        )
+                        tarefas.add(tarefa)
+                        tarefa.add_done_callback(tarefas.discard)
+                    elif isinstance(evento, (WindowUpdated, StreamReset)):
+                        janela.set()
+                    elif isinstance(evento, ConnectionTerminated):
+                        break
+                writer.write(conexao.data_to_send())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            self._abertas.discard(writer)
+            writer.close()
+    
+    async def _responder(self, conexao: H2Connection, writer: asyncio.StreamWriter,
+                         janela: asyncio.Event, stream_id: int, cabecalhos):
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+        
+        cabecalhos = {
+            (nome.decode() if isinstance(nome, bytes) else nome): (valor.decode() if isinstance(valor, bytes) else valor)
+            for nome, valor in cabecalhos
+        }
+        pagina = self.fixtures.obter(chave_url("http:/" + cabecalhos.get(":path", "/")))
+        
+        if pagina is None:
+            self.registrar("nao_encontrada", 0)
+            conexao.send_headers(stream_id, [(":status", "404"), ("content-length", "0")], end_stream=True)
+            writer.write(conexao.data_to_send())
+            return
+        
+        resposta = [(":status", str(pagina.status)), ("content-type", "text/html; charset=utf-8"),
+                    ("content-length", str(len(pagina.corpo)))]
+        if pagina.destino:
+            resposta.append(("location", pagina.destino))
+        conexao.send_headers(stream_id, resposta, end_stream=not pagina.corpo)
+        writer.write(conexao.data_to_send())
+        
+        # Corpo em frames limitados pela janela de controle de fluxo do stream/conexão
+        corpo = pagina.corpo
+        try:
+            while corpo:
+                tamanho = min(conexao.local_flow_control_window(stream_id), conexao.max_outbound_frame_size, len(corpo))
+                if tamanho <= 0:
+                    janela.clear()
+                    await janela.wait()
+                    continue
+                conexao.send_data(stream_id, corpo[:tamanho], end_stream=tamanho == len(corpo))
+                corpo = corpo[tamanho:]
+                writer.write(conexao.data_to_send())
+        except StreamClosedError:
+            return
+        self.registrar(pagina.tipo, len(pagina.corpo))
+    
+    def __enter__(self):
+        return self.iniciar()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+        return False
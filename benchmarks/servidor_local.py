@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor HTTP local que substitui os sites reais nos benchmarks
+Os scrapers continuam pedindo as URLs reais (https://www.iarremate.com/...): o adaptador
+montado na requests.Session deles reescreve cada requisição para o servidor local, que
+responde com a página do ConjuntoFixtures correspondente ao host + caminho
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .gerador_fixtures import ConjuntoFixtures, chave_url
+
+
+class _ManipuladorFixtures(BaseHTTPRequestHandler):
+    """Responde GET /<host>/<caminho>?<query> com a página registrada (404 se não existir)"""
+    
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo são escritos separadamente: sem TCP_NODELAY cada resposta espera o ACK atrasado
+    disable_nagle_algorithm = True
+    
+    def setup(self):
+        super().setup()
+        self.server.servidor_fixtures.registrar_conexao()
+    
+    def do_GET(self):
+        servidor: 'ServidorFixtures' = self.server.servidor_fixtures
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+        chave = chave_url("http:/" + self.path)
+        pagina = servidor.fixtures.obter(chave)
+        
+        if pagina is None:
+            servidor.registrar("nao_encontrada", 0)
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        
+        self.send_response(pagina.status)
+        if pagina.destino:
+            self.send_header("Location", pagina.destino)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(pagina.corpo)))
+        self.end_headers()
+        self.wfile.write(pagina.corpo)
+        servidor.registrar(pagina.tipo, len(pagina.corpo))
+    
+    def log_message(self, format, *args):
+        # Sem log por requisição (o console fica com a saída dos scrapers)
+        pass
+
+
+class ServidorFixtures:
+    """
+    Servidor local (thread em segundo plano) com contadores de requisições e bytes por tipo de página
+    
+    Uso:
+        with ServidorFixtures(fixtures) as servidor:
+            servidor.montar(scraper.session)
+            scraper.executar_scraping()
+    """
+    
+    def __init__(self, fixtures: ConjuntoFixtures, host: str = "127.0.0.1", porta: int = 0,
+                 latencia: float = 0.0):
+        self.fixtures = fixtures
+        self.latencia = latencia  # Atraso de cada resposta em segundos (simula o tempo de resposta do site)
+        self._httpd = ThreadingHTTPServer((host, porta), _ManipuladorFixtures)
+        self._httpd.daemon_threads = True
+        self._httpd.servidor_fixtures = self
+        self._thread = None
+        self._lock = threading.Lock()
+        self.requisicoes: Dict[str, int] = {}
+        self.bytes_enviados = 0
+        self.conexoes = 0
+    
+    @property
+    def endereco(self) -> str:
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+    
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def parar(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def registrar(self, tipo: str, tamanho: int):
+        with self._lock:
+            self.requisicoes[tipo] = self.requisicoes.get(tipo, 0) + 1
+            self.bytes_enviados += tamanho
+    
+    def registrar_conexao(self):
+        with self._lock:
+            self.conexoes += 1
+    
+    def montar(self, session: requests.Session):
+        """Faz a sessão dos scrapers usar o servidor local para qualquer URL http(s)"""
+        adaptador = AdaptadorServidorLocal(self.endereco)
+        # Substitui também os adaptadores por site do registro HTTP (prefixos mais longos têm prioridade)
+        for prefixo in set(session.adapters) | {"https://", "http://"}:
+            session.mount(prefixo, adaptador)
+    
+    def __enter__(self):
+        return self.iniciar()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.parar()
+        return False
+
+
+class AdaptadorServidorLocal(HTTPAdapter):
+    """
+    Adaptador do requests que envia https://host/caminho para http://servidor-local/host/caminho
+    A URL original é restaurada na requisição e na resposta (response.url, redirecionamentos e
+    logs dos scrapers continuam vendo os endereços reais)
+    """
+    
+    def __init__(self, endereco: str, **kwargs):
+        super().__init__(**kwargs)
+        self.endereco = endereco.rstrip("/")
+    
+    def send(self, request, **kwargs):
+        url_original = request.url
+        partes = urlparse(url_original)
+        url_local = f"{self.endereco}/{partes.netloc}{partes.path or '/'}"
+        if partes.query:
+            url_local += f"?{partes.query}"
+        
+        request.url = url_local
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            request.url = url_original
+        
+        response.url = url_original
+        return response
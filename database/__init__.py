@@ -2,17 +2,31 @@
 Módulo de banco de dados
 """
 
-from .database import init_db, get_db, get_db_sync, engine, SessionLocal
-from .models import Base, ScrapingSession, Obra
+from .database import init_db, atualizar_schema, get_db, get_db_sync, engine, SessionLocal
+from .models import Base, ScrapingSession, Obra, CheckpointScraping, Leilao, Artista
+from .blocos import iterar_em_blocos, iterar_select_em_blocos, iterar_por_ids, EscritorEmBlocos
+from .persistencia import criar_obra, obter_leilao_id, obter_artista_id, salvar_obras_coletadas
 
 __all__ = [
     'init_db',
+    'atualizar_schema',
     'get_db',
     'get_db_sync',
     'engine',
     'SessionLocal',
     'Base',
     'ScrapingSession',
-    'Obra'
+    'Obra',
+    'CheckpointScraping',
+    'Leilao',
+    'Artista',
+    'iterar_em_blocos',
+    'iterar_select_em_blocos',
+    'iterar_por_ids',
+    'EscritorEmBlocos',
+    'criar_obra',
+    'obter_leilao_id',
+    'obter_artista_id',
+    'salvar_obras_coletadas'
 ]
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Iteração e escrita em blocos para jobs longos sobre o banco de dados
+Mantém a memória constante: cada bloco é carregado, desanexado da sessão e descartado
+antes do próximo, e as atualizações são gravadas com um commit por bloco
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session, Query
+
+from src.metricas import BANCO_ESCRITA_SEGUNDOS
+
+
+TAMANHO_BLOCO_PADRAO = 500
+
+
+def _desanexar(db: Session, objetos: List) -> None:
+    """Remove os objetos da sessão (identity map) para que possam ser liberados"""
+    # Linhas de colunas (query(Modelo.id, ...)) não ficam no identity map: basta olhar a primeira
+    if not objetos or not hasattr(objetos[0], '_sa_instance_state'):
+        return
+    for objeto in objetos:
+        if objeto in db:
+            db.expunge(objeto)
+
+
+def iterar_em_blocos(db: Session, query: Query, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+                     limite: Optional[int] = None) -> Iterator[List]:
+    """
+    Percorre o resultado de uma query em blocos paginados por chave (id > último id)
+    
+    Não usa OFFSET (custo constante por bloco) e devolve objetos já desanexados da
+    sessão: alterações feitas neles não são gravadas automaticamente, use EscritorEmBlocos.
+    
+    Args:
+        db: Sessão do banco de dados
+        query: Query sobre um modelo (ou colunas dele, incluindo `id`); filtros são preservados
+        tamanho_bloco: Número de registros por bloco
+        limite: Número máximo de registros no total (None = todos)
+    """
+    modelo = query.column_descriptions[0]['entity']
+    ultimo_id = None
+    total = 0
+    
+    while True:
+        tamanho = tamanho_bloco
+        if limite is not None:
+            tamanho = min(tamanho, limite - total)
+            if tamanho <= 0:
+                break
+        
+        bloco_query = query
+        if ultimo_id is not None:
+            bloco_query = bloco_query.filter(modelo.id > ultimo_id)
+        bloco = bloco_query.order_by(modelo.id).limit(tamanho).all()
+        if not bloco:
+            break
+        
+        ultimo_id = bloco[-1].id
+        total += len(bloco)
+        _desanexar(db, bloco)
+        yield bloco
+        
+        if len(bloco) < tamanho:
+            break
+
+
+def iterar_select_em_blocos(engine, consulta, coluna_id, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+                            limite: Optional[int] = None, decrescente: bool = False) -> Iterator[List]:
+    """
+    Percorre um select (Core) em blocos paginados por chave, cada bloco numa conexão curta
+    
+    Entre um bloco e outro nenhuma leitura fica aberta: o lock de leitura do SQLite é liberado e
+    as gravações dos scrapers não esperam o fim de uma exportação longa (com um cursor em
+    streaming, falhariam com "database is locked"). Linhas inseridas durante a leitura entram
+    se tiverem id depois do último bloco lido.
+    
+    Args:
+        engine: Engine do banco
+        consulta: select com a coluna de chave entre as colunas; filtros são preservados
+        coluna_id: Coluna de chave (ex.: Obra.id), que também define a ordem
+        tamanho_bloco: Linhas por bloco
+        limite: Número máximo de linhas no total (None = todas)
+        decrescente: Ordem decrescente da chave (mais recentes primeiro)
+    """
+    ordem = coluna_id.desc() if decrescente else coluna_id
+    ultimo_id = None
+    total = 0
+    
+    while True:
+        tamanho = tamanho_bloco
+        if limite is not None:
+            tamanho = min(tamanho, limite - total)
+            if tamanho <= 0:
+                break
+        
+        bloco_consulta = consulta
+        if ultimo_id is not None:
+            bloco_consulta = bloco_consulta.where(coluna_id < ultimo_id if decrescente else coluna_id > ultimo_id)
+        with engine.connect() as conexao:
+            bloco = conexao.execute(bloco_consulta.order_by(ordem).limit(tamanho)).all()
+        if not bloco:
+            break
+        
+        ultimo_id = bloco[-1]._mapping[coluna_id.key]
+        total += len(bloco)
+        yield bloco
+        
+        if len(bloco) < tamanho:
+            break
+
+
+def iterar_por_ids(db: Session, modelo, ids: Iterable[int],
+                   tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> Iterator[List]:
+    """
+    Carrega registros por uma lista de ids em blocos, preservando a ordem da lista
+    Ids inexistentes são ignorados; os objetos são devolvidos desanexados da sessão
+    """
+    ids = list(ids)
+    for inicio in range(0, len(ids), tamanho_bloco):
+        ids_bloco = ids[inicio:inicio + tamanho_bloco]
+        por_id = {
+            objeto.id: objeto
+            for objeto in db.query(modelo).filter(modelo.id.in_(ids_bloco))
+        }
+        bloco = [por_id[id_] for id_ in ids_bloco if id_ in por_id]
+        _desanexar(db, bloco)
+        yield bloco
+
+
+class EscritorEmBlocos:
+    """
+    Acumula atualizações ({'id': ..., campo: valor}) e grava em lote com um único commit
+    
+    Uso:
+        with EscritorEmBlocos(db, Obra) as escritor:
+            escritor.atualizar(obra.id, valor=novo_valor)
+            ...
+            escritor.gravar()  # ao fim de cada bloco
+    """
+    
+    def __init__(self, db: Session, modelo, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        self.db = db
+        self.modelo = modelo
+        self.tamanho_bloco = tamanho_bloco
+        self.pendentes: Dict[int, Dict] = {}
+        self.total_gravado = 0
+    
+    def atualizar(self, id_registro: int, **valores) -> None:
+        """Agenda a atualização de um registro (valores do mesmo id são mesclados)"""
+        if not valores:
+            return
+        self.pendentes.setdefault(id_registro, {'id': id_registro}).update(valores)
+        if len(self.pendentes) >= self.tamanho_bloco:
+            self.gravar()
+    
+    def gravar(self) -> int:
+        """Grava as atualizações pendentes com um commit; retorna quantos registros foram gravados"""
+        if not self.pendentes:
+            return 0
+        
+        mapeamentos = list(self.pendentes.values())
+        try:
+            with BANCO_ESCRITA_SEGUNDOS.cronometrar(operacao=f"bloco_{self.modelo.__tablename__}"):
+                self.db.bulk_update_mappings(self.modelo, mapeamentos)
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self.pendentes.clear()
+        
+        self.total_gravado += len(mapeamentos)
+        return len(mapeamentos)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.gravar()
+        else:
+            self.pendentes.clear()
+            self.db.rollback()
+        return False
@@ -10,14 +10,18 @@ from pathlib import Path
 import os
 
 from .models import Base
+from .migrate_add_ultima_verificacao import migrate as migrar_ultima_verificacao
+from .migrate_add_relatorio_desempenho import migrate as migrar_relatorio_desempenho
+from .migrate_add_leilao_id import migrate as migrar_leilao_id
+from .migrate_add_artista_id import migrate as migrar_artista_id
 
 # Caminho do banco de dados
 DB_DIR = Path(__file__).parent.parent / "database"
 DB_DIR.mkdir(exist_ok=True)
 DB_PATH = DB_DIR / "scrapers.db"
 
-# URL do banco de dados
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+# URL do banco de dados (DATABASE_URL permite apontar para outro banco, ex.: benchmarks)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
 
 # Engine e Session
 engine = create_engine(
@@ -34,6 +38,23 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
+def atualizar_schema():
+    """
+    Cria as tabelas que faltam e adiciona as colunas novas às tabelas existentes
+    init_db vem primeiro: as migrações de leilao_id e artista_id preenchem as tabelas leiloes e artistas
+    As migrações são scripts sqlite3 e rodam no arquivo de DATABASE_URL; outros bancos só recebem init_db
+    """
+    init_db()
+    if engine.url.get_backend_name() != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        print(f"[AVISO] Migracoes ignoradas: so se aplicam a um arquivo SQLite ({engine.url.get_backend_name()})")
+        return
+    caminho = Path(engine.url.database)
+    migrar_ultima_verificacao(caminho)
+    migrar_relatorio_desempenho(caminho)
+    migrar_leilao_id(caminho)
+    migrar_artista_id(caminho)
+
+
 def get_db() -> Session:
     """Retorna uma sessão do banco de dados"""
     db = SessionLocal()
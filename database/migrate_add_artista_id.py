@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Adiciona coluna artista_id à tabela obras e preenche a tabela artistas com os
+nomes já coletados (a tabela artistas é criada por init_db)
+"""
+
+import sys
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.normalizacao import chave_artista, limpar_nome_artista
+
+# Caminho do banco de dados
+DB_DIR = Path(__file__).parent
+DB_PATH = DB_DIR / "scrapers.db"
+
+def preencher_artistas(cursor):
+    """Cria os artistas dos nomes existentes em obras e liga as obras a eles"""
+    cursor.execute("""
+        SELECT nome_artista, COUNT(*) FROM obras
+        WHERE nome_artista IS NOT NULL
+        GROUP BY nome_artista ORDER BY COUNT(*) DESC
+    """)
+    grafias_por_chave = {}
+    for nome, _ in cursor.fetchall():
+        chave = chave_artista(nome)
+        if chave:
+            grafias_por_chave.setdefault(chave, []).append(nome)
+    
+    agora = datetime.utcnow().isoformat(sep=' ')
+    for chave, grafias in grafias_por_chave.items():
+        # Nome canônico: a grafia mais frequente; as demais viram aliases
+        nome = limpar_nome_artista(grafias[0])
+        aliases = sorted({limpar_nome_artista(grafia) for grafia in grafias} - {nome})
+        cursor.execute(
+            "INSERT OR IGNORE INTO artistas (nome, chave, aliases, criado_em) VALUES (?, ?, ?, ?)",
+            (nome, chave, json.dumps(aliases, ensure_ascii=False), agora)
+        )
+        cursor.execute("SELECT id FROM artistas WHERE chave = ?", (chave,))
+        artista_id = cursor.fetchone()[0]
+        cursor.executemany("UPDATE obras SET artista_id = ? WHERE nome_artista = ?",
+                           [(artista_id, grafia) for grafia in grafias])
+    return len(grafias_por_chave)
+
+def migrate(db_path: Path = DB_PATH):
+    """Adiciona a coluna artista_id (e seu índice) se não existir e preenche os artistas"""
+    if not Path(db_path).exists():
+        print("[ERRO] Banco de dados nao encontrado. Execute o script de extracao primeiro.")
+        return
+    
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    try:
+        # Verificar se a coluna já existe
+        cursor.execute("PRAGMA table_info(obras)")
+        columns = [row[1] for row in cursor.fetchall()]
+        
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'artistas'")
+        tabela_artistas = cursor.fetchone() is not None
+        
+        if 'artista_id' in columns:
+            print("[OK] Coluna 'artista_id' ja existe. Nenhuma migracao necessaria.")
+        elif not tabela_artistas:
+            # Sem a tabela não há como preencher os artistas das obras existentes: migrar depois de init_db
+            print("[AVISO] Tabela 'artistas' nao existe. Execute init_db() antes desta migracao.")
+        else:
+            # Adicionar coluna
+            print("[INFO] Adicionando coluna 'artista_id'...")
+            cursor.execute("ALTER TABLE obras ADD COLUMN artista_id INTEGER")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_obras_artista_id ON obras (artista_id)")
+            total = preencher_artistas(cursor)
+            conn.commit()
+            print(f"[OK] Coluna 'artista_id' adicionada com sucesso! {total} artistas criados a partir das obras existentes")
+    
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Adiciona coluna leilao_id à tabela obras (a tabela leiloes é criada por init_db)
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Caminho do banco de dados
+DB_DIR = Path(__file__).parent
+DB_PATH = DB_DIR / "scrapers.db"
+
+def migrate(db_path: Path = DB_PATH):
+    """Adiciona a coluna leilao_id (e seu índice) se não existir"""
+    if not Path(db_path).exists():
+        print("[ERRO] Banco de dados nao encontrado. Execute o script de extracao primeiro.")
+        return
+    
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    try:
+        # Verificar se a coluna já existe
+        cursor.execute("PRAGMA table_info(obras)")
+        columns = [row[1] for row in cursor.fetchall()]
+        
+        if 'leilao_id' in columns:
+            print("[OK] Coluna 'leilao_id' ja existe. Nenhuma migracao necessaria.")
+        else:
+            # Adicionar coluna
+            print("[INFO] Adicionando coluna 'leilao_id'...")
+            cursor.execute("ALTER TABLE obras ADD COLUMN leilao_id INTEGER")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_obras_leilao_id ON obras (leilao_id)")
+            conn.commit()
+            print("[OK] Coluna 'leilao_id' adicionada com sucesso!")
+    
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -11,13 +11,13 @@ from pathlib import Path
 DB_DIR = Path(__file__).parent
 DB_PATH = DB_DIR / "scrapers.db"
 
-def migrate():
+def migrate(db_path: Path = DB_PATH):
     """Adiciona a coluna numero_lances se não existir"""
-    if not DB_PATH.exists():
+    if not Path(db_path).exists():
         print("[ERRO] Banco de dados nao encontrado. Execute o script de extracao primeiro.")
         return
     
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(db_path))
     cursor = conn.cursor()
     
     try:
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Adiciona coluna relatorio_desempenho à tabela scraping_sessions
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Caminho do banco de dados
+DB_DIR = Path(__file__).parent
+DB_PATH = DB_DIR / "scrapers.db"
+
+def migrate(db_path: Path = DB_PATH):
+    """Adiciona a coluna relatorio_desempenho se não existir"""
+    if not Path(db_path).exists():
+        print("[ERRO] Banco de dados nao encontrado. Execute o script de extracao primeiro.")
+        return
+    
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    try:
+        # Verificar se a coluna já existe
+        cursor.execute("PRAGMA table_info(scraping_sessions)")
+        columns = [row[1] for row in cursor.fetchall()]
+        
+        if 'relatorio_desempenho' in columns:
+            print("[OK] Coluna 'relatorio_desempenho' ja existe. Nenhuma migracao necessaria.")
+        else:
+            # Adicionar coluna
+            print("[INFO] Adicionando coluna 'relatorio_desempenho'...")
+            cursor.execute("ALTER TABLE scraping_sessions ADD COLUMN relatorio_desempenho TEXT")
+            conn.commit()
+            print("[OK] Coluna 'relatorio_desempenho' adicionada com sucesso!")
+    
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
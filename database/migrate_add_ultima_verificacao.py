@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Adiciona as colunas ultima_verificacao e falhas_verificacao à tabela obras
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Caminho do banco de dados
+DB_DIR = Path(__file__).parent
+DB_PATH = DB_DIR / "scrapers.db"
+
+# Colunas do atualizador de obras e suas definições
+COLUNAS = (
+    ('ultima_verificacao', 'DATETIME'),
+    ('falhas_verificacao', 'INTEGER DEFAULT 0'),
+)
+
+def migrate(db_path: Path = DB_PATH):
+    """Adiciona as colunas que não existirem"""
+    if not Path(db_path).exists():
+        print("[ERRO] Banco de dados nao encontrado. Execute o script de extracao primeiro.")
+        return
+    
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    try:
+        # Verificar se a coluna já existe
+        cursor.execute("PRAGMA table_info(obras)")
+        columns = [row[1] for row in cursor.fetchall()]
+        
+        for coluna, definicao in COLUNAS:
+            if coluna in columns:
+                print(f"[OK] Coluna '{coluna}' ja existe. Nenhuma migracao necessaria.")
+            else:
+                # Adicionar coluna
+                print(f"[INFO] Adicionando coluna '{coluna}'...")
+                cursor.execute(f"ALTER TABLE obras ADD COLUMN {coluna} {definicao}")
+                conn.commit()
+                print(f"[OK] Coluna '{coluna}' adicionada com sucesso!")
+    
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -26,6 +26,7 @@ class ScrapingSession(Base):
     arquivo_saida = Column(String(255), nullable=True)
     erro = Column(Text, nullable=True)
     categorias = Column(String(255), nullable=True)  # JSON string para múltiplas categorias
+    relatorio_desempenho = Column(Text, nullable=True)  # JSON: requisições, latências, parse, esperas, lotes/min
     
     __table_args__ = (
         Index('idx_scraper_status', 'scraper_name', 'status'),
@@ -33,12 +34,55 @@ class ScrapingSession(Base):
     )
 
 
+class CheckpointScraping(Base):
+    """Checkpoint de uma sessão de scraping - permite retomar crawls interrompidos"""
+    __tablename__ = 'scraping_checkpoints'
+    
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, nullable=False, unique=True, index=True)  # FK para scraping_sessions
+    scraper_name = Column(String(50), nullable=False)
+    categoria = Column(String(50), nullable=True)  # Categoria em andamento
+    ultima_pagina = Column(Integer, nullable=False, default=0)  # Última página concluída da categoria
+    total_paginas = Column(Integer, nullable=True)  # Total descoberto (evita redescobrir ao retomar)
+    urls_pendentes = Column(Text, nullable=True)  # JSON: URLs da página em andamento ainda não processadas
+    parametros = Column(Text, nullable=True)  # JSON: parâmetros da requisição original (ScraperRequest)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Leilao(Base):
+    """Leilão (catálogo) - dados comuns a todos os lotes, gravados uma vez por leilão"""
+    __tablename__ = 'leiloes'
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chave = Column(String(255), nullable=False, unique=True, index=True)  # "host:numero" (src/cache_leiloes.py)
+    scraper_name = Column(String(50), nullable=False)
+    host = Column(String(255), nullable=False)  # Site do leiloeiro, sem www.
+    numero = Column(String(50), nullable=False)  # Número do leilão no site
+    leiloeiro = Column(String(255), nullable=True)
+    local = Column(String(255), nullable=True)
+    info_leilao = Column(Text, nullable=True)  # Informações adicionais do leilão (data, horário, endereço, telefone, email)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Artista(Base):
+    """Artista - nome canônico e grafias encontradas, indexado pela chave normalizada"""
+    __tablename__ = 'artistas'
+    
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String(255), nullable=False)  # Primeira grafia encontrada (limpa)
+    chave = Column(String(255), nullable=False, unique=True, index=True)  # Sem acentos/caixa/pontuação (src/normalizacao.py)
+    aliases = Column(Text, nullable=True)  # JSON: grafias de nome_artista associadas a este artista
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class Obra(Base):
     """Obra coletada - armazena dados de cada obra/quadro/escultura"""
     __tablename__ = 'obras'
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, nullable=False, index=True)  # FK para scraping_sessions
+    leilao_id = Column(Integer, nullable=True, index=True)  # FK para leiloes (obras com número de leilão conhecido)
+    artista_id = Column(Integer, nullable=True, index=True)  # FK para artistas (obras com nome_artista)
     scraper_name = Column(String(50), nullable=False, index=True)
     categoria = Column(String(50), nullable=True, index=True)
     
@@ -59,6 +103,8 @@ class Obra(Base):
     local = Column(String(255), nullable=True)
     info_leilao = Column(Text, nullable=True)  # Informações adicionais do leilão (data, horário, endereço, telefone, email)
     ultima_atualizacao = Column(DateTime, nullable=True)  # Data da última atualização de preço
+    ultima_verificacao = Column(DateTime, nullable=True)  # Data da última verificação pelo atualizador (mesmo sem mudança)
+    falhas_verificacao = Column(Integer, nullable=True, default=0)  # Falhas seguidas ao acessar a página (espera crescente até a próxima)
     
     # URLs
     url = Column(Text, nullable=False, index=True)
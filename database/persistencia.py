@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gravação das obras coletadas pelos scrapers no banco de dados
+Usada pela API (execução dos scrapers) e pelos benchmarks
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.registro_lote import LoteRecord
+from src.normalizacao import chave_artista, limpar_nome_artista
+from .models import Obra, Leilao, Artista
+
+
+def _inserir_unico(db: Session, objeto):
+    """
+    Insere um leilão ou artista (chave única) num savepoint; se outra sessão inseriu a mesma chave
+    antes (scrapers em paralelo), retorna a linha dela sem invalidar a transação desta sessão
+    """
+    modelo = type(objeto)
+    try:
+        with db.begin_nested():
+            db.add(objeto)
+        return objeto
+    except IntegrityError:
+        return db.query(modelo).filter(modelo.chave == objeto.chave).one()
+
+
+def obter_leilao_id(db: Session, lote: LoteRecord, scraper_name: str,
+                    ids_por_chave: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """
+    ID do leilão do lote (lote.chave_leilao), criando a linha em leiloes na primeira obra do leilão
+    com o leiloeiro e o local do lote (sem commit); None se o lote não tiver chave de leilão
+    ids_por_chave guarda as chaves já resolvidas para não consultar o banco a cada lote
+    """
+    chave = lote.chave_leilao
+    if not chave:
+        return None
+    if ids_por_chave is not None and chave in ids_por_chave:
+        return ids_por_chave[chave]
+    
+    leilao_id = db.query(Leilao.id).filter(Leilao.chave == chave).scalar()
+    if leilao_id is None:
+        host, _, numero = chave.rpartition(':')
+        leilao = _inserir_unico(db, Leilao(
+            chave=chave,
+            scraper_name=scraper_name,
+            host=host,
+            numero=numero,
+            leiloeiro=lote.leiloeiro if lote.leiloeiro != 'N/A' else None,
+            local=lote.local if lote.local != 'N/A' else None
+        ))
+        leilao_id = leilao.id
+    
+    if ids_por_chave is not None:
+        ids_por_chave[chave] = leilao_id
+    return leilao_id
+
+
+def obter_artista_id(db: Session, nome_artista: Optional[str],
+                     artistas_por_chave: Optional[Dict[str, Artista]] = None) -> Optional[int]:
+    """
+    ID do artista de nome_artista pela chave normalizada, criando o artista na primeira obra e
+    acrescentando grafias novas aos aliases (sem commit); None se o nome for vazio ou N/A
+    artistas_por_chave guarda os artistas já resolvidos para não consultar o banco a cada lote
+    """
+    chave = chave_artista(nome_artista)
+    if not chave:
+        return None
+    
+    artista = artistas_por_chave.get(chave) if artistas_por_chave is not None else None
+    if artista is None:
+        artista = db.query(Artista).filter(Artista.chave == chave).first()
+        if artista is None:
+            artista = _inserir_unico(db, Artista(nome=limpar_nome_artista(nome_artista), chave=chave,
+                                                 aliases=json.dumps([])))
+        if artistas_por_chave is not None:
+            artistas_por_chave[chave] = artista
+    
+    grafia = limpar_nome_artista(nome_artista)
+    if grafia != artista.nome:
+        aliases = json.loads(artista.aliases or '[]')
+        if grafia not in aliases:
+            aliases.append(grafia)
+            artista.aliases = json.dumps(aliases, ensure_ascii=False)
+    return artista.id
+
+
+def criar_obra(lote: LoteRecord, session_id: int, scraper_name: str, leilao_id: Optional[int] = None,
+               artista_id: Optional[int] = None) -> Obra:
+    """Converte um registro coletado pelo scraper em Obra"""
+    linha = lote.para_linha_obra(session_id)
+    linha['scraper_name'] = scraper_name
+    if leilao_id is not None:
+        linha['leilao_id'] = leilao_id
+    if artista_id is not None:
+        linha['artista_id'] = artista_id
+    return Obra(**linha)
+
+
+def salvar_obras_coletadas(db: Session, session_id: int, scraper_name: str,
+                           dados_obras: List[LoteRecord]) -> Tuple[int, int]:
+    """
+    Adiciona à sessão do banco as obras coletadas que ainda não existem (sem commit)
+    Retorna (obras_novas, obras_duplicadas)
+    """
+    novas = 0
+    duplicadas = 0
+    urls_adicionadas = set()
+    leiloes_por_chave: Dict[str, int] = {}
+    artistas_por_chave: Dict[str, Artista] = {}
+    
+    for lote in dados_obras:
+        try:
+            url_obra = lote.url
+            if not url_obra:
+                continue
+            
+            # Verificar se já existe (dupla verificação)
+            obra_existente = url_obra in urls_adicionadas or db.query(Obra.id).filter(
+                Obra.url == url_obra,
+                Obra.scraper_name == scraper_name
+            ).first()
+            
+            if obra_existente:
+                duplicadas += 1
+                continue
+            
+            leilao_id = obter_leilao_id(db, lote, scraper_name, leiloes_por_chave)
+            artista_id = obter_artista_id(db, lote.nome_artista, artistas_por_chave)
+            db.add(criar_obra(lote, session_id, scraper_name, leilao_id, artista_id))
+            urls_adicionadas.add(url_obra)
+            novas += 1
+        except Exception as e:
+            print(f"Erro ao salvar obra {scraper_name}: {e}")
+            continue
+    
+    return novas, duplicadas
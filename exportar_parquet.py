@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportação da tabela obras para arquivos Parquet (snapshot colunar para análise)
+Cada exportação gera um snapshot em <diretorio>/obras_AAAAMMDD_HHMMSS/ particionado por scraper e
+mês da coleta (scraper_name=leiloes_br/mes=2025-01/parte-0000.parquet, layout Hive lido direto
+por pandas.read_parquet, pyarrow.dataset, DuckDB ou Spark) com um _manifest.json (arquivos,
+linhas, esquema)
+
+As obras são lidas em blocos paginados por id, cada um numa leitura curta (os scrapers
+continuam gravando durante a exportação), e gravadas em row groups de tamanho fixo, sem
+carregar a tabela na memória. O snapshot é gravado num diretório temporário e
+renomeado no fim: leitores nunca veem um snapshot pela metade
+
+Requer o pacote pyarrow. Diretório padrão: EXPORTACAO_PARQUET_DIR ou output/parquet
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import select, Integer, DateTime
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from database.database import engine, atualizar_schema
+from database.models import Obra
+from database.blocos import iterar_select_em_blocos
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+TAMANHO_GRUPO_PADRAO = 100000  # Linhas por row group
+LINHAS_POR_LEITURA = 20000  # Linhas por bloco lido do banco
+SNAPSHOTS_MANTIDOS = 3
+PREFIXO_SNAPSHOT = "obras_"
+ARQUIVO_MANIFESTO = "_manifest.json"  # "_" no início: ignorado pelos leitores de Parquet
+
+# Uma exportação por vez (agendada e sob demanda podem coincidir)
+_exportacao_em_andamento = threading.Lock()
+
+
+def diretorio_exportacao(diretorio: Optional[str] = None) -> Path:
+    return Path(diretorio or os.getenv("EXPORTACAO_PARQUET_DIR") or "output/parquet")
+
+
+def ultimo_snapshot(diretorio: Optional[str] = None) -> Optional[Tuple[Path, Dict]]:
+    """Diretório e manifesto do snapshot completo mais recente (None se ainda não houver)"""
+    base = diretorio_exportacao(diretorio)
+    if not base.exists():
+        return None
+    for snapshot in sorted(base.glob(f"{PREFIXO_SNAPSHOT}*"), reverse=True):
+        manifesto = snapshot / ARQUIVO_MANIFESTO
+        if snapshot.is_dir() and manifesto.exists():
+            return snapshot, json.loads(manifesto.read_text(encoding="utf-8"))
+    return None
+
+
+def _esquema_obras() -> "pa.Schema":
+    """Esquema Arrow das colunas de obras (scraper_name fica no caminho da partição)"""
+    campos = []
+    for coluna in Obra.__table__.columns:
+        if coluna.name == "scraper_name":
+            continue
+        if isinstance(coluna.type, Integer):
+            tipo = pa.int64()
+        elif isinstance(coluna.type, DateTime):
+            tipo = pa.timestamp("us")
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(coluna.name, tipo))
+    return pa.schema(campos)
+
+
+class ParticaoParquet:
+    """Arquivo de uma partição (scraper, mês), gravado em row groups de tamanho fixo"""
+    
+    def __init__(self, diretorio: Path, scraper_name: str, mes: str, esquema: "pa.Schema",
+                 tamanho_grupo: int, compressao: str):
+        self.scraper_name = scraper_name
+        self.mes = mes
+        self.caminho_relativo = f"scraper_name={scraper_name}/mes={mes}/parte-0000.parquet"
+        self.caminho = diretorio / self.caminho_relativo
+        self.esquema = esquema
+        self.tamanho_grupo = tamanho_grupo
+        self.compressao = compressao
+        self.pendentes: List[pd.DataFrame] = []
+        self.linhas_pendentes = 0
+        self.linhas = 0
+        self.grupos = 0
+        self._escritor = None
+    
+    def adicionar(self, linhas: pd.DataFrame):
+        self.pendentes.append(linhas)
+        self.linhas_pendentes += len(linhas)
+        if self.linhas_pendentes >= self.tamanho_grupo:
+            self.gravar(completo=False)
+    
+    def gravar(self, completo: bool):
+        """Grava os row groups cheios (e o resto, se completo)"""
+        if not self.pendentes:
+            return
+        tabela = pd.concat(self.pendentes, ignore_index=True) if len(self.pendentes) > 1 else self.pendentes[0]
+        corte = len(tabela) if completo else len(tabela) - len(tabela) % self.tamanho_grupo
+        if self._escritor is None:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            self._escritor = pq.ParquetWriter(str(self.caminho), self.esquema, compression=self.compressao)
+        for inicio in range(0, corte, self.tamanho_grupo):
+            grupo = tabela.iloc[inicio:min(inicio + self.tamanho_grupo, corte)]
+            self._escritor.write_table(pa.Table.from_pandas(grupo, schema=self.esquema, preserve_index=False))
+            self.linhas += len(grupo)
+            self.grupos += 1
+        resto = tabela.iloc[corte:]
+        self.pendentes = [resto] if len(resto) else []
+        self.linhas_pendentes = len(resto)
+    
+    def fechar(self) -> Dict:
+        self.gravar(completo=True)
+        if self._escritor is not None:
+            self._escritor.close()
+        return {
+            "caminho": self.caminho_relativo,
+            "scraper_name": self.scraper_name,
+            "mes": self.mes,
+            "linhas": self.linhas,
+            "row_groups": self.grupos,
+            "bytes": self.caminho.stat().st_size
+        }
+
+
+def exportar_obras_parquet(diretorio: Optional[str] = None, tamanho_grupo: int = TAMANHO_GRUPO_PADRAO,
+                           manter: int = SNAPSHOTS_MANTIDOS, compressao: str = "zstd") -> Optional[Dict]:
+    """
+    Exporta a tabela obras para um novo snapshot Parquet particionado por scraper e mês
+    Args:
+        diretorio: Diretório dos snapshots (padrão: EXPORTACAO_PARQUET_DIR ou output/parquet)
+        tamanho_grupo: Linhas por row group
+        manter: Snapshots completos mantidos (os mais antigos são apagados)
+        compressao: Codec do Parquet (zstd, snappy, gzip ou none)
+    Returns:
+        Manifesto do snapshot (None se pyarrow não estiver instalado ou já houver exportação em andamento)
+    """
+    if pa is None:
+        print("[ERRO] Exportação Parquet requer o pacote pyarrow (pip install pyarrow)")
+        return None
+    if not _exportacao_em_andamento.acquire(blocking=False):
+        print("[AVISO] Já existe uma exportação Parquet em andamento")
+        return None
+    
+    try:
+        atualizar_schema()
+        
+        inicio = datetime.now()
+        base = diretorio_exportacao(diretorio)
+        nome = f"{PREFIXO_SNAPSHOT}{inicio.strftime('%Y%m%d_%H%M%S')}"
+        temporario = base / f".{nome}.parcial"
+        if temporario.exists():
+            shutil.rmtree(temporario)
+        temporario.mkdir(parents=True)
+        
+        print(f"[INFO] Exportando obras para {base / nome} (row groups de {tamanho_grupo} linhas)...")
+        esquema = _esquema_obras()
+        colunas = list(Obra.__table__.columns)
+        particoes: Dict[Tuple[str, int], ParticaoParquet] = {}
+        total = 0
+        maior_id = 0
+        
+        try:
+            for linhas in iterar_select_em_blocos(engine, select(*colunas), Obra.id,
+                                                  tamanho_bloco=LINHAS_POR_LEITURA):
+                bloco = pd.DataFrame.from_records(linhas, columns=[coluna.name for coluna in colunas])
+                datas = pd.to_datetime(bloco["data_coleta"])
+                meses = (datas.dt.year * 100 + datas.dt.month).fillna(0).astype("int64")  # AAAAMM
+                for (scraper_name, mes), parte in bloco.groupby([bloco["scraper_name"], meses], sort=False):
+                    chave = (scraper_name, mes)
+                    if chave not in particoes:
+                        rotulo = f"{mes // 100:04d}-{mes % 100:02d}" if mes else "sem_data"
+                        particoes[chave] = ParticaoParquet(temporario, scraper_name, rotulo, esquema,
+                                                           tamanho_grupo, compressao)
+                    particoes[chave].adicionar(parte.drop(columns=["scraper_name"]))
+                # Meses intercalados deixam linhas pendentes em várias partições: limitar a memória
+                if sum(particao.linhas_pendentes for particao in particoes.values()) > 2 * tamanho_grupo:
+                    for particao in particoes.values():
+                        particao.gravar(completo=True)
+                total += len(bloco)
+                maior_id = int(bloco["id"].iloc[-1])
+                if total % tamanho_grupo < len(bloco):
+                    print(f"[INFO] {total} obras exportadas...")
+            
+            arquivos = sorted((particao.fechar() for particao in particoes.values()), key=lambda arquivo: arquivo["caminho"])
+            manifesto = {
+                "snapshot": nome,
+                "tabela": "obras",
+                "criado_em": inicio.isoformat(),
+                "duracao_s": round((datetime.now() - inicio).total_seconds(), 1),
+                "total_linhas": total,
+                "maior_id": maior_id,
+                "formato": "parquet",
+                "compressao": compressao,
+                "particionamento": ["scraper_name", "mes"],
+                "esquema": [{"nome": campo.name, "tipo": str(campo.type)} for campo in esquema]
+                           + [{"nome": "scraper_name", "tipo": "string (partição)"}],
+                "arquivos": arquivos
+            }
+            (temporario / ARQUIVO_MANIFESTO).write_text(json.dumps(manifesto, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(temporario, base / nome)
+        except Exception:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+        
+        # Remover snapshots antigos
+        snapshots = sorted(caminho for caminho in base.glob(f"{PREFIXO_SNAPSHOT}*") if caminho.is_dir())
+        for antigo in snapshots[:-manter] if manter > 0 else []:
+            shutil.rmtree(antigo, ignore_errors=True)
+        
+        print(f"[OK] Snapshot {nome}: {total} obras em {len(arquivos)} arquivos ({manifesto['duracao_s']}s)")
+        return manifesto
+    finally:
+        _exportacao_em_andamento.release()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta a tabela obras para um snapshot Parquet particionado")
+    parser.add_argument("--diretorio", default=None,
+                        help="Diretório dos snapshots (padrão: EXPORTACAO_PARQUET_DIR ou output/parquet)")
+    parser.add_argument("--tamanho-grupo", type=int, default=TAMANHO_GRUPO_PADRAO,
+                        help=f"Linhas por row group (padrão: {TAMANHO_GRUPO_PADRAO})")
+    parser.add_argument("--manter", type=int, default=SNAPSHOTS_MANTIDOS,
+                        help=f"Snapshots mantidos (padrão: {SNAPSHOTS_MANTIDOS})")
+    parser.add_argument("--compressao", default="zstd", choices=["zstd", "snappy", "gzip", "none"],
+                        help="Codec de compressão (padrão: zstd)")
+    args = parser.parse_args()
+    
+    exportar_obras_parquet(diretorio=args.diretorio, tamanho_grupo=args.tamanho_grupo,
+                           manter=args.manter, compressao=args.compressao)
@@ -58,6 +58,14 @@ export interface Obra {
   scraper_name: string
 }
 
+export interface FiltrosObras {
+  scraper?: string
+  categoria?: string
+  artista?: string
+  artista_id?: number
+  limite?: number
+}
+
 export interface Session {
   id: number
   scraper_name: string
@@ -102,6 +110,25 @@ export const apiService = {
     return data as Obra[]
   },
 
+  // Todas as obras dos filtros em uma única requisição (streaming no backend, sem paginação)
+  getTodasObras: async (filtros?: FiltrosObras) => {
+    const { data } = await api.get<Obra[]>('/obras/export', {
+      params: { ...filtros, format: 'json' },
+      timeout: 120000,
+    })
+    return data
+  },
+
+  // Exportação das obras em planilha (xlsx ou csv)
+  exportObras: async (filtros: FiltrosObras, formato: 'xlsx' | 'csv' = 'xlsx') => {
+    const { data } = await api.get<Blob>('/obras/export', {
+      params: { ...filtros, format: formato },
+      responseType: 'blob',
+      timeout: 0, // Sem limite: arquivos grandes levam mais que os 10 segundos padrão
+    })
+    return data
+  },
+
   // Sessions
   getSessions: async (params?: {
     page?: number
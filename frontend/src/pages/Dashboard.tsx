@@ -24,35 +24,10 @@ export default function Dashboard() {
     retry: 1,
   })
 
-  // Buscar TODAS as obras para cálculos precisos
+  // Buscar as obras para os cálculos em uma única requisição (antes: até 50 páginas de 100)
   const { data: obrasSample, isLoading: isLoadingObras } = useQuery({
     queryKey: ['obras-dashboard'],
-    queryFn: async () => {
-      const allObras = []
-      let page = 1
-      let hasMore = true
-      
-      while (hasMore && page <= 50) {
-        try {
-          const obras = await apiService.getObras({ page, per_page: 100 })
-          if (obras && obras.length > 0) {
-            allObras.push(...obras)
-            if (obras.length < 100) {
-              hasMore = false
-            } else {
-              page++
-            }
-          } else {
-            hasMore = false
-          }
-        } catch (error) {
-          console.error(`Erro ao buscar página ${page}:`, error)
-          hasMore = false
-        }
-      }
-      
-      return allObras
-    },
+    queryFn: () => apiService.getTodasObras({ limite: 5000 }),
     retry: 1,
     refetchInterval: 30000,
   })
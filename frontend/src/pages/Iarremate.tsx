@@ -89,38 +89,9 @@ export default function Iarremate() {
   const handleDownloadExcel = async () => {
     setIsLoadingExport(true)
     try {
-      // Buscar todas as obras com paginação
-      const todasObrasData: any[] = []
-      let page = 1
-      let hasMore = true
-      const perPage = 100 // Tamanho razoável por página
-      
-      while (hasMore) {
-        const obrasPage = await apiService.getObras({
-          page,
-          per_page: perPage,
-          scraper: 'iarremate',
-        })
-        
-        if (obrasPage && obrasPage.length > 0) {
-          todasObrasData.push(...obrasPage)
-          // Se retornou menos que perPage, não há mais páginas
-          if (obrasPage.length < perPage) {
-            hasMore = false
-          } else {
-            page++
-          }
-        } else {
-          hasMore = false
-        }
-      }
-      
-      if (todasObrasData.length > 0) {
-        const filename = `iArremate_Obras_${new Date().toISOString().split('T')[0]}.xlsx`
-        exportToExcel(todasObrasData, filename)
-      } else {
-        alert('Nenhuma obra encontrada para exportar.')
-      }
+      // Planilha gerada pelo backend em uma única requisição (streaming, sem paginar /obras)
+      const filename = `iArremate_Obras_${new Date().toISOString().split('T')[0]}.xlsx`
+      await exportToExcel({ scraper: 'iarremate' }, filename)
     } catch (error) {
       console.error('Erro ao exportar Excel:', error)
       alert('Erro ao exportar Excel. Tente novamente.')
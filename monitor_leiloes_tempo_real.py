@@ -12,13 +12,13 @@ import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from database.database import SessionLocal
 from database.models import Obra
 from src.iarremate_scraper import IArremateScraper
+from src.metricas import BANCO_ESCRITA_SEGUNDOS, FILA_PROFUNDIDADE, MONITOR_VERIFICACOES
 
 
 class MonitorLeiloesTempoReal:
@@ -30,7 +30,8 @@ class MonitorLeiloesTempoReal:
         self.lock = threading.Lock()
         self.intervalo_verificacao = 30  # Verificar a cada 30 segundos durante leilão
         self.duracao_maxima_leilao = timedelta(hours=3)  # Máximo 3 horas de monitoramento
-        
+        FILA_PROFUNDIDADE.definir_funcao(lambda: len(self.leiloes_ativos), fila="monitor_leiloes_ativos")
+    
     def parsear_data_leilao(self, data_str: str) -> Optional[datetime]:
         """
         Parseia a data/hora do leilão do formato extraído
@@ -90,7 +91,7 @@ class MonitorLeiloesTempoReal:
                     return datetime.strptime(data_str.strip(), formato)
                 except:
                     continue
-                    
+        
         except Exception as e:
             print(f"[MONITOR] Erro ao parsear data '{data_str}': {e}")
             import traceback
@@ -117,14 +118,18 @@ class MonitorLeiloesTempoReal:
         try:
             response = self.scraper.fazer_requisicao(obra.url)
             if not response:
+                MONITOR_VERIFICACOES.inc(monitor="leiloes_tempo_real", resultado="falha_requisicao")
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.scraper.criar_soup(response.text)
             novo_valor = self.scraper.extrair_valor_iarremate(soup)
             
             if novo_valor and novo_valor != "N/A":
+                MONITOR_VERIFICACOES.inc(monitor="leiloes_tempo_real", resultado="valor_obtido")
                 return novo_valor
+            MONITOR_VERIFICACOES.inc(monitor="leiloes_tempo_real", resultado="sem_valor")
         except Exception as e:
+            MONITOR_VERIFICACOES.inc(monitor="leiloes_tempo_real", resultado="erro")
             print(f"[MONITOR] Erro ao verificar valor da obra {obra.id}: {e}")
         
         return None
@@ -156,7 +161,8 @@ class MonitorLeiloesTempoReal:
                     # Atualizar valor principal
                     obra.valor = novo_valor
                     obra.ultima_atualizacao = datetime.utcnow()
-                    db.commit()
+                    with BANCO_ESCRITA_SEGUNDOS.cronometrar(operacao="monitor_atualizar_valor"):
+                        db.commit()
                     
                     print(f"[MONITOR] ✓ Obra {obra_id} atualizada: R$ {valor_antigo} -> R$ {novo_valor}")
                     return True
@@ -167,7 +173,8 @@ class MonitorLeiloesTempoReal:
                         obra.valor_atualizado = obra.valor
                     obra.valor = novo_valor
                     obra.ultima_atualizacao = datetime.utcnow()
-                    db.commit()
+                    with BANCO_ESCRITA_SEGUNDOS.cronometrar(operacao="monitor_atualizar_valor"):
+                        db.commit()
                     print(f"[MONITOR] ✓ Obra {obra_id} atualizada: {valor_antigo} -> {novo_valor}")
                     return True
         except Exception as e:
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reprocessamento das páginas arquivadas (SCRAPER_ARQUIVO_DIR) com os extratores atuais
+Depois de corrigir um extrator (lote, valor, artista...), roda extrair_campos_pagina dos scrapers
+sobre a última coleta de cada URL do arquivo, em paralelo em todos os núcleos, e grava no banco
+os campos corrigidos, sem baixar as páginas de novo
+
+Uso:
+    python reprocessar_paginas.py
+    python reprocessar_paginas.py --scraper leiloes_br --desde 2026-10-01
+    python reprocessar_paginas.py --simular          # mostra o que mudaria, sem gravar
+"""
+
+import os
+import sys
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from database.database import SessionLocal, atualizar_schema
+from database.models import Obra
+from database.blocos import EscritorEmBlocos
+from database.persistencia import obter_artista_id
+from src.arquivo_paginas import ArquivoPaginas
+
+
+# Valores que indicam que o extrator não encontrou o campo (não sobrescrevem o banco)
+VALORES_VAZIOS = (None, '', 'N/A', 'nao tem')
+
+TAMANHO_BLOCO = 500
+
+# Estado de cada processo de trabalho (criado em _iniciar_processo)
+_arquivo: Optional[ArquivoPaginas] = None
+_scrapers: Dict = {}
+
+
+def _iniciar_processo(diretorio: str):
+    """Abre o arquivo e cria um scraper por site em cada processo de trabalho"""
+    global _arquivo
+    from src.iarremate_scraper import IArremateScraper
+    from src.leiloes_br_scraper import LeiloesBRScraper
+    
+    # Só avisos e erros dos scrapers (antes de BaseScraper._setup_logging, que não reconfigura)
+    logging.basicConfig(level=logging.WARNING)
+    _arquivo = ArquivoPaginas(diretorio)
+    _scrapers['iarremate'] = IArremateScraper()
+    _scrapers['leiloes_br'] = LeiloesBRScraper()
+
+
+def _reprocessar(registro: Dict) -> Tuple[Dict, Optional[Dict], Optional[str]]:
+    """Extrai os campos de uma página arquivada; retorna (registro, campos, erro)"""
+    scraper = _scrapers.get(registro['scraper'])
+    if scraper is None:
+        return registro, None, f"scraper desconhecido: {registro['scraper']}"
+    try:
+        soup = scraper.criar_soup(_arquivo.ler(registro))
+        return registro, scraper.extrair_campos_pagina(soup, registro['url_final']), None
+    except Exception as e:
+        return registro, None, str(e)
+
+
+class ReprocessadorPaginas:
+    """Aplica no banco os campos reextraídos das páginas arquivadas"""
+    
+    def __init__(self, arquivo: ArquivoPaginas, processos: Optional[int] = None, simular: bool = False):
+        """
+        Args:
+            arquivo: Arquivo de páginas
+            processos: Processos de extração (padrão: número de núcleos)
+            simular: Apenas contar e mostrar as mudanças, sem gravar
+        """
+        self.arquivo = arquivo
+        self.processos = processos or os.cpu_count() or 1
+        self.simular = simular
+        self.estatisticas = {
+            'paginas': 0,
+            'atualizadas': 0,
+            'sem_mudanca': 0,
+            'sem_registro': 0,
+            'erros': 0
+        }
+    
+    def executar(self, scraper_name: Optional[str] = None, desde: Optional[datetime] = None):
+        registros = list(self.arquivo.ultimas(scraper=scraper_name, desde=desde))
+        print(f"[INFO] {len(registros)} páginas a reprocessar com {self.processos} processo(s)")
+        if not registros:
+            return self.estatisticas
+        
+        db = SessionLocal()
+        try:
+            escritor = EscritorEmBlocos(db, Obra, tamanho_bloco=TAMANHO_BLOCO)
+            bloco: List[Tuple[Dict, Dict]] = []
+            
+            with ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo,
+                                     initargs=(str(self.arquivo.diretorio),)) as executor:
+                for registro, campos, erro in executor.map(_reprocessar, registros, chunksize=16):
+                    self.estatisticas['paginas'] += 1
+                    if erro:
+                        self.estatisticas['erros'] += 1
+                        print(f"  [ERRO] {registro['url']}: {erro}")
+                        continue
+                    bloco.append((registro, campos))
+                    if len(bloco) >= TAMANHO_BLOCO:
+                        self._aplicar_bloco(db, escritor, bloco)
+                        bloco = []
+            
+            if bloco:
+                self._aplicar_bloco(db, escritor, bloco)
+        finally:
+            db.close()
+        
+        return self.estatisticas
+    
+    def _aplicar_bloco(self, db, escritor: EscritorEmBlocos, bloco: List[Tuple[Dict, Dict]]):
+        """Compara os campos reextraídos com as obras do bloco e agenda as atualizações"""
+        colunas = sorted({campo for _, campos in bloco for campo in campos})
+        urls = {registro['url_final'] for registro, _ in bloco} | {registro['url'] for registro, _ in bloco}
+        
+        obras_por_url: Dict[Tuple[str, str], List] = {}
+        consulta = db.query(Obra.id, Obra.scraper_name, Obra.url, Obra.url_original,
+                            *[getattr(Obra, coluna) for coluna in colunas])
+        for obra in consulta.filter(Obra.url.in_(urls)):
+            obras_por_url.setdefault((obra.scraper_name, obra.url), []).append(obra)
+        for obra in consulta.filter(Obra.url_original.in_(urls)):
+            chave = (obra.scraper_name, obra.url_original)
+            if obra not in obras_por_url.get(chave, []):
+                obras_por_url.setdefault(chave, []).append(obra)
+        
+        for registro, campos in bloco:
+            obras = (obras_por_url.get((registro['scraper'], registro['url_final']))
+                     or obras_por_url.get((registro['scraper'], registro['url'])))
+            if not obras:
+                # Só obras já coletadas são corrigidas: a página arquivada não diz a categoria da
+                # listagem, e o arquivo também guarda lotes que a coleta descartou (sem valor)
+                self.estatisticas['sem_registro'] += 1
+                continue
+            
+            for obra in obras:
+                mudancas = {
+                    campo: valor for campo, valor in campos.items()
+                    if valor not in VALORES_VAZIOS and valor != getattr(obra, campo)
+                }
+                if not mudancas:
+                    self.estatisticas['sem_mudanca'] += 1
+                    continue
+                
+                self.estatisticas['atualizadas'] += 1
+                if self.simular:
+                    alteracoes = ", ".join(f"{campo}: {getattr(obra, campo)!r} -> {valor!r}" for campo, valor in mudancas.items())
+                    print(f"  [SIMULAÇÃO] Obra {obra.id}: {alteracoes}")
+                else:
+                    if 'nome_artista' in mudancas:
+                        mudancas['artista_id'] = obter_artista_id(db, mudancas['nome_artista'])
+                    escritor.atualizar(obra.id, **mudancas)
+        
+        if not self.simular:
+            escritor.gravar()
+            db.commit()
+
+
+def reprocessar_paginas(diretorio: Optional[str] = None, scraper_name: Optional[str] = None,
+                        desde: Optional[datetime] = None, processos: Optional[int] = None,
+                        simular: bool = False) -> Dict:
+    """
+    Reprocessa as páginas arquivadas e grava os campos corrigidos
+    Args:
+        diretorio: Diretório do arquivo (padrão: SCRAPER_ARQUIVO_DIR ou arquivo/paginas)
+        scraper_name: 'iarremate', 'leiloes_br' ou None para ambos
+        desde: Reprocessar apenas coletas a partir desta data
+        processos: Processos de extração (padrão: número de núcleos)
+        simular: Mostrar as mudanças sem gravar
+    """
+    diretorio = diretorio or os.getenv("SCRAPER_ARQUIVO_DIR") or "arquivo/paginas"
+    if not (Path(diretorio) / "indice.sqlite3").exists():
+        print(f"[ERRO] Arquivo de páginas não encontrado em {diretorio} (ative com SCRAPER_ARQUIVO_DIR)")
+        return {}
+    
+    print("=" * 80)
+    print("REPROCESSAMENTO DE PÁGINAS ARQUIVADAS" + (" (SIMULAÇÃO)" if simular else ""))
+    print("=" * 80)
+    
+    atualizar_schema()
+    arquivo = ArquivoPaginas(diretorio)
+    try:
+        resumo = arquivo.estatisticas()
+        print(f"[INFO] Arquivo {diretorio}: {resumo['coletas']} coletas de {resumo['urls']} URLs, "
+              f"{resumo['mb_originais']} MB em {resumo['mb_em_disco']} MB no disco")
+        
+        inicio = datetime.now()
+        estatisticas = ReprocessadorPaginas(arquivo, processos=processos, simular=simular).executar(scraper_name, desde)
+    finally:
+        arquivo.fechar()
+    
+    print("\n" + "=" * 80)
+    print("RESUMO DO REPROCESSAMENTO")
+    print("=" * 80)
+    print(f"  Páginas reprocessadas: {estatisticas['paginas']}")
+    print(f"  Obras atualizadas: {estatisticas['atualizadas']}")
+    print(f"  Obras sem mudança: {estatisticas['sem_mudanca']}")
+    print(f"  Páginas sem obra no banco (ignoradas): {estatisticas['sem_registro']}")
+    print(f"  Erros: {estatisticas['erros']}")
+    print(f"  Duração: {(datetime.now() - inicio).total_seconds():.1f}s")
+    print("=" * 80)
+    return estatisticas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocessa as páginas arquivadas com os extratores atuais")
+    parser.add_argument("--arquivo", default=None,
+                        help="Diretório do arquivo de páginas (padrão: SCRAPER_ARQUIVO_DIR ou arquivo/paginas)")
+    parser.add_argument("--scraper", choices=["iarremate", "leiloes_br"], default=None,
+                        help="Reprocessar apenas um site (padrão: ambos)")
+    parser.add_argument("--desde", type=datetime.fromisoformat, default=None,
+                        help="Apenas coletas a partir desta data (AAAA-MM-DD)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Processos de extração (padrão: número de núcleos)")
+    parser.add_argument("--simular", action="store_true", help="Mostrar as mudanças sem gravar no banco")
+    args = parser.parse_args()
+    
+    reprocessar_paginas(diretorio=args.arquivo, scraper_name=args.scraper, desde=args.desde,
+                        processos=args.processos, simular=args.simular)
@@ -11,6 +11,7 @@ import threading
 from datetime import datetime
 from atualizar_precos import atualizar_precos_obras
 from atualizar_obras_coletadas import atualizar_obras_coletadas
+from exportar_parquet import exportar_obras_parquet
 from monitor_leiloes_tempo_real import MonitorLeiloesTempoReal
 
 # Instância global do monitor
@@ -28,6 +29,12 @@ def job_atualizar_obras_coletadas():
     atualizar_obras_coletadas()
     print(f"[{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}] Atualizacao de obras concluida\n")
 
+def job_exportar_parquet():
+    """Job que gera o snapshot Parquet diário da tabela obras (depois das atualizações)"""
+    print(f"\n[{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}] Exportando obras para Parquet...")
+    exportar_obras_parquet()
+    print(f"[{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}] Exportacao concluida\n")
+
 def job_verificar_leiloes():
     """Job que verifica leilões agendados e inicia monitoramentos"""
     print(f"\n[{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}] Verificando leiloes agendados...")
@@ -41,6 +48,7 @@ def main():
     print("=" * 60)
     print("Atualizacao de precos (leiloes agendados): Diariamente as 00:00")
     print("Atualizacao de obras coletadas: Diariamente as 00:05")
+    print("Exportacao Parquet das obras: Diariamente as 03:00")
     print("Monitor de leiloes: A cada 5 minutos")
     print("Pressione Ctrl+C para parar")
     print("=" * 60)
@@ -52,6 +60,9 @@ def main():
     # (5 minutos depois para não sobrecarregar o servidor)
     schedule.every().day.at("00:05").do(job_atualizar_obras_coletadas)
     
+    # Snapshot Parquet para análise (depois das atualizações da madrugada)
+    schedule.every().day.at("03:00").do(job_exportar_parquet)
+    
     # Agendar verificação de leilões a cada 5 minutos
     schedule.every(5).minutes.do(job_verificar_leiloes)
     
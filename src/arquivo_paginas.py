@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo comprimido das páginas de obras baixadas pelos scrapers
+Guarda o HTML de cada página de obra (endereçado pelo conteúdo: páginas iguais são gravadas uma
+vez) com um índice por URL e data da coleta, para que reprocessar_paginas.py possa rodar os
+extratores atuais sobre as páginas já baixadas e corrigir o banco sem novo crawl
+
+Compressão zstd quando o pacote zstandard está instalado; senão zlib (biblioteca padrão).
+O codec fica registrado em cada entrada do índice, então arquivos mistos continuam legíveis
+
+Configuração por variáveis de ambiente (usadas por BaseScraper quando nenhum arquivo é passado):
+    SCRAPER_ARQUIVO_DIR  Diretório do arquivo de páginas (ativa o arquivamento)
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CODEC_PADRAO = "zstd" if zstandard is not None else "zlib"
+EXTENSOES = {"zstd": ".zst", "zlib": ".zz"}
+
+
+def comprimir(conteudo: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(conteudo)
+    return zlib.compress(conteudo, 9)
+
+
+def descomprimir(dados: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Página comprimida com zstd: instale o pacote zstandard para ler")
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return zlib.decompress(dados)
+
+
+class ArquivoPaginas:
+    """
+    Páginas em <diretorio>/objetos/<2 primeiros do hash>/<hash sha256>.<ext> e índice SQLite
+    em <diretorio>/indice.sqlite3 (uma linha por coleta: URL, URL final, scraper, data, hash)
+    """
+    
+    def __init__(self, diretorio: str = "arquivo/paginas", codec: str = CODEC_PADRAO):
+        """
+        Args:
+            diretorio: Diretório do arquivo (criado se não existir)
+            codec: "zstd" (requer zstandard) ou "zlib"
+        """
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("codec zstd requer o pacote zstandard (pip install zstandard)")
+        self.diretorio = Path(diretorio)
+        self.codec = codec
+        self._lock = threading.Lock()
+        
+        (self.diretorio / "objetos").mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(self.diretorio / "indice.sqlite3", timeout=30, check_same_thread=False)
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS paginas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                url_final TEXT NOT NULL,
+                scraper TEXT NOT NULL,
+                coletada_em TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                encoding TEXT,
+                tamanho INTEGER NOT NULL,
+                tamanho_comprimido INTEGER NOT NULL
+            )
+        """)
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_paginas_url ON paginas (url, coletada_em)")
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_paginas_scraper ON paginas (scraper, coletada_em)")
+        self._conexao.commit()
+    
+    @classmethod
+    def do_ambiente(cls) -> Optional['ArquivoPaginas']:
+        """Cria o arquivo a partir das variáveis de ambiente (None se o arquivamento não estiver ativo)"""
+        diretorio = os.getenv("SCRAPER_ARQUIVO_DIR")
+        return cls(diretorio) if diretorio else None
+    
+    def _caminho(self, hash_conteudo: str, codec: str) -> Path:
+        return self.diretorio / "objetos" / hash_conteudo[:2] / f"{hash_conteudo}{EXTENSOES[codec]}"
+    
+    def guardar(self, url: str, conteudo: bytes, scraper: str, url_final: Optional[str] = None,
+                encoding: Optional[str] = None, coletada_em: Optional[datetime] = None) -> str:
+        """Arquiva uma página (o conteúdo é gravado só se ainda não existir); retorna o hash"""
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        caminho = self._caminho(hash_conteudo, self.codec)
+        
+        if caminho.exists():
+            tamanho_comprimido = caminho.stat().st_size
+        else:
+            dados = comprimir(conteudo, self.codec)
+            tamanho_comprimido = len(dados)
+            caminho.parent.mkdir(exist_ok=True)
+            # Gravação atômica: leitores (reprocessamento) nunca veem um arquivo pela metade
+            temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temporario.write_bytes(dados)
+            os.replace(temporario, caminho)
+        
+        with self._lock:
+            self._conexao.execute(
+                "INSERT INTO paginas (url, url_final, scraper, coletada_em, hash, codec, encoding, tamanho, tamanho_comprimido) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, url_final or url, scraper, (coletada_em or datetime.utcnow()).isoformat(timespec="seconds"),
+                 hash_conteudo, self.codec, encoding, len(conteudo), tamanho_comprimido)
+            )
+            self._conexao.commit()
+        return hash_conteudo
+    
+    def ler(self, registro: Dict) -> str:
+        """HTML (texto) de uma entrada do índice"""
+        conteudo = descomprimir(self._caminho(registro['hash'], registro['codec']).read_bytes(), registro['codec'])
+        return conteudo.decode(registro.get('encoding') or 'utf-8', errors='replace')
+    
+    def ultimas(self, scraper: Optional[str] = None, desde: Optional[datetime] = None) -> Iterator[Dict]:
+        """Coleta mais recente de cada URL (filtrada por scraper e data mínima), em ordem de URL"""
+        filtros, parametros = [], []
+        if scraper:
+            filtros.append("scraper = ?")
+            parametros.append(scraper)
+        if desde:
+            filtros.append("coletada_em >= ?")
+            parametros.append(desde.isoformat(timespec="seconds"))
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+        
+        with self._lock:
+            cursor = self._conexao.execute(f"""
+                SELECT p.url, p.url_final, p.scraper, p.coletada_em, p.hash, p.codec, p.encoding
+                FROM paginas p
+                JOIN (SELECT MAX(id) AS id FROM paginas {where} GROUP BY url) ultima ON ultima.id = p.id
+                ORDER BY p.url
+            """, parametros)
+            colunas = [descricao[0] for descricao in cursor.description]
+            linhas = cursor.fetchall()
+        for linha in linhas:
+            yield dict(zip(colunas, linha))
+    
+    def estatisticas(self) -> Dict:
+        """Coletas, páginas distintas e tamanho original x comprimido"""
+        with self._lock:
+            coletas, urls, tamanho = self._conexao.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url), COALESCE(SUM(tamanho), 0) FROM paginas"
+            ).fetchone()
+            objetos, comprimido = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho_comprimido), 0) "
+                "FROM (SELECT hash, MAX(tamanho_comprimido) AS tamanho_comprimido FROM paginas GROUP BY hash)"
+            ).fetchone()
+        return {
+            'coletas': coletas,
+            'urls': urls,
+            'objetos': objetos,
+            'mb_originais': round(tamanho / (1024 * 1024), 2),
+            'mb_em_disco': round(comprimido / (1024 * 1024), 2)
+        }
+    
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
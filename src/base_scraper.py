@@ -13,11 +13,22 @@ import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from urllib.parse import urljoin, urlparse
+from typing import Callable, Optional, Dict, List, Tuple
 from bs4 import BeautifulSoup
-import pandas as pd
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
+from .http_cache import CacheRespostas
+from .registro_lote import LoteRecord, lotes_para_dataframe
+from .arquivo_paginas import ArquivoPaginas
+from .http_client import REGISTRO_HTTP
+from .rate_limiter import BaldeTokens, LimitadorPorHost, LIMITADOR_GLOBAL
+from .retry import PoliticaRetentativa, DisjuntorPorHost, DISJUNTOR_GLOBAL, STATUS_REDIRECIONAMENTO
+from .metricas import (
+    REQUISICOES_HTTP, REQUISICAO_HTTP_SEGUNDOS, RETENTATIVAS_HTTP, BYTES_RECEBIDOS,
+    CACHE_HTTP, DISJUNTOR_ABERTURAS, LIMITADOR_ESPERA, PARSE_SEGUNDOS, FILA_PROFUNDIDADE, DesempenhoSessao, cronometrar_extrator
+)
+
 # Desabilita avisos de SSL
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -41,7 +52,13 @@ class BaseScraper(ABC):
     
     def __init__(self, base_url: str, output_dir: str = "output", 
                  logs_dir: str = "logs", max_retries: int = 3, 
-                 delay_between_requests: float = 1.0, scraper_name: str = "scraper"):
+                 delay_between_requests: float = 1.0, scraper_name: str = "scraper",
+                 cache: Optional[CacheRespostas] = None,
+                 limitador: Optional[LimitadorPorHost] = None,
+                 politica_retentativa: Optional[PoliticaRetentativa] = None,
+                 disjuntor: Optional[DisjuntorPorHost] = None,
+                 arquivo: Optional[ArquivoPaginas] = None,
+                 limitador_extra: Optional[LimitadorPorHost] = None):
         """
         Inicializa o scraper base
         
@@ -50,8 +67,15 @@ class BaseScraper(ABC):
             output_dir: Diretório para salvar arquivos de saída
             logs_dir: Diretório para salvar logs
             max_retries: Número máximo de tentativas por requisição
-            delay_between_requests: Delay entre requisições (segundos)
+            delay_between_requests: Intervalo mínimo entre requisições deste scraper (segundos)
             scraper_name: Nome do scraper (para logs e arquivos)
+            cache: Cache de respostas HTTP (padrão: configurado pelas variáveis SCRAPER_CACHE_DIR/SCRAPER_REPLAY)
+            limitador: Limitador de taxa por host compartilhado (padrão: LIMITADOR_GLOBAL do processo)
+            politica_retentativa: Backoff das novas tentativas (padrão: PoliticaRetentativa())
+            disjuntor: Circuit breaker por host compartilhado (padrão: DISJUNTOR_GLOBAL do processo)
+            arquivo: Arquivo das páginas de obras para reprocessamento (padrão: variável SCRAPER_ARQUIVO_DIR)
+            limitador_extra: Limites adicionais deste scraper, reservados junto com os do limitador
+                compartilhado (a espera é a maior das duas; ex.: delay_por_host do atualizador)
         """
         self.base_url = base_url
         self.output_dir = Path(output_dir)
@@ -65,12 +89,44 @@ class BaseScraper(ABC):
         self.logs_dir.mkdir(exist_ok=True)
         
         # Dados coletados
-        self.dados_obras: List[Dict] = []
-        self.session = requests.Session()
+        self.dados_obras: List[LoteRecord] = []
+        self.session = REGISTRO_HTTP.nova_sessao()  # Conexões compartilhadas com os outros scrapers
+        
+        # Checkpoint: progresso do crawl e callback para persistir (ver registrar_checkpoint)
+        self.ao_registrar_checkpoint: Optional[Callable[[Dict], None]] = None
+        self.progresso: Dict = {
+            'categoria': None,
+            'ultima_pagina': 0,
+            'total_paginas': None,
+            'urls_pendentes': []
+        }
+        
+        # Resumo de desempenho desta execução (requisições, latências, parse, esperas)
+        self.desempenho = DesempenhoSessao()
         
         # Configurar logging
         self._setup_logging()
         
+        # Cache de respostas HTTP (modo replay: somente cache, sem rede e sem delays)
+        self.cache = cache if cache is not None else CacheRespostas.do_ambiente()
+        if self.cache:
+            modo = "replay (somente cache)" if self.cache.somente_cache else "leitura e escrita"
+            self.logger.info(f"Cache HTTP ativo em {self.cache.diretorio} - modo {modo}")
+        
+        # Arquivo das páginas de obras (reprocessar_paginas.py roda os extratores sobre ele)
+        self.arquivo = arquivo if arquivo is not None else ArquivoPaginas.do_ambiente()
+        
+        # Limite de taxa: balde do host (compartilhado no processo) + ritmo próprio (delay_between_requests)
+        self.limitador = limitador if limitador is not None else LIMITADOR_GLOBAL
+        self.limitador_extra = limitador_extra
+        self._ritmo = BaldeTokens(1 / delay_between_requests) if delay_between_requests > 0 else None
+        
+        # Novas tentativas e pausa de sites com falhas consecutivas
+        self.politica_retentativa = politica_retentativa or PoliticaRetentativa()
+        self.disjuntor = disjuntor if disjuntor is not None else DISJUNTOR_GLOBAL
+        self.max_redirecionamentos = 5
+        self.session.max_redirects = self.max_redirecionamentos
+    
     def _setup_logging(self):
         """Configura o sistema de logging"""
         log_filename = self.logs_dir / f"{self.scraper_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -87,6 +143,47 @@ class BaseScraper(ABC):
         self.logger = logging.getLogger(self.scraper_name)
         self.logger.info(f"Logging configurado. Arquivo: {log_filename}")
     
+    def registrar_checkpoint(self, **progresso):
+        """
+        Atualiza o progresso do crawl e o repassa ao callback de checkpoint (se houver)
+        
+        Campos: categoria, ultima_pagina (última página concluída da categoria),
+        total_paginas e urls_pendentes (URLs da página em andamento ainda não processadas)
+        """
+        self.progresso.update(progresso)
+        FILA_PROFUNDIDADE.definir(len(self.progresso['urls_pendentes']), fila=f"{self.scraper_name}_urls_pendentes")
+        if not self.ao_registrar_checkpoint:
+            return
+        
+        try:
+            estado = dict(self.progresso)
+            estado['urls_pendentes'] = list(self.progresso['urls_pendentes'])
+            self.ao_registrar_checkpoint(estado)
+        except Exception as e:
+            self.logger.warning(f"Erro ao registrar checkpoint: {e}")
+    
+    def ponto_de_retomada(self, categorias: List[str],
+                          retomar_de: Optional[Dict]) -> Tuple[int, int, Optional[int], List[str]]:
+        """
+        Calcula de onde retomar o crawl a partir de um checkpoint
+        Retorna (índice da categoria, primeira página a processar, total de páginas, URLs pendentes)
+        """
+        if not retomar_de or not retomar_de.get('categoria'):
+            return 0, 1, None, []
+        
+        nomes = [categoria.lower() for categoria in categorias]
+        categoria = retomar_de['categoria'].lower()
+        if categoria not in nomes:
+            self.logger.warning(f"Categoria do checkpoint ({categoria}) não está na lista, recomeçando do início")
+            return 0, 1, None, []
+        
+        return (
+            nomes.index(categoria),
+            (retomar_de.get('ultima_pagina') or 0) + 1,
+            retomar_de.get('total_paginas'),
+            list(retomar_de.get('urls_pendentes') or [])
+        )
+    
     def get_headers(self) -> Dict[str, str]:
         """Retorna headers aleatórios para evitar bloqueios"""
         return {
@@ -98,45 +195,163 @@ class BaseScraper(ABC):
             "Upgrade-Insecure-Requests": "1",
         }
     
+    def dormir(self, segundos: float):
+        """Pausa entre requisições (ignorada no modo replay, em que nada acessa a rede)"""
+        if self.cache and self.cache.somente_cache:
+            return
+        self.desempenho.registrar_espera(segundos)
+        time.sleep(segundos)
+    
+    def aguardar_vez(self, url: str):
+        """Espera a vez da requisição no limitador do host e no ritmo deste scraper"""
+        espera = self.limitador.reservar(url)
+        if self.limitador_extra:
+            espera = max(espera, self.limitador_extra.reservar(url))
+        if self._ritmo:
+            espera = max(espera, self._ritmo.reservar())
+        if espera > 0:
+            LIMITADOR_ESPERA.inc(espera, host=urlparse(url).netloc)
+            self.dormir(espera)
+    
+    def criar_soup(self, html: str) -> BeautifulSoup:
+        """Faz o parse do HTML registrando a duração na métrica de parse"""
+        inicio = time.perf_counter()
+        soup = BeautifulSoup(html, 'html.parser')
+        duracao = time.perf_counter() - inicio
+        PARSE_SEGUNDOS.observar(duracao, scraper=self.scraper_name)
+        self.desempenho.registrar_parse(duracao)
+        return soup
+    
     def fazer_requisicao(self, url: str, follow_redirects: bool = True) -> Optional[requests.Response]:
-        """Faz requisição com retry automático e suporte a redirecionamentos"""
-        for tentativa in range(self.max_retries):
+        """
+        Faz requisição com novas tentativas (backoff com jitter, Retry-After) e redirecionamentos
+        
+        Erros do cliente (404, 403...) não são repetidos; redirecionamentos seguem no máximo
+        max_redirecionamentos saltos; sites com o disjuntor aberto são aguardados antes da requisição
+        """
+        headers = self.get_headers()
+        
+        if self.cache:
+            response = self.cache.obter(url, headers)
+            CACHE_HTTP.inc(scraper=self.scraper_name, resultado="acerto" if response is not None else "falha")
+            if response is not None:
+                self.desempenho.registrar_acerto_cache()
+                return response
+            if self.cache.somente_cache:
+                self.logger.warning(f"URL fora do cache (modo replay): {url}")
+                return None
+        
+        tentativa = 0
+        redirecionamentos = 0
+        while tentativa < self.max_retries:
+            host = urlparse(url).netloc
+            pausa = self.disjuntor.liberar(host)
+            if pausa > 0:
+                self.logger.warning(f"Site {host} pausado por falhas consecutivas; aguardando {pausa:.0f}s")
+            while pausa > 0:
+                # Disjuntor aberto, ou outra thread fazendo a requisição de teste
+                self.dormir(pausa)
+                pausa = self.disjuntor.liberar(host)
+            if tentativa > 0:
+                RETENTATIVAS_HTTP.inc(scraper=self.scraper_name, host=host)
+                self.desempenho.registrar_retentativa()
+            
+            self.aguardar_vez(url)
+            inicio = time.perf_counter()
             try:
                 response = self.session.get(
                     url, 
-                    headers=self.get_headers(), 
+                    headers=headers, 
                     verify=False, 
                     timeout=30,
                     allow_redirects=follow_redirects
                 )
-                if response.status_code == 200:
-                    return response
-                elif response.status_code in [301, 302, 303, 307, 308] and follow_redirects:
-                    # Seguir redirecionamento manualmente se necessário
-                    redirect_url = response.headers.get('Location')
-                    if redirect_url:
-                        if not redirect_url.startswith('http'):
-                            # URL relativa
-                            from urllib.parse import urljoin
-                            redirect_url = urljoin(url, redirect_url)
-                        self.logger.info(f"Redirecionando para: {redirect_url}")
-                        return self.fazer_requisicao(redirect_url, follow_redirects=True)
-                else:
-                    self.logger.warning(
-                        f"Tentativa {tentativa + 1}/{self.max_retries}: "
-                        f"Status {response.status_code} para {url}"
-                    )
+            except requests.TooManyRedirects:
+                self.disjuntor.registrar_sucesso(host)  # O site respondeu
+                self.logger.error(f"Mais de {self.max_redirecionamentos} redirecionamentos a partir de {url}")
+                return None
             except Exception as e:
+                duracao = time.perf_counter() - inicio
+                REQUISICAO_HTTP_SEGUNDOS.observar(duracao, scraper=self.scraper_name, host=host)
+                REQUISICOES_HTTP.inc(scraper=self.scraper_name, host=host, status="erro")
+                self.desempenho.registrar_requisicao(duracao, falha=True)
                 self.logger.warning(
                     f"Tentativa {tentativa + 1}/{self.max_retries}: "
                     f"Erro {e} para {url}"
                 )
-                if tentativa < self.max_retries - 1:
-                    time.sleep(2)
+                if self._registrar_falha_host(host):
+                    break
+                tentativa += 1
+                if tentativa < self.max_retries:
+                    self.dormir(self.politica_retentativa.espera(tentativa))
+                continue
+            
+            duracao = time.perf_counter() - inicio
+            REQUISICAO_HTTP_SEGUNDOS.observar(duracao, scraper=self.scraper_name, host=host)
+            REQUISICOES_HTTP.inc(scraper=self.scraper_name, host=host, status=response.status_code)
+            BYTES_RECEBIDOS.inc(len(response.content), scraper=self.scraper_name, host=host)
+            self.desempenho.registrar_requisicao(duracao, len(response.content),
+                                                 falha=response.status_code >= 400)
+            
+            if response.status_code == 200:
+                self.disjuntor.registrar_sucesso(host)
+                if self.cache:
+                    self.cache.guardar(url, headers, response)
+                return response
+            
+            if response.status_code in STATUS_REDIRECIONAMENTO:
+                self.disjuntor.registrar_sucesso(host)
+                redirect_url = response.headers.get('Location')
+                if not follow_redirects or not redirect_url:
+                    return response
+                
+                redirecionamentos += 1
+                if redirecionamentos > self.max_redirecionamentos:
+                    self.logger.error(f"Mais de {self.max_redirecionamentos} redirecionamentos a partir de {url}")
+                    return None
+                # Seguir redirecionamento manualmente (URL relativa ou absoluta)
+                url = urljoin(url, redirect_url)
+                self.logger.info(f"Redirecionando para: {url}")
+                continue
+            
+            if not self.politica_retentativa.deve_retentar(response.status_code):
+                # O site respondeu: erro da URL (404, 403...), não adianta repetir
+                self.disjuntor.registrar_sucesso(host)
+                self.logger.warning(f"Status {response.status_code} para {url} (sem nova tentativa)")
+                return None
+            
+            self.logger.warning(
+                f"Tentativa {tentativa + 1}/{self.max_retries}: "
+                f"Status {response.status_code} para {url}"
+            )
+            if self._registrar_falha_host(host):
+                break
+            tentativa += 1
+            if tentativa < self.max_retries:
+                self.dormir(self.politica_retentativa.espera(tentativa, response))
         
-        self.logger.error(f"Falha ao acessar {url} após {self.max_retries} tentativas")
+        self.logger.error(f"Falha ao acessar {url} após {min(tentativa + 1, self.max_retries)} tentativa(s)")
         return None
     
+    def arquivar_pagina(self, url: str, response: requests.Response):
+        """Guarda a página de uma obra no arquivo (se ativo); falhas do arquivo não interrompem a coleta"""
+        if not self.arquivo:
+            return
+        try:
+            self.arquivo.guardar(url, response.content, self.scraper_name, url_final=response.url,
+                                 encoding=response.encoding or response.apparent_encoding)
+        except Exception as e:
+            self.logger.warning(f"Erro ao arquivar página {url}: {e}")
+    
+    def _registrar_falha_host(self, host: str) -> bool:
+        """Registra a falha no disjuntor; True se o site foi pausado (desistir desta URL)"""
+        if not self.disjuntor.registrar_falha(host):
+            return False
+        DISJUNTOR_ABERTURAS.inc(host=host)
+        self.logger.warning(f"Disjuntor aberto para {host}: {self.disjuntor.espera(host):.0f}s sem requisições")
+        return True
+    
+    @cronometrar_extrator
     def extrair_valor(self, soup: BeautifulSoup) -> str:
         """Extrai o valor atual da obra com múltiplas estratégias"""
         valor = "N/A"
@@ -226,6 +441,7 @@ class BaseScraper(ABC):
         
         return titulo, descricao
     
+    @cronometrar_extrator
     def extrair_nome_artista(self, titulo: str, descricao: str) -> str:
         """Extrai o nome do artista do título ou descrição"""
         nome_artista = "N/A"
@@ -270,7 +486,7 @@ class BaseScraper(ABC):
         arquivo_path = self.output_dir / nome_arquivo
         
         # Criar DataFrame
-        df = pd.DataFrame(self.dados_obras)
+        df = lotes_para_dataframe(self.dados_obras)
         
         # Salvar em Excel
         try:
@@ -293,8 +509,9 @@ class BaseScraper(ABC):
         pass
     
     @abstractmethod
-    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None):
-        """Processa uma página específica e extrai dados das obras"""
+    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None,
+                         somente_urls: Optional[List[str]] = None):
+        """Processa uma página específica e extrai dados das obras (opcionalmente só as URLs informadas)"""
         pass
     
     @abstractmethod
@@ -303,7 +520,8 @@ class BaseScraper(ABC):
         pass
     
     @abstractmethod
-    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None):
-        """Executa o scraping completo"""
+    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None,
+                          retomar_de: Optional[Dict] = None):
+        """Executa o scraping completo (ou retoma a partir de um checkpoint)"""
         pass
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dados do leilão (catálogo) compartilhados pelos lotes, extraídos uma vez por execução
+Leiloeiro e local são os mesmos em todos os lotes de um leilão; o LeiloesBRScraper extrai esses
+campos da primeira página de obra de cada leilão e reaproveita para os demais lotes, no lugar
+de rodar as cascatas de extrair_leiloeiro_leiloes_br e extrair_local_leiloes_br em cada lote
+
+O leilão é identificado pelo host do site do leiloeiro e pelo número do leilão (parâmetro Num ou
+leilao da URL, ou "LEILÃO N" no breadcrumb); a chave "host:numero" também liga as obras à tabela
+leiloes no banco (Obra.leilao_id)
+"""
+
+import re
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+from bs4 import BeautifulSoup
+
+from .rate_limiter import normalizar_host
+
+
+# Parâmetros de URL com o número do leilão (catalogo.asp?Num=..., peca.asp?...&leilao=...)
+PARAMETROS_NUMERO_LEILAO = ('Num', 'num', 'leilao', 'Leilao')
+
+_PADRAO_LEILAO = re.compile(r'LEIL[ÃA]O\s+(\d+)', re.IGNORECASE)
+
+
+class DadosLeilao:
+    """Campos de um leilão comuns a todos os seus lotes"""
+    
+    __slots__ = ('chave', 'host', 'numero', 'leiloeiro', 'local')
+    
+    def __init__(self, chave: str, host: str, numero: str, leiloeiro: str = "N/A", local: str = "N/A"):
+        self.chave = chave
+        self.host = host
+        self.numero = numero
+        self.leiloeiro = leiloeiro
+        self.local = local
+    
+    def __repr__(self) -> str:
+        return f"DadosLeilao(chave={self.chave!r}, leiloeiro={self.leiloeiro!r}, local={self.local!r})"
+
+
+def numero_leilao(soup: Optional[BeautifulSoup], *urls: Optional[str]) -> Optional[str]:
+    """Número do leilão pela URL (Num/leilao) ou pelo breadcrumb da página (None se não achar)"""
+    for url in urls:
+        if not url:
+            continue
+        parametros = parse_qs(urlparse(url).query)
+        for nome in PARAMETROS_NUMERO_LEILAO:
+            valor = parametros.get(nome)
+            if valor and valor[0].isdigit():
+                return valor[0]
+    
+    if soup is not None:
+        breadcrumb = soup.find(['div', 'nav', 'section', 'ol', 'ul'],
+                               class_=lambda x: x and 'breadcrumb' in str(x).lower())
+        if breadcrumb:
+            match = _PADRAO_LEILAO.search(breadcrumb.get_text())
+            if match:
+                return match.group(1)
+    return None
+
+
+def chave_leilao(url: str, numero: str) -> str:
+    """Chave do leilão: host do site (sem www.) e número"""
+    return f"{normalizar_host(url)}:{numero}"
+
+
+class CacheLeiloes:
+    """Leilões já vistos na execução, por chave (thread-safe)"""
+    
+    def __init__(self):
+        self._leiloes: Dict[str, DadosLeilao] = {}
+        self._lock = threading.Lock()
+    
+    def obter(self, chave: str) -> Optional[DadosLeilao]:
+        with self._lock:
+            return self._leiloes.get(chave)
+    
+    def guardar(self, dados: DadosLeilao):
+        with self._lock:
+            self._leiloes[dados.chave] = dados
+    
+    def __len__(self) -> int:
+        return len(self._leiloes)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cascata de estratégias de extração com ordem aprendida por (campo, host)
+Extratores como extrair_lote_leiloes_br tentam várias estratégias em ordem fixa até uma
+encontrar o campo; em um site em que só a 7ª acerta, cada lote paga seis buscas inúteis.
+CascataEstrategias registra, por host, quais estratégias dão o mesmo resultado que a ordem
+fixa e passa a tentar primeiro as que concordam (taxa de concordância alta), voltando à
+ordem fixa quando nenhuma delas acha o campo
+
+Exploração: as primeiras AMOSTRAS_MINIMAS chamadas de cada host e depois uma a cada
+PERIODO_EXPLORACAO executam todas as estratégias na ordem fixa (o resultado é o da ordem
+fixa) e atualizam as taxas, então mudanças no layout de um site são detectadas
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .metricas import ESTRATEGIAS_EXTRACAO, ESTRATEGIA_CONCORDANCIA
+
+
+AMOSTRAS_MINIMAS = 10
+PERIODO_EXPLORACAO = 25
+CONCORDANCIA_MINIMA = 0.95
+
+logger = logging.getLogger(__name__)
+
+
+class _EstatisticasHost:
+    """Contadores de um host: chamadas, amostras de exploração e concordâncias por estratégia"""
+    
+    __slots__ = ('chamadas', 'amostras', 'concordancias', 'acertos', 'ordem')
+    
+    def __init__(self, total_estrategias: int):
+        self.chamadas = 0
+        self.amostras = 0
+        self.concordancias = [0] * total_estrategias
+        self.acertos = [0] * total_estrategias  # Resultado devolvido por cada estratégia (fora da exploração)
+        self.ordem: List[int] = []  # Estratégias confiáveis, da maior para a menor concordância
+
+
+class CascataEstrategias:
+    """
+    Estratégias de um campo (funções que retornam o valor ou None) com ordem aprendida por host
+    
+    Uso:
+        CASCATA_LOTE = CascataEstrategias('lote', [('breadcrumb', _lote_breadcrumb), ...])
+        lote = CASCATA_LOTE.executar(host, self, soup, url) or 'N/A'
+    """
+    
+    def __init__(self, campo: str, estrategias: Sequence[Tuple[str, Callable[..., Any]]],
+                 amostras_minimas: int = AMOSTRAS_MINIMAS, periodo_exploracao: int = PERIODO_EXPLORACAO,
+                 concordancia_minima: float = CONCORDANCIA_MINIMA):
+        """
+        Args:
+            campo: Nome do campo (rótulo das métricas)
+            estrategias: (nome, função) na ordem fixa, da mais confiável para a menos confiável
+            amostras_minimas: Chamadas exploratórias de cada host antes de usar a ordem aprendida
+            periodo_exploracao: Depois disso, uma chamada a cada periodo_exploracao é exploratória
+            concordancia_minima: Fração das amostras em que a estratégia precisa dar o resultado
+                da ordem fixa para ser tentada antes das outras
+        """
+        self.campo = campo
+        self.nomes = [nome for nome, _ in estrategias]
+        self.funcoes = [funcao for _, funcao in estrategias]
+        self.amostras_minimas = amostras_minimas
+        self.periodo_exploracao = max(periodo_exploracao, 1)
+        self.concordancia_minima = concordancia_minima
+        self._hosts: Dict[str, _EstatisticasHost] = {}
+        self._lock = threading.Lock()
+    
+    def _tentar(self, indice: int, args) -> Any:
+        """Resultado de uma estratégia; exceções contam como campo não encontrado"""
+        try:
+            return self.funcoes[indice](*args)
+        except Exception as e:
+            logger.debug(f"Erro na estratégia {self.nomes[indice]} do campo {self.campo}: {e}")
+            return None
+    
+    def executar(self, host: str, *args) -> Any:
+        """Valor do campo (None se nenhuma estratégia achar); args são repassados às estratégias"""
+        with self._lock:
+            estatisticas = self._hosts.get(host)
+            if estatisticas is None:
+                estatisticas = self._hosts[host] = _EstatisticasHost(len(self.funcoes))
+            estatisticas.chamadas += 1
+            explorar = (estatisticas.amostras < self.amostras_minimas
+                        or estatisticas.chamadas % self.periodo_exploracao == 0)
+            ordem = list(estatisticas.ordem)
+        
+        if explorar:
+            return self._explorar(host, estatisticas, args)
+        
+        # Primeiro as estratégias que concordam com a ordem fixa neste host
+        tentadas = set()
+        for indice in ordem:
+            valor = self._tentar(indice, args)
+            if valor is not None:
+                self._registrar_acerto(host, estatisticas, indice, "aprendida")
+                return valor
+            tentadas.add(indice)
+        
+        # Nenhuma achou: ordem fixa com as restantes (as tentadas não acharam, o resultado é o mesmo)
+        for indice in range(len(self.funcoes)):
+            if indice in tentadas:
+                continue
+            valor = self._tentar(indice, args)
+            if valor is not None:
+                self._registrar_acerto(host, estatisticas, indice, "fixa")
+                return valor
+        
+        ESTRATEGIAS_EXTRACAO.inc(campo=self.campo, host=host, estrategia="nenhuma", modo="fixa")
+        return None
+    
+    def _explorar(self, host: str, estatisticas: _EstatisticasHost, args) -> Any:
+        """Executa todas as estratégias; o resultado é o da ordem fixa (a primeira que achou)"""
+        valores = [self._tentar(indice, args) for indice in range(len(self.funcoes))]
+        vencedora = next((indice for indice, valor in enumerate(valores) if valor is not None), None)
+        resultado = valores[vencedora] if vencedora is not None else None
+        
+        with self._lock:
+            estatisticas.amostras += 1
+            if resultado is not None:
+                for indice, valor in enumerate(valores):
+                    if valor == resultado:
+                        estatisticas.concordancias[indice] += 1
+            taxas = [concordancias / estatisticas.amostras for concordancias in estatisticas.concordancias]
+            if estatisticas.amostras >= self.amostras_minimas:
+                confiaveis = [indice for indice, taxa in enumerate(taxas) if taxa >= self.concordancia_minima]
+                estatisticas.ordem = sorted(confiaveis, key=lambda indice: (-taxas[indice], indice))
+        
+        for indice, taxa in enumerate(taxas):
+            ESTRATEGIA_CONCORDANCIA.definir(taxa, campo=self.campo, host=host, estrategia=self.nomes[indice])
+        ESTRATEGIAS_EXTRACAO.inc(campo=self.campo, host=host,
+                                 estrategia=self.nomes[vencedora] if vencedora is not None else "nenhuma",
+                                 modo="exploracao")
+        return resultado
+    
+    def _registrar_acerto(self, host: str, estatisticas: _EstatisticasHost, indice: int, modo: str):
+        with self._lock:
+            estatisticas.acertos[indice] += 1
+        ESTRATEGIAS_EXTRACAO.inc(campo=self.campo, host=host, estrategia=self.nomes[indice], modo=modo)
+    
+    def estatisticas(self) -> Dict[str, Dict]:
+        """Por host: chamadas, amostras, ordem aprendida e concordância/acertos de cada estratégia"""
+        with self._lock:
+            return {
+                host: {
+                    'chamadas': dados.chamadas,
+                    'amostras': dados.amostras,
+                    'ordem': [self.nomes[indice] for indice in dados.ordem],
+                    'estrategias': {
+                        nome: {
+                            'concordancia': round(dados.concordancias[indice] / dados.amostras, 3) if dados.amostras else None,
+                            'acertos': dados.acertos[indice]
+                        }
+                        for indice, nome in enumerate(self.nomes)
+                    }
+                }
+                for host, dados in self._hosts.items()
+            }
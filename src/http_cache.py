@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache local de respostas HTTP para os scrapers
+Guarda em disco as respostas (200) de fazer_requisicao para acelerar o ajuste de extratores
+e permite rodar em modo replay (somente cache, sem acessar a rede)
+
+Configuração por variáveis de ambiente (usadas por BaseScraper quando nenhum cache é passado):
+    SCRAPER_CACHE_DIR      Diretório do cache (ativa o cache)
+    SCRAPER_CACHE_TTL      Validade das entradas em segundos (padrão: 86400; 0 = sem expiração)
+    SCRAPER_CACHE_MAX_MB   Tamanho máximo do cache em MB (padrão: 500)
+    SCRAPER_REPLAY         "1" para servir apenas do cache (sem rede); usa cache/http se SCRAPER_CACHE_DIR não for definido
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Headers que não identificam o conteúdo pedido (User-Agent é sorteado a cada requisição)
+HEADERS_IGNORADOS = {'user-agent', 'connection', 'upgrade-insecure-requests'}
+
+# Headers da resposta que não valem para o corpo já decodificado guardado no cache
+HEADERS_RESPOSTA_IGNORADOS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class CacheRespostas:
+    """Cache em disco de respostas HTTP com TTL e remoção das entradas mais antigas por tamanho"""
+    
+    def __init__(self, diretorio: str = "cache/http", ttl: Optional[float] = 24 * 3600,
+                 tamanho_maximo_mb: float = 500, somente_cache: bool = False):
+        """
+        Args:
+            diretorio: Diretório onde as respostas são guardadas
+            ttl: Validade das entradas em segundos (None ou 0 = sem expiração)
+            tamanho_maximo_mb: Tamanho máximo do cache; as entradas menos usadas são removidas
+            somente_cache: Modo replay - nunca acessa a rede e ignora o TTL
+        """
+        self.diretorio = Path(diretorio)
+        self.ttl = ttl or None
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.somente_cache = somente_cache
+        
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._tamanho_atual = self._calcular_tamanho()
+    
+    @classmethod
+    def do_ambiente(cls) -> Optional['CacheRespostas']:
+        """Cria o cache a partir das variáveis de ambiente (None se o cache não estiver ativo)"""
+        replay = os.getenv("SCRAPER_REPLAY", "0") == "1"
+        diretorio = os.getenv("SCRAPER_CACHE_DIR")
+        if not diretorio and not replay:
+            return None
+        
+        return cls(
+            diretorio=diretorio or "cache/http",
+            ttl=float(os.getenv("SCRAPER_CACHE_TTL", 24 * 3600)),
+            tamanho_maximo_mb=float(os.getenv("SCRAPER_CACHE_MAX_MB", 500)),
+            somente_cache=replay
+        )
+    
+    def chave(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """Chave da entrada: hash da URL e dos headers que afetam o conteúdo"""
+        estaveis = sorted(
+            (nome.lower(), valor)
+            for nome, valor in (headers or {}).items()
+            if nome.lower() not in HEADERS_IGNORADOS
+        )
+        conteudo = json.dumps([url, estaveis], ensure_ascii=False)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+    
+    def _caminhos(self, chave: str):
+        pasta = self.diretorio / chave[:2]
+        return pasta / f"{chave}.json", pasta / f"{chave}.body"
+    
+    def obter(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """Retorna a resposta guardada (ou None se não existir/estiver expirada)"""
+        caminho_meta, caminho_corpo = self._caminhos(self.chave(url, headers))
+        
+        try:
+            meta = json.loads(caminho_meta.read_text(encoding='utf-8'))
+            if self.ttl and not self.somente_cache and time.time() - meta['salvo_em'] > self.ttl:
+                self.falhas += 1
+                return None
+            corpo = caminho_corpo.read_bytes()
+        except (OSError, ValueError, KeyError):
+            self.falhas += 1
+            return None
+        
+        # Marcar como usada recentemente (a remoção por tamanho começa pelas menos usadas)
+        try:
+            os.utime(caminho_meta)
+        except OSError:
+            pass
+        
+        self.acertos += 1
+        return self._montar_resposta(meta, corpo)
+    
+    def _montar_resposta(self, meta: Dict, corpo: bytes) -> requests.Response:
+        """Reconstrói um requests.Response a partir de uma entrada do cache"""
+        response = requests.Response()
+        response.status_code = meta.get('status_code', 200)
+        response.reason = meta.get('reason') or 'OK'
+        response.url = meta.get('url_final') or meta.get('url')
+        response.headers = CaseInsensitiveDict(meta.get('headers') or {})
+        response.encoding = meta.get('encoding')
+        response._content = corpo
+        return response
+    
+    def guardar(self, url: str, headers: Optional[Dict[str, str]], response: requests.Response):
+        """Guarda uma resposta no cache (somente status 200)"""
+        if response is None or response.status_code != 200:
+            return
+        
+        caminho_meta, caminho_corpo = self._caminhos(self.chave(url, headers))
+        corpo = response.content
+        meta = {
+            'url': url,
+            'url_final': response.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'encoding': response.encoding,
+            'headers': {
+                nome: valor for nome, valor in response.headers.items()
+                if nome.lower() not in HEADERS_RESPOSTA_IGNORADOS
+            },
+            'salvo_em': time.time()
+        }
+        
+        try:
+            caminho_meta.parent.mkdir(parents=True, exist_ok=True)
+            tamanho_anterior = self._tamanho_entrada(caminho_meta, caminho_corpo)
+            caminho_corpo.write_bytes(corpo)
+            caminho_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+        except OSError:
+            return
+        
+        with self._lock:
+            self._tamanho_atual += self._tamanho_entrada(caminho_meta, caminho_corpo) - tamanho_anterior
+            if self._tamanho_atual > self.tamanho_maximo:
+                self._remover_excesso()
+    
+    def _tamanho_entrada(self, caminho_meta: Path, caminho_corpo: Path) -> int:
+        tamanho = 0
+        for caminho in (caminho_meta, caminho_corpo):
+            try:
+                tamanho += caminho.stat().st_size
+            except OSError:
+                pass
+        return tamanho
+    
+    def _calcular_tamanho(self) -> int:
+        return sum(caminho.stat().st_size for caminho in self.diretorio.rglob('*') if caminho.is_file())
+    
+    def _remover_excesso(self):
+        """Remove as entradas menos usadas até o cache ficar em 90% do tamanho máximo"""
+        entradas = []
+        for caminho_meta in self.diretorio.rglob('*.json'):
+            caminho_corpo = caminho_meta.with_suffix('.body')
+            try:
+                entradas.append((caminho_meta.stat().st_mtime, caminho_meta, caminho_corpo))
+            except OSError:
+                continue
+        entradas.sort()
+        
+        limite = int(self.tamanho_maximo * 0.9)
+        for _, caminho_meta, caminho_corpo in entradas:
+            if self._tamanho_atual <= limite:
+                break
+            tamanho = self._tamanho_entrada(caminho_meta, caminho_corpo)
+            for caminho in (caminho_meta, caminho_corpo):
+                try:
+                    caminho.unlink()
+                except OSError:
+                    pass
+            self._tamanho_atual -= tamanho
+    
+    def limpar(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            for caminho in list(self.diretorio.rglob('*')):
+                if caminho.is_file():
+                    caminho.unlink()
+            self._tamanho_atual = 0
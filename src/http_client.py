@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de conexões HTTP compartilhado pelos scrapers do processo
+Cada scraper mantém sua própria requests.Session (cookies e headers separados), mas todas usam
+os mesmos HTTPAdapter: as conexões keep-alive (e os handshakes TLS) de um site são reaproveitadas
+por sessões da API, monitores, extrator e atualizadores, em vez de cada instância abrir as suas
+
+Transporte HTTP/2 opcional (requer httpx com h2: pip install "httpx[http2]"): nos sites de
+HOSTS_HTTP2 as requisições das sessões passam a dividir uma conexão multiplexada, em vez de
+uma conexão HTTP/1.1 por requisição simultânea. O servidor negocia o protocolo (ALPN) e, se não
+suportar HTTP/2, a conexão continua em HTTP/1.1
+
+Configuração por variáveis de ambiente:
+    SCRAPER_CONEXOES_POR_HOST  conexões mantidas por site sem configuração própria (padrão: 10)
+    SCRAPER_HTTP2              "1" para usar HTTP/2 nos sites de HOSTS_HTTP2 (padrão: 0)
+"""
+
+import os
+import threading
+from datetime import timedelta
+from http.client import HTTPMessage
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Dict, Iterable, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import HTTPResponse
+
+from .rate_limiter import normalizar_host
+
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx usa o h2 para HTTP/2
+    HTTP2_DISPONIVEL = True
+except ImportError:
+    httpx = None
+    HTTP2_DISPONIVEL = False
+
+
+# Conexões mantidas por site (threads que acessam o site ao mesmo tempo: monitores, workers)
+CONEXOES_POR_HOST: Dict[str, int] = {
+    'iarremate.com': 20,        # Monitor de leilões: uma thread por obra monitorada
+    'leiloesbr.com.br': 10,
+    'miguelsalles.com.br': 4,
+    'robertohaddad.lel.br': 4,
+}
+
+# Sites com muitas requisições pequenas de páginas de obras (SCRAPER_HTTP2=1)
+HOSTS_HTTP2 = ('iarremate.com', 'leiloesbr.com.br')
+
+
+class AdaptadorHTTP2(BaseAdapter):
+    """
+    Adaptador do requests que envia as requisições por um httpx.Client com HTTP/2
+    As sessões continuam sendo requests.Session: cookies, headers, redirecionamentos e o
+    tratamento de respostas de BaseScraper.fazer_requisicao não mudam
+    """
+    
+    def __init__(self, conexoes: int = 10, somente_http2: bool = False):
+        """
+        Args:
+            conexoes: Máximo de conexões com o site (em HTTP/2 normalmente basta uma)
+            somente_http2: HTTP/2 sem negociação (h2c em http://, para servidores de teste locais)
+        """
+        if not HTTP2_DISPONIVEL:
+            raise RuntimeError('HTTP/2 requer httpx com h2: pip install "httpx[http2]"')
+        super().__init__()
+        self.conexoes = conexoes
+        self.somente_http2 = somente_http2
+        self._clientes: Dict[bool, 'httpx.Client'] = {}
+        self._lock = threading.Lock()
+    
+    def _cliente(self, verify) -> 'httpx.Client':
+        verificar = verify is not False
+        with self._lock:
+            cliente = self._clientes.get(verificar)
+            if cliente is None:
+                cliente = self._clientes[verificar] = httpx.Client(
+                    http1=not self.somente_http2,
+                    http2=True,
+                    verify=verificar,
+                    limits=httpx.Limits(max_connections=self.conexoes, max_keepalive_connections=self.conexoes)
+                )
+            return cliente
+    
+    @staticmethod
+    def _timeout(timeout) -> 'httpx.Timeout':
+        if isinstance(timeout, tuple):
+            conexao, leitura = timeout
+            return httpx.Timeout(leitura, connect=conexao)
+        return httpx.Timeout(timeout)
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        requisicao = httpx.Request(request.method, request.url, headers=dict(request.headers),
+                                   content=request.body,
+                                   extensions={"timeout": self._timeout(timeout).as_dict()})
+        try:
+            # send() não aplica o cookie jar do cliente: os cookies vêm da requests.Session
+            resposta = self._cliente(verify).send(requisicao)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        return self._converter(request, resposta)
+    
+    def _converter(self, request, resposta: 'httpx.Response') -> requests.Response:
+        """Converte a resposta do httpx em requests.Response (corpo já lido e decodificado)"""
+        response = requests.Response()
+        response.status_code = resposta.status_code
+        response.reason = resposta.reason_phrase
+        response.headers = CaseInsensitiveDict(resposta.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=resposta.elapsed.total_seconds())
+        response._content = resposta.content
+        
+        # raw com os headers originais: a Session lê dele os Set-Cookie e o usa nos redirecionamentos
+        cabecalhos = HTTPMessage()
+        for nome, valor in resposta.headers.multi_items():
+            cabecalhos[nome] = valor
+        response.raw = HTTPResponse(body=BytesIO(b""), headers=resposta.headers.multi_items(),
+                                    status=resposta.status_code, preload_content=False,
+                                    original_response=SimpleNamespace(msg=cabecalhos))
+        return response
+    
+    def close(self):
+        # Compartilhado pelas sessões: Session.close() de um scraper não encerra o cliente
+        pass
+    
+    def encerrar(self):
+        """Fecha as conexões HTTP/2 do adaptador"""
+        with self._lock:
+            for cliente in self._clientes.values():
+                cliente.close()
+            self._clientes.clear()
+
+
+class RegistroClientesHTTP:
+    """HTTPAdapter compartilhados: um por site configurado e um padrão para os demais hosts"""
+    
+    def __init__(self, conexoes_padrao: int = 10, conexoes_por_host: Optional[Dict[str, int]] = None,
+                 hosts_em_cache: int = 20, hosts_http2: Iterable[str] = ()):
+        """
+        Args:
+            conexoes_padrao: Conexões por host no adaptador padrão
+            conexoes_por_host: Conexões por site ({host sem www: conexões}); padrão: CONEXOES_POR_HOST
+            hosts_em_cache: Quantos hosts o adaptador padrão mantém com conexões abertas
+            hosts_http2: Sites acessados com AdaptadorHTTP2 (ignorado se httpx/h2 não estiverem instalados)
+        """
+        self.conexoes_padrao = conexoes_padrao
+        self.conexoes_por_host = dict(CONEXOES_POR_HOST if conexoes_por_host is None else conexoes_por_host)
+        self.hosts_em_cache = hosts_em_cache
+        self.hosts_http2 = {normalizar_host(host) for host in hosts_http2}
+        if self.hosts_http2 and not HTTP2_DISPONIVEL:
+            print('[AVISO] HTTP/2 solicitado, mas httpx com h2 não está instalado (pip install "httpx[http2]"); usando HTTP/1.1')
+            self.hosts_http2 = set()
+        for host in self.hosts_http2:
+            self.conexoes_por_host.setdefault(host, conexoes_padrao)
+        self._adaptadores: Dict[str, HTTPAdapter] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def do_ambiente(cls) -> 'RegistroClientesHTTP':
+        """Cria o registro a partir das variáveis de ambiente"""
+        return cls(
+            conexoes_padrao=int(os.getenv("SCRAPER_CONEXOES_POR_HOST", 10)),
+            hosts_http2=HOSTS_HTTP2 if os.getenv("SCRAPER_HTTP2", "0") == "1" else ()
+        )
+    
+    def _criar_adaptador(self, conexoes: int, hosts: int) -> HTTPAdapter:
+        # Sem retries do urllib3: as novas tentativas ficam com BaseScraper.fazer_requisicao
+        return HTTPAdapter(pool_connections=hosts, pool_maxsize=conexoes, max_retries=0)
+    
+    def adaptador(self, host: Optional[str] = None) -> BaseAdapter:
+        """Adaptador do site (o padrão se o host não tiver configuração própria)"""
+        host = normalizar_host(host) if host else ""
+        chave = host if host in self.conexoes_por_host else ""
+        with self._lock:
+            adaptador = self._adaptadores.get(chave)
+            if adaptador is None:
+                if chave in self.hosts_http2:
+                    adaptador = AdaptadorHTTP2(self.conexoes_por_host[chave])
+                elif chave:
+                    # www.site e site são hosts diferentes para o urllib3: dois pools
+                    adaptador = self._criar_adaptador(self.conexoes_por_host[chave], hosts=2)
+                else:
+                    adaptador = self._criar_adaptador(self.conexoes_padrao, hosts=self.hosts_em_cache)
+                self._adaptadores[chave] = adaptador
+            return adaptador
+    
+    def montar(self, session: requests.Session):
+        """Monta os adaptadores compartilhados na sessão (os específicos por prefixo do site)"""
+        padrao = self.adaptador()
+        session.mount("https://", padrao)
+        session.mount("http://", padrao)
+        for host in self.conexoes_por_host:
+            adaptador = self.adaptador(host)
+            for esquema in ("https://", "http://"):
+                session.mount(f"{esquema}{host}/", adaptador)
+                session.mount(f"{esquema}www.{host}/", adaptador)
+    
+    def nova_sessao(self) -> requests.Session:
+        """requests.Session com os adaptadores compartilhados"""
+        session = requests.Session()
+        self.montar(session)
+        return session
+
+
+# Registro compartilhado pelos scrapers do processo (BaseScraper cria suas sessões com ele)
+REGISTRO_HTTP = RegistroClientesHTTP.do_ambiente()
@@ -6,10 +6,14 @@ Coleta dados de quadros disponíveis no site iArremate
 """
 
 import re
-import time
+from datetime import datetime
 from typing import Optional, Dict, List
 from bs4 import BeautifulSoup
 from .base_scraper import BaseScraper
+from .registro_lote import LoteRecord
+from .metricas import cronometrar_extrator
+from .estrategias import CascataEstrategias
+from .rate_limiter import normalizar_host
 
 
 class IArremateScraper(BaseScraper):
@@ -18,7 +22,8 @@ class IArremateScraper(BaseScraper):
     def __init__(self, base_url: str = "https://www.iarremate.com/belas-artes", 
                  output_dir: str = "output", logs_dir: str = "logs", 
                  max_retries: int = 3, delay_between_requests: float = 1.0,
-                 db_session=None, session_id: int = None):
+                 db_session=None, session_id: int = None, cache=None, limitador=None, arquivo=None,
+                 limitador_extra=None):
         """
         Inicializa o scraper do iArremate
         
@@ -27,9 +32,13 @@ class IArremateScraper(BaseScraper):
             output_dir: Diretório para salvar arquivos de saída
             logs_dir: Diretório para salvar logs
             max_retries: Número máximo de tentativas por requisição
-            delay_between_requests: Delay entre requisições (segundos)
+            delay_between_requests: Intervalo mínimo entre requisições deste scraper (segundos)
             db_session: Sessão do banco de dados para verificar duplicatas
             session_id: ID da sessão de scraping
+            cache: Cache de respostas HTTP (CacheRespostas); padrão definido pelas variáveis de ambiente
+            limitador: Limitador de taxa por host (LimitadorPorHost); padrão: LIMITADOR_GLOBAL
+            arquivo: Arquivo das páginas de obras (ArquivoPaginas); padrão definido pela variável SCRAPER_ARQUIVO_DIR
+            limitador_extra: Limitador adicional deste scraper, reservado junto com `limitador`
         """
         super().__init__(
             base_url=base_url,
@@ -37,84 +46,35 @@ class IArremateScraper(BaseScraper):
             logs_dir=logs_dir,
             max_retries=max_retries,
             delay_between_requests=delay_between_requests,
-            scraper_name="iarremate"
+            scraper_name="iarremate",
+            cache=cache,
+            limitador=limitador,
+            arquivo=arquivo,
+            limitador_extra=limitador_extra
         )
         self.db_session = db_session
         self.session_id = session_id
         self._parar_scraping = False  # Flag para parar o scraping
         self.urls_coletadas = set()  # Cache de URLs já coletadas nesta execução
     
-    def descobrir_total_paginas(self, categoria: str = None) -> int:
-        """Descobre o total de páginas disponíveis para uma categoria"""
-        # URL específica para a categoria
+    # Limite de segurança de páginas por categoria (descoberta e coleta sem max_paginas)
+    LIMITE_PAGINAS = 100
+    
+    def _url_categoria(self, categoria: str = None) -> str:
+        """URL da listagem de uma categoria (derivada de base_url)"""
         if categoria:
-            if categoria.lower() == "quadros":
-                url_base = "https://www.iarremate.com/belas-artes/quadros"
-            elif categoria.lower() == "esculturas":
-                url_base = "https://www.iarremate.com/belas-artes/esculturas"
-            else:
-                url_base = f"{self.base_url}/{categoria.lower()}"
-        else:
-            url_base = self.base_url
-        
-        self.logger.info(f"Descobrindo total de páginas para: {categoria or 'todas as categorias'}...")
-        
-        pagina_atual = 1
-        max_paginas = 100  # Limite de segurança
-        
-        while pagina_atual <= max_paginas:
-            if pagina_atual == 1:
-                url = url_base
-            else:
-                url = f"{url_base}/pg{pagina_atual}"
-            
-            response = self.fazer_requisicao(url)
-            if not response:
-                break
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Verificar se a página tem conteúdo (quadros ou esculturas)
-            tem_conteudo = False
-            
-            # Verificar se há links de obras
-            links_obras = soup.find_all('a', href=True)
-            for link in links_obras:
-                href = link.get('href')
-                if href and ('/belas-artes/' in href or '/quadro' in href or '/pintura' in href or '/escultura' in href):
-                    tem_conteudo = True
-                    break
-            
-            if not tem_conteudo:
-                self.logger.info(
-                    f"Página {pagina_atual} não contém obras. "
-                    f"Total de páginas: {pagina_atual - 1}"
-                )
-                return pagina_atual - 1
-            
-            self.logger.debug(f"Página {pagina_atual} contém obras")
-            pagina_atual += 1
-            time.sleep(1)
-        
-        self.logger.warning(f"Limite de {max_paginas} páginas atingido")
-        return max_paginas
+            return f"{self.base_url.rstrip('/')}/{categoria.lower()}"
+        return self.base_url
     
-    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None):
-        """Processa uma página específica e extrai dados dos quadros"""
-        # Verificar se deve parar antes de processar
-        if self._parar_scraping:
-            return
-        
-        self.logger.info(f"Processando página {numero_pagina}: {url}")
-        
-        response = self.fazer_requisicao(url)
-        if not response:
-            self.logger.error(f"Erro ao acessar página {numero_pagina}")
-            return
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Buscar todos os links de quadros na página
+    def _url_pagina(self, url_categoria: str, pagina: int) -> str:
+        """URL de uma página da listagem (página 1 é a própria URL da categoria)"""
+        if pagina == 1:
+            return url_categoria
+        return f"{url_categoria}/pg{pagina}"
+    
+    @cronometrar_extrator
+    def _extrair_links_obras(self, soup: BeautifulSoup) -> List[str]:
+        """Extrai os links de obras (quadros/esculturas) de uma página de listagem, sem repetição"""
         links_quadros = []
         
         # Estratégia 1: Buscar links que parecem ser de obras (quadros ou esculturas)
@@ -145,22 +105,118 @@ class IArremateScraper(BaseScraper):
                     if href not in links_quadros:
                         links_quadros.append(href)
         
+        return links_quadros
+    
+    def _pagina_tem_obras(self, url_categoria: str, pagina: int) -> bool:
+        """Busca uma página da listagem e verifica se contém obras"""
+        response = self.fazer_requisicao(self._url_pagina(url_categoria, pagina))
+        if not response:
+            return False
+        
+        soup = self.criar_soup(response.text)
+        return len(self._extrair_links_obras(soup)) > 0
+    
+    def descobrir_total_paginas(self, categoria: str = None) -> int:
+        """
+        Descobre o total de páginas disponíveis para uma categoria
+        
+        Só é necessário quando se quer apenas a contagem: a coleta (executar_scraping) descobre
+        o fim da listagem ao encontrar a primeira página vazia. Usa busca exponencial (1, 2, 4, 8...)
+        seguida de busca binária, ~2*log2(N) requisições em vez de N
+        """
+        url_base = self._url_categoria(categoria)
+        
+        self.logger.info(f"Descobrindo total de páginas para: {categoria or 'todas as categorias'}...")
+        
+        if not self._pagina_tem_obras(url_base, 1):
+            self.logger.info("Página 1 não contém obras. Total de páginas: 0")
+            return 0
+        
+        # Busca exponencial: encontrar uma página vazia (ou o limite)
+        ultima_com_obras = 1
+        pagina = 2
+        while pagina <= self.LIMITE_PAGINAS and self._pagina_tem_obras(url_base, pagina):
+            ultima_com_obras = pagina
+            pagina *= 2
+        
+        if pagina > self.LIMITE_PAGINAS:
+            if self._pagina_tem_obras(url_base, self.LIMITE_PAGINAS):
+                self.logger.warning(f"Limite de {self.LIMITE_PAGINAS} páginas atingido")
+                return self.LIMITE_PAGINAS
+            pagina = self.LIMITE_PAGINAS
+        
+        # Busca binária entre a última página com obras e a primeira vazia
+        inicio, fim = ultima_com_obras, pagina
+        while fim - inicio > 1:
+            meio = (inicio + fim) // 2
+            if self._pagina_tem_obras(url_base, meio):
+                inicio = meio
+            else:
+                fim = meio
+        
+        self.logger.info(f"Total de páginas: {inicio}")
+        return inicio
+    
+    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None,
+                         somente_urls: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Processa uma página específica e extrai dados dos quadros
+        Com somente_urls (retomada de checkpoint), processa apenas essas URLs sem buscar a página
+        
+        Retorna o número de obras encontradas na página (0 = fim da listagem, None = erro de acesso)
+        """
+        # Verificar se deve parar antes de processar
+        if self._parar_scraping:
+            return None
+        
+        if somente_urls:
+            self.logger.info(f"Retomando página {numero_pagina}: {len(somente_urls)} obras pendentes")
+            self._processar_links(list(somente_urls), numero_pagina, categoria)
+            return len(somente_urls)
+        
+        self.logger.info(f"Processando página {numero_pagina}: {url}")
+        
+        response = self.fazer_requisicao(url)
+        if not response:
+            self.logger.error(f"Erro ao acessar página {numero_pagina}")
+            return None
+        
+        soup = self.criar_soup(response.text)
+        
+        # Buscar todos os links de quadros na página
+        links_quadros = self._extrair_links_obras(soup)
+        
+        # Só as URLs seguem para as buscas das obras: liberar a árvore (e o HTML) da listagem
+        soup.decompose()
+        del soup, response
+        
         self.logger.info(f"Encontrados {len(links_quadros)} obras na página {numero_pagina}")
         
+        self._processar_links(links_quadros, numero_pagina, categoria)
+        return len(links_quadros)
+    
+    def _processar_links(self, links_quadros: List[str], numero_pagina: int, categoria: str = None):
+        """Processa os links de obras de uma página mantendo as URLs pendentes no checkpoint"""
+        self.progresso['urls_pendentes'] = list(links_quadros)
+        
         # Processar cada obra encontrada
         for i, link_quadro in enumerate(links_quadros, 1):
             # Verificar se deve parar antes de cada obra
             if self._parar_scraping:
                 self.logger.warning(f"Parada solicitada. Interrompendo processamento da página {numero_pagina}")
+                self.registrar_checkpoint()
                 break
             
             try:
                 self.logger.debug(f"  Processando obra {i}/{len(links_quadros)}: {link_quadro}")
                 self.processar_obra(link_quadro, numero_pagina, categoria)
-                time.sleep(self.delay_between_requests)
             except Exception as e:
                 self.logger.error(f"  Erro ao processar obra {link_quadro}: {e}")
-                continue
+            
+            # Checkpoint a cada 10 obras (persiste as obras coletadas e as URLs restantes)
+            self.progresso['urls_pendentes'] = links_quadros[i:]
+            if i % 10 == 0:
+                self.registrar_checkpoint()
     
     def obra_ja_existe(self, url: str) -> bool:
         """Verifica se a obra já existe no banco de dados"""
@@ -225,6 +281,7 @@ class IArremateScraper(BaseScraper):
         
         return True
     
+    @cronometrar_extrator
     def extrair_titulo_iarremate(self, soup: BeautifulSoup) -> str:
         """Extrai o título específico do iArremate com validação rigorosa"""
         titulo = "N/A"
@@ -306,6 +363,7 @@ class IArremateScraper(BaseScraper):
         
         return "N/A"
     
+    @cronometrar_extrator
     def extrair_data_inicio_leilao_iarremate(self, soup: BeautifulSoup) -> str:
         """Extrai a data/hora de início do leilão"""
         data_inicio = "nao tem"
@@ -369,76 +427,87 @@ class IArremateScraper(BaseScraper):
         
         return data_inicio if data_inicio != "nao tem" else "nao tem"
     
+    # Estratégias do número do lote, na ordem fixa (da mais para a menos confiável); cada uma
+    # retorna o número ou None. A ordem efetiva é aprendida por host em _CASCATA_LOTE
+    
+    def _lote_por_nlote(self, soup: BeautifulSoup) -> Optional[str]:
+        """div com class="nlote" (mais específico e confiável)"""
+        lote_div = soup.find('div', class_='nlote')
+        if lote_div:
+            texto_lote = lote_div.get_text(strip=True)
+            if texto_lote and re.match(r'^\d+$', texto_lote):
+                return texto_lote
+        return None
+    
+    def _lote_por_classe_lote(self, soup: BeautifulSoup) -> Optional[str]:
+        """div com class contendo "lote" (variações)"""
+        lote_divs = soup.find_all('div', class_=lambda x: x and 'lote' in str(x).lower())
+        for div in lote_divs:
+            texto = div.get_text(strip=True)
+            if texto and re.match(r'^\d+$', texto):
+                return texto
+        return None
+    
+    def _lote_por_badge(self, soup: BeautifulSoup) -> Optional[str]:
+        """Elementos com classes relacionadas a lote, próximos a informações da obra"""
+        lote_candidates = soup.find_all(['span', 'div', 'strong', 'b'], 
+                                      class_=re.compile(r'badge|numero|lote|lot|num', re.IGNORECASE))
+        for candidate in lote_candidates:
+            texto = candidate.get_text(strip=True)
+            # Se for apenas um número, pode ser o lote
+            if re.match(r'^\d+$', texto):
+                # Verificar se está próximo a informações da obra
+                parent_text = candidate.parent.get_text() if candidate.parent else ""
+                if any(keyword in parent_text.lower() for keyword in ['belas artes', 'quadro', 'escultura', 'pintura']):
+                    return texto
+        return None
+    
+    def _lote_antes_de_belas_artes(self, soup: BeautifulSoup) -> Optional[str]:
+        """Número que aparece antes de "Belas Artes" (no mesmo elemento ou em irmãos anteriores)"""
+        belas_artes_elements = soup.find_all(string=re.compile(r'Belas Artes', re.IGNORECASE))
+        for belas_artes_text in belas_artes_elements:
+            parent = belas_artes_text.parent
+            if parent:
+                match = re.search(r'(\d+)\s*Belas Artes', parent.get_text(), re.IGNORECASE)
+                if match:
+                    return match.group(1)
+                
+                # Buscar em irmãos anteriores
+                for sibling in parent.find_previous_siblings():
+                    texto_sibling = sibling.get_text(strip=True)
+                    if re.match(r'^\d+$', texto_sibling):
+                        return texto_sibling
+        return None
+    
+    def _lote_por_texto_completo(self, soup: BeautifulSoup) -> Optional[str]:
+        """Padrões comuns de lote no texto completo"""
+        texto_completo = soup.get_text()
+        lote_patterns = [
+            r'Lote\s*[:\-]?\s*(\d+)',
+            r'LOTE\s*[:\-]?\s*(\d+)',
+            r'#\s*(\d+)',
+        ]
+        for pattern in lote_patterns:
+            match = re.search(pattern, texto_completo, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    _CASCATA_LOTE = CascataEstrategias('lote', [
+        ('nlote', _lote_por_nlote),
+        ('classe_lote', _lote_por_classe_lote),
+        ('badge', _lote_por_badge),
+        ('antes_belas_artes', _lote_antes_de_belas_artes),
+        ('texto_completo', _lote_por_texto_completo),
+    ])
+    
+    @cronometrar_extrator
     def extrair_lote_iarremate(self, soup: BeautifulSoup) -> str:
         """Extrai o número do lote do iArremate"""
-        lote = "N/A"
-        
-        try:
-            # Estratégia 1: Buscar div com class="nlote" (mais específico e confiável)
-            lote_div = soup.find('div', class_='nlote')
-            if lote_div:
-                texto_lote = lote_div.get_text(strip=True)
-                if texto_lote and re.match(r'^\d+$', texto_lote):
-                    lote = texto_lote
-                    return lote
-            
-            # Estratégia 2: Buscar div com class contendo "lote" (variações)
-            lote_divs = soup.find_all('div', class_=lambda x: x and 'lote' in str(x).lower())
-            for div in lote_divs:
-                texto = div.get_text(strip=True)
-                if texto and re.match(r'^\d+$', texto):
-                    lote = texto
-                    return lote
-            
-            # Estratégia 3: Buscar em elementos com classes relacionadas a lote
-            lote_candidates = soup.find_all(['span', 'div', 'strong', 'b'], 
-                                          class_=re.compile(r'badge|numero|lote|lot|num', re.IGNORECASE))
-            for candidate in lote_candidates:
-                texto = candidate.get_text(strip=True)
-                # Se for apenas um número, pode ser o lote
-                if re.match(r'^\d+$', texto):
-                    # Verificar se está próximo a informações da obra
-                    parent_text = candidate.parent.get_text() if candidate.parent else ""
-                    if any(keyword in parent_text.lower() for keyword in ['belas artes', 'quadro', 'escultura', 'pintura']):
-                        lote = texto
-                        return lote
-            
-            # Estratégia 4: Buscar número que aparece antes de "Belas Artes"
-            belas_artes_elements = soup.find_all(string=re.compile(r'Belas Artes', re.IGNORECASE))
-            for belas_artes_text in belas_artes_elements:
-                parent = belas_artes_text.parent
-                if parent:
-                    texto_completo = parent.get_text()
-                    match = re.search(r'(\d+)\s*Belas Artes', texto_completo, re.IGNORECASE)
-                    if match:
-                        lote = match.group(1)
-                        return lote
-                    
-                    # Buscar em irmãos anteriores
-                    for sibling in parent.find_previous_siblings():
-                        texto_sibling = sibling.get_text(strip=True)
-                        if re.match(r'^\d+$', texto_sibling):
-                            lote = texto_sibling
-                            return lote
-            
-            # Estratégia 5: Buscar padrões comuns de lote no texto completo
-            texto_completo = soup.get_text()
-            lote_patterns = [
-                r'Lote\s*[:\-]?\s*(\d+)',
-                r'LOTE\s*[:\-]?\s*(\d+)',
-                r'#\s*(\d+)',
-            ]
-            for pattern in lote_patterns:
-                match = re.search(pattern, texto_completo, re.IGNORECASE)
-                if match:
-                    lote = match.group(1)
-                    return lote
-        
-        except Exception as e:
-            self.logger.debug(f"Erro ao extrair lote iArremate: {e}")
-        
-        return lote if lote and lote != "N/A" else "N/A"
+        lote = self._CASCATA_LOTE.executar(normalizar_host(self.base_url), self, soup)
+        return lote if lote else "N/A"
     
+    @cronometrar_extrator
     def extrair_valor_iarremate(self, soup: BeautifulSoup) -> str:
         """Extrai o valor específico do iArremate"""
         valor = "N/A"
@@ -498,6 +567,22 @@ class IArremateScraper(BaseScraper):
         
         return valor if valor and valor != "N/A" else "N/A"
     
+    def extrair_campos_pagina(self, soup: BeautifulSoup, url_final: str) -> Dict:
+        """
+        Campos da página de uma obra com os nomes das colunas de Obra
+        Mesmos extratores de processar_obra; usado no reprocessamento de páginas arquivadas
+        """
+        titulo = self.extrair_titulo_iarremate(soup)
+        descricao = self.extrair_descricao_iarremate(soup, titulo)
+        return {
+            'titulo': titulo,
+            'descricao': descricao,
+            'nome_artista': self.extrair_nome_artista(titulo, descricao),
+            'valor': self.extrair_valor_iarremate(soup),
+            'lote': self.extrair_lote_iarremate(soup),
+            'data_inicio_leilao': self.extrair_data_inicio_leilao_iarremate(soup)
+        }
+    
     def processar_obra(self, url_quadro: str, numero_pagina: int, categoria: str = None):
         """Processa um quadro específico e extrai seus dados"""
         # Verificar se já foi coletado nesta execução
@@ -509,13 +594,15 @@ class IArremateScraper(BaseScraper):
         if self.obra_ja_existe(url_quadro):
             self.logger.info(f"    ⊘ Obra já existe no banco (pulando): {url_quadro}")
             self.urls_coletadas.add(url_quadro)
+            self.desempenho.registrar_duplicada()
             return
         
         response = self.fazer_requisicao(url_quadro)
         if not response:
             return
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        self.arquivar_pagina(url_quadro, response)
+        soup = self.criar_soup(response.text)
         
         # Extrair dados do quadro usando métodos específicos do iArremate
         titulo = self.extrair_titulo_iarremate(soup)
@@ -556,26 +643,28 @@ class IArremateScraper(BaseScraper):
                 categoria_final = "Quadros"  # Padrão
         
         # Criar entrada de dados
-        dados_quadro = {
-            'Nome_Artista': nome_artista,
-            'Categoria': categoria_final,
-            'Pagina': numero_pagina,
-            'Titulo': titulo,
-            'Descricao': descricao,
-            'Descricao_Completa': descricao_completa,
-            'Valor': valor,
-            'Lote': lote,
-            'Data_Inicio_Leilao': data_inicio_leilao,
-            'URL': url_quadro,
-            'Data_Coleta': time.strftime('%d/%m/%Y %H:%M:%S')
-        }
-        
-        self.dados_obras.append(dados_quadro)
+        self.dados_obras.append(LoteRecord(
+            url=url_quadro,
+            scraper_name=self.scraper_name,
+            nome_artista=nome_artista,
+            categoria=categoria_final,
+            pagina=numero_pagina,
+            titulo=titulo,
+            descricao=descricao,
+            valor=valor,
+            lote=lote,
+            data_inicio_leilao=data_inicio_leilao,
+            data_coleta=datetime.utcnow()
+        ))
         self.urls_coletadas.add(url_quadro)
         self.logger.info(f"    ✓ Obra coletada ({categoria_final}): {nome_artista} - Valor: R$ {valor}")
     
-    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None):
-        """Executa o scraping completo para quadros e esculturas"""
+    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None,
+                          retomar_de: Optional[Dict] = None):
+        """
+        Executa o scraping completo para quadros e esculturas
+        Com retomar_de (checkpoint), pula as categorias/páginas já concluídas
+        """
         self.logger.info("=== INICIANDO SCRAPING DO IARREMATE - BELAS ARTES ===")
         self.logger.info(f"URL Base: {self.base_url}")
         self._parar_scraping = False  # Resetar flag
@@ -586,57 +675,86 @@ class IArremateScraper(BaseScraper):
         
         self.logger.info(f"Categorias a coletar: {', '.join(categorias)}")
         
+        indice_inicial, pagina_inicial, total_checkpoint, urls_pendentes = self.ponto_de_retomada(categorias, retomar_de)
+        if retomar_de:
+            self.logger.info(f"♻️ Retomando de {categorias[indice_inicial]}, página {pagina_inicial}")
+        
         total_obras_coletadas = 0
         
         # Processar cada categoria
-        for categoria in categorias:
+        for indice, categoria in enumerate(categorias):
             if self._parar_scraping:
                 break
+            if indice < indice_inicial:
+                continue
+            retomando = bool(retomar_de) and indice == indice_inicial
             
             self.logger.info(f"\n{'='*60}")
             self.logger.info(f"COLETANDO: {categoria.upper()}")
             self.logger.info(f"{'='*60}")
             
             # URL específica para a categoria
-            if categoria.lower() == "quadros":
-                url_categoria = "https://www.iarremate.com/belas-artes/quadros"
-            elif categoria.lower() == "esculturas":
-                url_categoria = "https://www.iarremate.com/belas-artes/esculturas"
-            else:
-                # Fallback para outras categorias
-                url_categoria = f"{self.base_url}/{categoria.lower()}"
+            url_categoria = self._url_categoria(categoria)
             
-            # Descobrir total de páginas para esta categoria
-            if max_paginas is None:
-                total_paginas = self.descobrir_total_paginas(categoria=categoria)
-            else:
-                total_paginas = max_paginas
+            # Limite de páginas: sem max_paginas, a coleta segue até a primeira página vazia
+            # (sem buscar as páginas duas vezes para descobrir o total antes)
+            if retomando and total_checkpoint:
+                limite_paginas = total_checkpoint
+                self.logger.info(f"Usando limite de {limite_paginas} páginas do checkpoint para {categoria}")
+            elif max_paginas is not None:
+                limite_paginas = max_paginas
                 self.logger.info(f"Usando limite de {max_paginas} páginas para {categoria}")
+            else:
+                limite_paginas = None
             
-            if total_paginas == 0:
-                self.logger.warning(f"Nenhuma página encontrada para {categoria}!")
-                continue
+            primeira_pagina = pagina_inicial if retomando else 1
+            self.registrar_checkpoint(
+                categoria=categoria,
+                ultima_pagina=primeira_pagina - 1,
+                total_paginas=limite_paginas,
+                urls_pendentes=urls_pendentes if retomando else []
+            )
             
-            self.logger.info(f"Iniciando coleta de {total_paginas} páginas de {categoria}...")
+            self.logger.info(
+                f"Iniciando coleta de {categoria} "
+                f"({f'até {limite_paginas} páginas' if limite_paginas else 'até a última página'})..."
+            )
             
             # Processar cada página da categoria
-            for pagina in range(1, total_paginas + 1):
+            ultima_pagina = limite_paginas or self.LIMITE_PAGINAS
+            for pagina in range(primeira_pagina, ultima_pagina + 1):
                 # Verificar se deve parar
                 if self._parar_scraping:
                     self.logger.warning(f"⚠️ Scraping interrompido pelo usuário na página {pagina} de {categoria}")
                     self.logger.info(f"📊 Total coletado até agora: {len(self.dados_obras)} obras")
                     break
                 
-                if pagina == 1:
-                    url = url_categoria
-                else:
-                    url = f"{url_categoria}/pg{pagina}"
+                url = self._url_pagina(url_categoria, pagina)
                 
-                self.processar_pagina(url, pagina, categoria=categoria)
+                somente_urls = urls_pendentes if retomando and pagina == primeira_pagina else None
+                encontradas = self.processar_pagina(url, pagina, categoria=categoria, somente_urls=somente_urls)
+                
+                if self._parar_scraping:
+                    # Interrompida no meio: o checkpoint mantém as URLs pendentes
+                    break
+                
+                # Página vazia: fim da listagem (página inacessível também encerra se não há limite)
+                if encontradas == 0 or (encontradas is None and not limite_paginas):
+                    if pagina == 1:
+                        self.logger.warning(f"Nenhuma página encontrada para {categoria}!")
+                    else:
+                        self.logger.info(f"Página {pagina} sem obras. Total de páginas de {categoria}: {pagina - 1}")
+                    break
+                
+                # Página concluída
+                self.registrar_checkpoint(ultima_pagina=pagina, urls_pendentes=[])
                 
                 # Log de progresso
                 if pagina % 5 == 0:
-                    self.logger.info(f"📈 Progresso {categoria}: {pagina}/{total_paginas} páginas | {len(self.dados_obras)} obras coletadas")
+                    self.logger.info(f"📈 Progresso {categoria}: {pagina}/{limite_paginas or '?'} páginas | {len(self.dados_obras)} obras coletadas")
+            else:
+                if not limite_paginas:
+                    self.logger.warning(f"Limite de {self.LIMITE_PAGINAS} páginas atingido")
             
             obras_categoria = len(self.dados_obras) - total_obras_coletadas
             total_obras_coletadas = len(self.dados_obras)
@@ -6,11 +6,39 @@ Coleta dados de quadros e esculturas do site LeilõesBR
 """
 
 import re
-import time
+from datetime import datetime
+from dataclasses import dataclass
 from typing import Optional, Dict, List
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from .base_scraper import BaseScraper
+from .registro_lote import LoteRecord
+from .metricas import CACHE_LEILOES, cronometrar_extrator
+from .cache_leiloes import CacheLeiloes, DadosLeilao, numero_leilao, chave_leilao
+from .estrategias import CascataEstrategias
+from .rate_limiter import normalizar_host
+from .perfis_hosts import perfil_do_host
+
+
+@dataclass
+class CardObra:
+    """
+    Obra encontrada em uma página de listagem: só a URL e os dados do card (strings), sem
+    referências à árvore BeautifulSoup, que pode ser liberada antes das buscas das obras
+    """
+    __slots__ = ('url', 'titulo', 'valor', 'imagem', 'data_leilao', 'leiloeiro')
+    
+    url: str
+    titulo: str
+    valor: str
+    imagem: str
+    data_leilao: str
+    leiloeiro: str
+    
+    @classmethod
+    def da_url(cls, url: str, titulo: str = 'N/A') -> 'CardObra':
+        """Obra conhecida só pela URL (retomada de checkpoint, catálogos): dados buscados na página da obra"""
+        return cls(url=url, titulo=titulo, valor='N/A', imagem='', data_leilao='', leiloeiro='')
 
 
 class LeiloesBRScraper(BaseScraper):
@@ -19,7 +47,8 @@ class LeiloesBRScraper(BaseScraper):
     def __init__(self, base_url: str = "https://leiloesbr.com.br", 
                  output_dir: str = "output", logs_dir: str = "logs", 
                  max_retries: int = 3, delay_between_requests: float = 1.0,
-                 db_session=None, session_id: int = None):
+                 db_session=None, session_id: int = None, cache=None, limitador=None, arquivo=None,
+                 limitador_extra=None):
         """
         Inicializa o scraper do LeilõesBR
         
@@ -28,9 +57,13 @@ class LeiloesBRScraper(BaseScraper):
             output_dir: Diretório para salvar arquivos de saída
             logs_dir: Diretório para salvar logs
             max_retries: Número máximo de tentativas por requisição
-            delay_between_requests: Delay entre requisições (segundos)
+            delay_between_requests: Intervalo mínimo entre requisições deste scraper (segundos)
             db_session: Sessão do banco de dados para verificar duplicatas
             session_id: ID da sessão de scraping
+            cache: Cache de respostas HTTP (CacheRespostas); padrão definido pelas variáveis de ambiente
+            limitador: Limitador de taxa por host (LimitadorPorHost); padrão: LIMITADOR_GLOBAL
+            arquivo: Arquivo das páginas de obras (ArquivoPaginas); padrão definido pela variável SCRAPER_ARQUIVO_DIR
+            limitador_extra: Limitador adicional deste scraper, reservado junto com `limitador`
         """
         super().__init__(
             base_url=base_url,
@@ -38,12 +71,17 @@ class LeiloesBRScraper(BaseScraper):
             logs_dir=logs_dir,
             max_retries=max_retries,
             delay_between_requests=delay_between_requests,
-            scraper_name="leiloes_br"
+            scraper_name="leiloes_br",
+            cache=cache,
+            limitador=limitador,
+            arquivo=arquivo,
+            limitador_extra=limitador_extra
         )
         self.db_session = db_session
         self.session_id = session_id
         self._parar_scraping = False
         self.urls_coletadas = set()
+        self.leiloes = CacheLeiloes()  # Leiloeiro e local por leilão, extraídos uma vez por execução
         
         # URLs específicas fornecidas pelo usuário
         self.url_quadros = "https://leiloesbr.com.br/busca_andamento.asp?op=1&pesquisa=quadros&ga=*&uf=*&v=126&b=0&tp=|"
@@ -87,7 +125,7 @@ class LeiloesBRScraper(BaseScraper):
         if not response:
             return 0
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = self.criar_soup(response.text)
         
         # Buscar paginação
         try:
@@ -157,8 +195,12 @@ class LeiloesBRScraper(BaseScraper):
         self.logger.warning("Não foi possível descobrir total de páginas, usando 1")
         return 1
     
-    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None):
-        """Processa uma página específica e extrai dados das obras"""
+    def processar_pagina(self, url: str, numero_pagina: int, categoria: str = None,
+                         somente_urls: Optional[List[str]] = None):
+        """
+        Processa uma página específica e extrai dados das obras
+        Com somente_urls (retomada de checkpoint), processa apenas essas URLs da página
+        """
         if self._parar_scraping:
             return
         
@@ -169,11 +211,24 @@ class LeiloesBRScraper(BaseScraper):
             self.logger.error(f"Erro ao acessar página {numero_pagina}")
             return
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = self.criar_soup(response.text)
         
         # Buscar obras na página - geralmente estão em divs com classes específicas
         obras = self._encontrar_obras_na_pagina(soup)
         
+        # Os cards não referenciam a árvore: liberá-la (e o HTML) antes das buscas das obras
+        soup.decompose()
+        del soup, response
+        
+        if somente_urls:
+            # Manter os dados do card das obras pendentes; as que saíram da listagem são buscadas só pela URL
+            por_url = {card.url: card for card in obras}
+            obras = [por_url.get(url_obra) or CardObra.da_url(url_obra) for url_obra in somente_urls]
+            self.logger.info(f"Retomando página {numero_pagina}: {len(obras)} obras pendentes")
+        
+        urls_pagina = [card.url for card in obras]
+        self.progresso['urls_pendentes'] = list(urls_pagina)
+        
         self.logger.info(f"Encontradas {len(obras)} obras na página {numero_pagina}")
         
         # Processar cada obra encontrada
@@ -187,36 +242,42 @@ class LeiloesBRScraper(BaseScraper):
         obras_processadas = 0
         obras_puladas = 0
         
-        for i, obra_data in enumerate(obras, 1):
+        for i, card in enumerate(obras, 1):
             if self._parar_scraping:
+                self.registrar_checkpoint()
                 break
             
+            # Checkpoint a cada 10 obras (persiste as obras coletadas e as URLs restantes)
+            self.progresso['urls_pendentes'] = urls_pagina[i - 1:]
+            if i > 1 and (i - 1) % 10 == 0:
+                self.registrar_checkpoint()
+            
             try:
                 # Log de progresso a cada 5 obras ou na primeira
                 if i % 5 == 0 or i == 1:
                     self.logger.info(f"  ⏳ Progresso: {i}/{total_obras} obras | Processadas: {obras_processadas} | Puladas: {obras_puladas}")
                 
                 # Verificar se já existe antes de fazer requisição (mais rápido)
-                url_obra = obra_data.get('url', '')
+                url_obra = card.url
                 if url_obra and self.obra_ja_existe(url_obra):
                     obras_puladas += 1
                     self.urls_coletadas.add(url_obra)
+                    self.desempenho.registrar_duplicada()
                     continue
                 
-                self.processar_obra_da_listagem(obra_data, numero_pagina, categoria)
+                self.processar_obra_da_listagem(card, numero_pagina, categoria)
                 obras_processadas += 1
-                
-                # Delay reduzido entre requisições (0.3s ao invés de 1s para ser mais rápido)
-                time.sleep(0.3)
             except Exception as e:
                 self.logger.error(f"  ❌ Erro ao processar obra {i}: {e}")
                 continue
         
         self.logger.info(f"✅ Página {numero_pagina} concluída: {obras_processadas} novas, {obras_puladas} puladas")
     
-    def _encontrar_obras_na_pagina(self, soup: BeautifulSoup) -> List[Dict]:
+    @cronometrar_extrator
+    def _encontrar_obras_na_pagina(self, soup: BeautifulSoup) -> List[CardObra]:
         """Encontra todas as obras na página de listagem"""
         obras = []
+        urls_encontradas = set()  # Para evitar duplicatas
         
         try:
             # Estratégia 1: Buscar por divs com classes de produto/card (mais confiável)
@@ -258,16 +319,16 @@ class LeiloesBRScraper(BaseScraper):
                 leiloeiro = self._extrair_leiloeiro_do_card(card)
                 
                 # Verificar se já foi adicionada (evitar duplicatas)
-                if href not in [o.get('url') for o in obras]:
-                    obras.append({
-                        'url': href,
-                        'titulo': titulo,
-                        'valor': valor,
-                        'imagem': imagem_url,
-                        'data_leilao': data_leilao,
-                        'leiloeiro': leiloeiro,
-                        'card_element': card
-                    })
+                if href not in urls_encontradas:
+                    urls_encontradas.add(href)
+                    obras.append(CardObra(
+                        url=href,
+                        titulo=titulo,
+                        valor=valor,
+                        imagem=imagem_url,
+                        data_leilao=data_leilao,
+                        leiloeiro=leiloeiro
+                    ))
             
             # Estratégia 2: Se não encontrou nada, buscar por links diretos
             if not obras:
@@ -293,14 +354,16 @@ class LeiloesBRScraper(BaseScraper):
                     valor = self._extrair_valor_do_card(parent_card)
                     imagem_url = self._extrair_imagem_do_card(parent_card)
                     
-                    if href not in [o.get('url') for o in obras]:
-                        obras.append({
-                            'url': href,
-                            'titulo': titulo,
-                            'valor': valor,
-                            'imagem': imagem_url,
-                            'card_element': parent_card
-                        })
+                    if href not in urls_encontradas:
+                        urls_encontradas.add(href)
+                        obras.append(CardObra(
+                            url=href,
+                            titulo=titulo,
+                            valor=valor,
+                            imagem=imagem_url,
+                            data_leilao='',
+                            leiloeiro=''
+                        ))
         
         except Exception as e:
             self.logger.error(f"Erro ao encontrar obras na página: {e}")
@@ -447,22 +510,61 @@ class LeiloesBRScraper(BaseScraper):
             pass
         return ""
     
+    def extrair_campos_pagina(self, soup: BeautifulSoup, url_final: str) -> Dict:
+        """
+        Campos da página de uma obra com os nomes das colunas de Obra
+        Mesmos extratores de processar_obra_da_listagem, sem os dados do card da listagem;
+        usado no reprocessamento de páginas arquivadas
+        """
+        titulo = self.extrair_titulo_leiloes_br(soup, 'N/A', url_final)
+        descricao = self.extrair_descricao_leiloes_br(soup, titulo)
+        leilao = self.dados_leilao(soup, url_final, url_final)
+        return {
+            'titulo': titulo,
+            'descricao': descricao,
+            'nome_artista': self.extrair_nome_artista(titulo, descricao),
+            'valor': self.extrair_valor_leiloes_br(soup, 'N/A'),
+            'lote': self.extrair_lote_leiloes_br(soup, url_final),
+            'data_inicio_leilao': self.extrair_data_inicio_leilao_leiloes_br(soup),
+            'leiloeiro': leilao.leiloeiro if leilao else self.extrair_leiloeiro_leiloes_br(soup, url_final),
+            'local': leilao.local if leilao else self.extrair_local_leiloes_br(soup, url_final)
+        }
+    
+    def dados_leilao(self, soup: BeautifulSoup, url_obra: str, url_final: str) -> Optional[DadosLeilao]:
+        """
+        Leiloeiro e local do leilão da obra: extraídos na primeira obra de cada leilão e
+        reaproveitados nas seguintes (None se o número do leilão não for encontrado)
+        """
+        numero = numero_leilao(soup, url_obra, url_final)
+        if not numero:
+            return None
+        chave = chave_leilao(url_final, numero)
+        
+        leilao = self.leiloes.obter(chave)
+        if leilao is None:
+            CACHE_LEILOES.inc(scraper=self.scraper_name, resultado="falha")
+            leilao = DadosLeilao(chave, normalizar_host(url_final), numero,
+                                 leiloeiro=self.extrair_leiloeiro_leiloes_br(soup, url_final),
+                                 local=self.extrair_local_leiloes_br(soup, url_final))
+            self.leiloes.guardar(leilao)
+            return leilao
+        
+        CACHE_LEILOES.inc(scraper=self.scraper_name, resultado="acerto")
+        # Campo não encontrado na primeira obra: tentar de novo nesta
+        if leilao.leiloeiro == "N/A":
+            leilao.leiloeiro = self.extrair_leiloeiro_leiloes_br(soup, url_final)
+        if leilao.local == "N/A":
+            leilao.local = self.extrair_local_leiloes_br(soup, url_final)
+        return leilao
+    
     def processar_obra(self, url_obra: str, numero_pagina: int, categoria: str = None):
         """Processa uma obra específica e extrai seus dados (método abstrato requerido)"""
         # Wrapper para processar_obra_da_listagem
-        obra_data = {
-            'url': url_obra,
-            'titulo': 'N/A',
-            'valor': 'N/A',
-            'imagem': '',
-            'data_leilao': '',
-            'leiloeiro': ''
-        }
-        self.processar_obra_da_listagem(obra_data, numero_pagina, categoria)
+        self.processar_obra_da_listagem(CardObra.da_url(url_obra), numero_pagina, categoria)
     
-    def processar_obra_da_listagem(self, obra_data: Dict, numero_pagina: int, categoria: str):
+    def processar_obra_da_listagem(self, card: CardObra, numero_pagina: int, categoria: str):
         """Processa uma obra encontrada na listagem"""
-        url_obra = obra_data.get('url', '')
+        url_obra = card.url
         if not url_obra:
             return
         
@@ -475,6 +577,7 @@ class LeiloesBRScraper(BaseScraper):
         if self.obra_ja_existe(url_obra):
             self.logger.info(f"    ⊘ Obra já existe no banco (pulando): {url_obra}")
             self.urls_coletadas.add(url_obra)  # Adicionar ao cache para não verificar novamente
+            self.desempenho.registrar_duplicada()
             return
         
         # Fazer requisição para a página da obra (pode redirecionar)
@@ -482,15 +585,16 @@ class LeiloesBRScraper(BaseScraper):
         if not response:
             return
         
+        self.arquivar_pagina(url_obra, response)
         url_final = response.url
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = self.criar_soup(response.text)
         
         # Extrair dados da página da obra
         # Usar dados do card como fallback se disponíveis
-        titulo_card = obra_data.get('titulo', 'N/A')
-        valor_card = obra_data.get('valor', 'N/A')
+        titulo_card = card.titulo
+        valor_card = card.valor
         
-        titulo = self.extrair_titulo_leiloes_br(soup, titulo_card)
+        titulo = self.extrair_titulo_leiloes_br(soup, titulo_card, url_final)
         descricao = self.extrair_descricao_leiloes_br(soup, titulo)
         nome_artista = self.extrair_nome_artista(titulo, descricao)
         valor = self.extrair_valor_leiloes_br(soup, valor_card)
@@ -517,16 +621,17 @@ class LeiloesBRScraper(BaseScraper):
         lote = self.extrair_lote_leiloes_br(soup, url_final)
         
         # Usar data do card se disponível, senão extrair da página
-        data_inicio_leilao = obra_data.get('data_leilao', '')
+        data_inicio_leilao = card.data_leilao
         if not data_inicio_leilao:
             data_inicio_leilao = self.extrair_data_inicio_leilao_leiloes_br(soup)
         
-        # Informações adicionais
-        leiloeiro = obra_data.get('leiloeiro', '')
+        # Informações adicionais (compartilhadas pelos lotes do mesmo leilão)
+        leilao = self.dados_leilao(soup, url_obra, url_final)
+        leiloeiro = card.leiloeiro
         if not leiloeiro or leiloeiro == '':
-            leiloeiro = self.extrair_leiloeiro_leiloes_br(soup)
+            leiloeiro = leilao.leiloeiro if leilao else self.extrair_leiloeiro_leiloes_br(soup, url_final)
         
-        local = self.extrair_local_leiloes_br(soup)
+        local = leilao.local if leilao else self.extrair_local_leiloes_br(soup, url_final)
         data_leilao = self.extrair_data_leilao_leiloes_br(soup)
         
         # Determinar categoria
@@ -544,25 +649,25 @@ class LeiloesBRScraper(BaseScraper):
         self.logger.debug(f"       Local: {local}")
         
         # Criar entrada de dados
-        dados_obra = {
-            'Nome_Artista': nome_artista,
-            'Categoria': categoria_final,
-            'Pagina': numero_pagina,
-            'Titulo': titulo,
-            'Descricao': descricao,
-            'Valor': valor,
-            'Lote': lote,
-            'Data_Inicio_Leilao': data_inicio_leilao,
-            'Data_Leilao': data_leilao,
-            'Leiloeiro': leiloeiro,
-            'Local': local,
-            'URL': url_final,
-            'URL_Original': url_obra,
-            'Site_Redirecionado': self._extrair_dominio_redirecionado(url_final) if url_final != url_obra else "N/A",
-            'Data_Coleta': time.strftime('%d/%m/%Y %H:%M:%S')
-        }
-        
-        self.dados_obras.append(dados_obra)
+        self.dados_obras.append(LoteRecord(
+            url=url_final,
+            scraper_name=self.scraper_name,
+            nome_artista=nome_artista,
+            categoria=categoria_final,
+            pagina=numero_pagina,
+            titulo=titulo,
+            descricao=descricao,
+            valor=valor,
+            lote=lote,
+            data_inicio_leilao=data_inicio_leilao,
+            data_leilao=data_leilao,
+            leiloeiro=leiloeiro,
+            local=local,
+            url_original=url_obra,
+            site_redirecionado=self._extrair_dominio_redirecionado(url_final) if url_final != url_obra else "N/A",
+            chave_leilao=leilao.chave if leilao else None,
+            data_coleta=datetime.utcnow()
+        ))
         self.urls_coletadas.add(url_obra)  # Adicionar ao cache após coletar (mesma regra do iArremate)
         self.logger.info(f"    ✓ Obra coletada ({categoria_final}): {nome_artista} - Valor: R$ {valor} | Lote: {lote} | Leiloeiro: {leiloeiro}")
     
@@ -571,14 +676,22 @@ class LeiloesBRScraper(BaseScraper):
         parsed = urlparse(url)
         return f"{parsed.scheme}://{parsed.netloc}"
     
-    def extrair_titulo_leiloes_br(self, soup: BeautifulSoup, titulo_listagem: str = "N/A") -> str:
-        """Extrai o título da obra da página individual"""
+    @cronometrar_extrator
+    def extrair_titulo_leiloes_br(self, soup: BeautifulSoup, titulo_listagem: str = "N/A", url: Optional[str] = None) -> str:
+        """Extrai o título da obra da página individual (url: página após redirecionamentos, para o perfil do host)"""
         # NÃO usar título da listagem se for "Lotes relacionados" ou similar
         if titulo_listagem and titulo_listagem != "N/A":
             # Ignorar títulos genéricos como "Lotes relacionados"
             if 'lotes relacionados' not in titulo_listagem.lower():
                 return titulo_listagem
         
+        # Seletores diretos do site do leiloeiro; a busca genérica só roda se não acharem
+        perfil = perfil_do_host(url)
+        if perfil:
+            titulo = perfil.extrair('titulo', soup)
+            if titulo:
+                return titulo
+        
         try:
             # ESTRATÉGIA 1: Buscar em div.lote-desc (Miguel Salles específico)
             # O título real está em <div class="lote-desc text-list"> <p>...</p>
@@ -669,6 +782,7 @@ class LeiloesBRScraper(BaseScraper):
             return titulo
         return "N/A"
     
+    @cronometrar_extrator
     def extrair_valor_leiloes_br(self, soup: BeautifulSoup, valor_listagem: str = "N/A") -> str:
         """Extrai o valor da obra"""
         if valor_listagem and valor_listagem != "N/A":
@@ -703,115 +817,129 @@ class LeiloesBRScraper(BaseScraper):
         
         return "N/A"
     
-    def extrair_lote_leiloes_br(self, soup: BeautifulSoup, url: str) -> str:
-        """Extrai o número do lote (pode estar no site redirecionado)"""
-        lote = "N/A"
-        
-        try:
-            # Estratégia 1: Buscar em breadcrumbs (mais confiável em sites redirecionados)
-            # Exemplo: "HOME > LISTA DE CATÁLOGOS > LEILÃO 55780 > CATÁLOGO DE PEÇAS > LOTE 20"
-            breadcrumbs = soup.find_all(['div', 'nav', 'section'], 
-                                      class_=lambda x: x and any(
-                                          keyword in str(x).lower() 
-                                          for keyword in ['breadcrumb', 'navegacao', 'navigation']
-                                      ))
-            for breadcrumb in breadcrumbs:
-                texto = breadcrumb.get_text()
-                match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
-                if match:
-                    lote = match.group(1)
-                    return lote
-            
-            # Estratégia 2: Buscar no título (ex: "Lote 20" no título)
-            title_tag = soup.find('title')
-            if title_tag:
-                titulo = title_tag.get_text()
-                match = re.search(r'Lote\s+(\d+)', titulo, re.IGNORECASE)
-                if match:
-                    lote = match.group(1)
-                    return lote
-            
-            # Estratégia 3: Buscar em h1, h2, h3 que contenham "Lote"
-            for tag in ['h1', 'h2', 'h3', 'h4']:
-                headings = soup.find_all(tag)
-                for heading in headings:
-                    texto = heading.get_text()
-                    match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
-                    if match:
-                        lote = match.group(1)
-                        return lote
-            
-            # Estratégia 4: Buscar por "Lote" seguido de número em qualquer texto
-            textos_lote = soup.find_all(text=re.compile(r'Lote\s+\d+|LOTE\s+\d+', re.IGNORECASE))
-            for texto in textos_lote:
-                match = re.search(r'Lote\s+(\d+)', str(texto), re.IGNORECASE)
-                if match:
-                    lote = match.group(1)
-                    return lote
-            
-            # Estratégia 5: Buscar em elementos com classe "lote" ou similar
-            lote_elements = soup.find_all(['div', 'span', 'strong', 'h1', 'h2', 'h3'], 
-                                        class_=lambda x: x and 'lote' in str(x).lower())
-            for elem in lote_elements:
-                texto = elem.get_text(strip=True)
-                # Se for apenas um número, pode ser o lote
-                if re.match(r'^\d+$', texto):
-                    lote = texto
-                    return lote
-                # Ou "Lote X"
-                match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
+    # Estratégias do número do lote, na ordem fixa (da mais para a menos confiável); cada uma
+    # retorna o número ou None. A ordem efetiva é aprendida por host em _CASCATA_LOTE
+    
+    def _lote_por_breadcrumb(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Breadcrumbs (mais confiável em sites redirecionados)"""
+        # Exemplo: "HOME > LISTA DE CATÁLOGOS > LEILÃO 55780 > CATÁLOGO DE PEÇAS > LOTE 20"
+        breadcrumbs = soup.find_all(['div', 'nav', 'section'], 
+                                  class_=lambda x: x and any(
+                                      keyword in str(x).lower() 
+                                      for keyword in ['breadcrumb', 'navegacao', 'navigation']
+                                  ))
+        for breadcrumb in breadcrumbs:
+            texto = breadcrumb.get_text()
+            match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    def _lote_por_titulo(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Título da página (ex: "Lote 20" no título)"""
+        title_tag = soup.find('title')
+        if title_tag:
+            match = re.search(r'Lote\s+(\d+)', title_tag.get_text(), re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    def _lote_por_cabecalho(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """h1, h2, h3, h4 que contenham "Lote" """
+        for tag in ['h1', 'h2', 'h3', 'h4']:
+            headings = soup.find_all(tag)
+            for heading in headings:
+                match = re.search(r'Lote\s+(\d+)', heading.get_text(), re.IGNORECASE)
                 if match:
-                    lote = match.group(1)
-                    return lote
-            
-            # Estratégia 6: Buscar em tabelas (comum em sites de leilão)
-            tabelas = soup.find_all('table')
-            for tabela in tabelas:
-                linhas = tabela.find_all('tr')
-                for linha in linhas:
-                    texto_linha = linha.get_text()
-                    if re.search(r'lote', texto_linha, re.IGNORECASE):
-                        tds = linha.find_all('td')
-                        if len(tds) >= 2:
-                            # O segundo td geralmente tem o número do lote
-                            texto_td = tds[1].get_text(strip=True)
-                            match = re.search(r'(\d+)', texto_td)
-                            if match:
-                                lote = match.group(1)
-                                return lote
-                        # Ou buscar "Lote X" na linha
-                        match = re.search(r'Lote\s+(\d+)', texto_linha, re.IGNORECASE)
+                    return match.group(1)
+        return None
+    
+    def _lote_por_texto(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """"Lote" seguido de número em qualquer nó de texto"""
+        textos_lote = soup.find_all(text=re.compile(r'Lote\s+\d+|LOTE\s+\d+', re.IGNORECASE))
+        for texto in textos_lote:
+            match = re.search(r'Lote\s+(\d+)', str(texto), re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    def _lote_por_classe(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Elementos com classe "lote" ou similar"""
+        lote_elements = soup.find_all(['div', 'span', 'strong', 'h1', 'h2', 'h3'], 
+                                    class_=lambda x: x and 'lote' in str(x).lower())
+        for elem in lote_elements:
+            texto = elem.get_text(strip=True)
+            # Se for apenas um número, pode ser o lote
+            if re.match(r'^\d+$', texto):
+                return texto
+            # Ou "Lote X"
+            match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    def _lote_por_tabela(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Tabelas (comum em sites de leilão)"""
+        tabelas = soup.find_all('table')
+        for tabela in tabelas:
+            linhas = tabela.find_all('tr')
+            for linha in linhas:
+                texto_linha = linha.get_text()
+                if re.search(r'lote', texto_linha, re.IGNORECASE):
+                    tds = linha.find_all('td')
+                    if len(tds) >= 2:
+                        # O segundo td geralmente tem o número do lote
+                        match = re.search(r'(\d+)', tds[1].get_text(strip=True))
                         if match:
-                            lote = match.group(1)
-                            return lote
-            
-            # Estratégia 7: Buscar padrão "Lote X" no texto completo da página
-            texto_completo = soup.get_text()
-            matches = list(re.finditer(r'Lote\s+(\d+)', texto_completo, re.IGNORECASE))
-            if matches:
-                # Pegar o primeiro match (geralmente é o lote da obra)
-                lote = matches[0].group(1)
+                            return match.group(1)
+                    # Ou buscar "Lote X" na linha
+                    match = re.search(r'Lote\s+(\d+)', texto_linha, re.IGNORECASE)
+                    if match:
+                        return match.group(1)
+        return None
+    
+    def _lote_por_texto_completo(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Padrão "Lote X" no texto completo da página (o primeiro geralmente é o lote da obra)"""
+        match = re.search(r'Lote\s+(\d+)', soup.get_text(), re.IGNORECASE)
+        return match.group(1) if match else None
+    
+    def _lote_por_numero_proximo(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """Números isolados em elementos cujo pai menciona "lote" (contexto de leilão)"""
+        elementos_com_lote = soup.find_all(['div', 'span', 'p', 'td'], 
+                                          string=re.compile(r'\d+', re.IGNORECASE))
+        for elem in elementos_com_lote:
+            parent = elem.parent
+            if parent:
+                if re.search(r'lote', parent.get_text(), re.IGNORECASE):
+                    numero = elem.get_text(strip=True)
+                    if re.match(r'^\d+$', numero) and 1 <= int(numero) <= 10000:
+                        return numero
+        return None
+    
+    _CASCATA_LOTE = CascataEstrategias('lote', [
+        ('breadcrumb', _lote_por_breadcrumb),
+        ('titulo', _lote_por_titulo),
+        ('cabecalho', _lote_por_cabecalho),
+        ('texto', _lote_por_texto),
+        ('classe', _lote_por_classe),
+        ('tabela', _lote_por_tabela),
+        ('texto_completo', _lote_por_texto_completo),
+        ('numero_proximo', _lote_por_numero_proximo),
+    ])
+    
+    @cronometrar_extrator
+    def extrair_lote_leiloes_br(self, soup: BeautifulSoup, url: str) -> str:
+        """Extrai o número do lote (pode estar no site redirecionado)"""
+        perfil = perfil_do_host(url)
+        if perfil:
+            lote = perfil.extrair('lote', soup)
+            if lote:
                 return lote
-            
-            # Estratégia 8: Buscar apenas números que podem ser lote (em contexto de leilão)
-            # Buscar em elementos que contenham "lote" no texto próximo
-            elementos_com_lote = soup.find_all(['div', 'span', 'p', 'td'], 
-                                              string=re.compile(r'\d+', re.IGNORECASE))
-            for elem in elementos_com_lote:
-                parent = elem.parent
-                if parent:
-                    texto_parent = parent.get_text()
-                    if re.search(r'lote', texto_parent, re.IGNORECASE):
-                        numero = elem.get_text(strip=True)
-                        if re.match(r'^\d+$', numero) and 1 <= int(numero) <= 10000:
-                            lote = numero
-                            return lote
-        
-        except Exception as e:
-            self.logger.debug(f"Erro ao extrair lote: {e}")
         
-        return lote if lote != "N/A" else "N/A"
+        lote = self._CASCATA_LOTE.executar(normalizar_host(url), self, soup, url)
+        return lote if lote is not None else "N/A"
     
+    @cronometrar_extrator
     def extrair_data_inicio_leilao_leiloes_br(self, soup: BeautifulSoup) -> str:
         """Extrai a data/hora de início do leilão - melhorado"""
         data_inicio = "nao tem"
@@ -887,6 +1015,7 @@ class LeiloesBRScraper(BaseScraper):
         
         return data_inicio if data_inicio != "nao tem" else "nao tem"
     
+    @cronometrar_extrator
     def extrair_data_leilao_leiloes_br(self, soup: BeautifulSoup) -> str:
         """Extrai a data do leilão (formato simples) - melhorado"""
         try:
@@ -925,8 +1054,15 @@ class LeiloesBRScraper(BaseScraper):
             self.logger.debug(f"Erro ao extrair data do leilão: {e}")
         return "N/A"
     
-    def extrair_leiloeiro_leiloes_br(self, soup: BeautifulSoup) -> str:
-        """Extrai o nome do leiloeiro - melhorado"""
+    @cronometrar_extrator
+    def extrair_leiloeiro_leiloes_br(self, soup: BeautifulSoup, url: Optional[str] = None) -> str:
+        """Extrai o nome do leiloeiro - melhorado (url: página após redirecionamentos, para o perfil do host)"""
+        perfil = perfil_do_host(url)
+        if perfil:
+            leiloeiro = perfil.extrair('leiloeiro', soup)
+            if leiloeiro:
+                return leiloeiro
+        
         try:
             # Estratégia 1: Buscar em elementos com classes específicas
             leiloeiro_elements = soup.find_all(['div', 'span', 'td', 'p'], 
@@ -987,10 +1123,20 @@ class LeiloesBRScraper(BaseScraper):
                                 return nome
         except Exception as e:
             self.logger.debug(f"Erro ao extrair leiloeiro: {e}")
+        # Site de um único leiloeiro: o nome vem do perfil quando a página não informa
+        if perfil and perfil.nome_leiloeiro:
+            return perfil.nome_leiloeiro
         return "N/A"
     
-    def extrair_local_leiloes_br(self, soup: BeautifulSoup) -> str:
-        """Extrai o local do leilão - melhorado"""
+    @cronometrar_extrator
+    def extrair_local_leiloes_br(self, soup: BeautifulSoup, url: Optional[str] = None) -> str:
+        """Extrai o local do leilão - melhorado (url: página após redirecionamentos, para o perfil do host)"""
+        perfil = perfil_do_host(url)
+        if perfil:
+            local = perfil.extrair('local', soup)
+            if local:
+                return local
+        
         try:
             # Estratégia 1: Buscar em elementos com classes específicas
             local_elements = soup.find_all(['div', 'span', 'td', 'p'], 
@@ -1062,8 +1208,12 @@ class LeiloesBRScraper(BaseScraper):
             self.logger.debug(f"Erro ao extrair local: {e}")
         return "N/A"
     
-    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None):
-        """Executa o scraping completo para quadros e esculturas"""
+    def executar_scraping(self, categorias: List[str] = None, max_paginas: int = None,
+                          retomar_de: Optional[Dict] = None):
+        """
+        Executa o scraping completo para quadros e esculturas
+        Com retomar_de (checkpoint), pula as categorias/páginas já concluídas
+        """
         self.logger.info("=== INICIANDO SCRAPING DO LEILÕESBR ===")
         self.logger.info(f"URL Base: {self.base_url}")
         self._parar_scraping = False
@@ -1074,12 +1224,19 @@ class LeiloesBRScraper(BaseScraper):
         
         self.logger.info(f"Categorias a coletar: {', '.join(categorias)}")
         
+        indice_inicial, pagina_inicial, total_checkpoint, urls_pendentes = self.ponto_de_retomada(categorias, retomar_de)
+        if retomar_de:
+            self.logger.info(f"♻️ Retomando de {categorias[indice_inicial]}, página {pagina_inicial}")
+        
         total_obras_coletadas = 0
         
         # Processar cada categoria
-        for categoria in categorias:
+        for indice, categoria in enumerate(categorias):
             if self._parar_scraping:
                 break
+            if indice < indice_inicial:
+                continue
+            retomando = bool(retomar_de) and indice == indice_inicial
             
             if categoria.lower() not in ["quadros", "esculturas"]:
                 self.logger.warning(f"Categoria inválida ignorada: {categoria}")
@@ -1096,7 +1253,10 @@ class LeiloesBRScraper(BaseScraper):
                 url_categoria = self.url_esculturas
             
             # Descobrir total de páginas
-            if max_paginas is None:
+            if retomando and total_checkpoint:
+                total_paginas = total_checkpoint
+                self.logger.info(f"Usando total de {total_paginas} páginas do checkpoint para {categoria}")
+            elif max_paginas is None:
                 total_paginas = self.descobrir_total_paginas(categoria=categoria)
             else:
                 total_paginas = max_paginas
@@ -1106,10 +1266,18 @@ class LeiloesBRScraper(BaseScraper):
                 self.logger.warning(f"Nenhuma página encontrada para {categoria}!")
                 continue
             
+            primeira_pagina = pagina_inicial if retomando else 1
+            self.registrar_checkpoint(
+                categoria=categoria,
+                ultima_pagina=primeira_pagina - 1,
+                total_paginas=total_paginas,
+                urls_pendentes=urls_pendentes if retomando else []
+            )
+            
             self.logger.info(f"Iniciando coleta de {total_paginas} páginas de {categoria}...")
             
             # Processar cada página
-            for pagina in range(1, total_paginas + 1):
+            for pagina in range(primeira_pagina, total_paginas + 1):
                 if self._parar_scraping:
                     self.logger.warning(f"⚠️ Scraping interrompido pelo usuário na página {pagina} de {categoria}")
                     break
@@ -1134,7 +1302,12 @@ class LeiloesBRScraper(BaseScraper):
                         else:
                             url = f"{url_categoria}?pagina={pagina}"
                 
-                self.processar_pagina(url, pagina, categoria=categoria)
+                somente_urls = urls_pendentes if retomando and pagina == primeira_pagina else None
+                self.processar_pagina(url, pagina, categoria=categoria, somente_urls=somente_urls)
+                
+                # Página concluída (se interrompida no meio, o checkpoint mantém as URLs pendentes)
+                if not self._parar_scraping:
+                    self.registrar_checkpoint(ultima_pagina=pagina, urls_pendentes=[])
                 
                 # Log de progresso
                 if pagina % 5 == 0:
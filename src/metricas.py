@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Métricas de desempenho em memória (contadores, medidores e histogramas) no formato de texto
+do Prometheus, expostas pela API em /api/v1/metrics
+
+As métricas são globais ao processo: scrapers executados pela API, monitores e jobs do
+scheduler (start_api_com_scheduler.py) aparecem no mesmo endpoint
+"""
+
+import time
+import bisect
+import functools
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Limites dos histogramas de duração (segundos)
+BUCKETS_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets das latências de uma sessão (DesempenhoSessao): progressão de 25% de 1 ms a ~1 min,
+# finos o bastante para o p95 do relatório
+BUCKETS_LATENCIA_SESSAO = tuple(round(0.001 * 1.25 ** expoente, 6) for expoente in range(50))
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class _Metrica(ABC):
+    """Base das métricas: valores indexados pelos rótulos (na ordem de `rotulos`)"""
+    
+    tipo = "untyped"
+    
+    def __init__(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+    
+    def _chave(self, rotulos: Dict) -> Tuple[str, ...]:
+        return tuple(str(rotulos.get(nome, '')) for nome in self.rotulos)
+    
+    def _formatar_rotulos(self, chave: Tuple[str, ...], extras: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pares = list(zip(self.rotulos, chave)) + list(extras)
+        if not pares:
+            return ''
+        return '{' + ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + '}'
+    
+    @abstractmethod
+    def linhas(self) -> List[str]:
+        """Linhas de amostras no formato do Prometheus (sem HELP/TYPE)"""
+        pass
+    
+    def renderizar(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"] + self.linhas()
+
+
+class Contador(_Metrica):
+    """Valor que só aumenta (requisições, bytes, erros...)"""
+    
+    tipo = "counter"
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+    
+    def valor(self, **rotulos) -> float:
+        return self._valores.get(self._chave(rotulos), 0)
+    
+    def linhas(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return [f"{self.nome}{self._formatar_rotulos(chave)} {_formatar_numero(valor)}" for chave, valor in itens]
+
+
+class Medidor(_Metrica):
+    """Valor que sobe e desce (profundidade de filas, monitores ativos...)"""
+    
+    tipo = "gauge"
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self._funcoes: Dict[Tuple[str, ...], Callable[[], float]] = {}
+    
+    def definir(self, valor: float, **rotulos):
+        with self._lock:
+            self._valores[self._chave(rotulos)] = valor
+    
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+    
+    def dec(self, valor: float = 1, **rotulos):
+        self.inc(-valor, **rotulos)
+    
+    def definir_funcao(self, funcao: Callable[[], float], **rotulos):
+        """Valor calculado na hora da leitura (ex.: len de uma fila)"""
+        with self._lock:
+            self._funcoes[self._chave(rotulos)] = funcao
+    
+    def linhas(self) -> List[str]:
+        with self._lock:
+            valores = dict(self._valores)
+            funcoes = dict(self._funcoes)
+        for chave, funcao in funcoes.items():
+            try:
+                valores[chave] = funcao()
+            except Exception:
+                continue
+        return [f"{self.nome}{self._formatar_rotulos(chave)} {_formatar_numero(valor)}" for chave, valor in sorted(valores.items())]
+
+
+class Histograma(_Metrica):
+    """Distribuição de valores (latências) em buckets cumulativos, com soma e contagem"""
+    
+    tipo = "histogram"
+    
+    def __init__(self, nome: str, ajuda: str, rotulos: Iterable[str] = (), buckets: Iterable[float] = BUCKETS_DURACAO):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._contagens: Dict[Tuple[str, ...], List[int]] = {}
+        self._somas: Dict[Tuple[str, ...], float] = {}
+    
+    def observar(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            contagens = self._contagens.setdefault(chave, [0] * len(self.buckets))
+            contagens[bisect.bisect_left(self.buckets, valor)] += 1
+            self._somas[chave] = self._somas.get(chave, 0.0) + valor
+    
+    @contextmanager
+    def cronometrar(self, **rotulos):
+        """Observa a duração do bloco (em segundos)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **rotulos)
+    
+    def contagem(self, **rotulos) -> int:
+        return sum(self._contagens.get(self._chave(rotulos), ()))
+    
+    def soma(self, **rotulos) -> float:
+        return self._somas.get(self._chave(rotulos), 0.0)
+    
+    def percentil(self, p: float, **rotulos) -> Optional[float]:
+        """Percentil estimado pelos buckets (interpolação linear dentro do bucket, como histogram_quantile)"""
+        with self._lock:
+            contagens = list(self._contagens.get(self._chave(rotulos), ()))
+        alvo = p * sum(contagens)
+        if not alvo:
+            return None
+        acumulado = 0
+        for indice, contagem in enumerate(contagens):
+            if contagem and acumulado + contagem >= alvo:
+                inferior = self.buckets[indice - 1] if indice else 0.0
+                superior = self.buckets[indice]
+                if superior == float('inf'):
+                    return inferior
+                return inferior + (superior - inferior) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return None
+    
+    def linhas(self) -> List[str]:
+        with self._lock:
+            itens = sorted((chave, list(contagens), self._somas[chave]) for chave, contagens in self._contagens.items())
+        
+        linhas = []
+        for chave, contagens, soma in itens:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets, contagens):
+                acumulado += contagem
+                rotulos = self._formatar_rotulos(chave, (('le', _formatar_numero(limite)),))
+                linhas.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+            linhas.append(f"{self.nome}_sum{self._formatar_rotulos(chave)} {_formatar_numero(soma)}")
+            linhas.append(f"{self.nome}_count{self._formatar_rotulos(chave)} {acumulado}")
+        return linhas
+
+
+class RegistroMetricas:
+    """Conjunto de métricas do processo; renderizar() gera o texto do endpoint /metrics"""
+    
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+    
+    def _registrar(self, classe, nome: str, *args, **kwargs):
+        with self._lock:
+            if nome not in self._metricas:
+                self._metricas[nome] = classe(nome, *args, **kwargs)
+            return self._metricas[nome]
+    
+    def contador(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()) -> Contador:
+        return self._registrar(Contador, nome, ajuda, rotulos)
+    
+    def medidor(self, nome: str, ajuda: str, rotulos: Iterable[str] = ()) -> Medidor:
+        return self._registrar(Medidor, nome, ajuda, rotulos)
+    
+    def histograma(self, nome: str, ajuda: str, rotulos: Iterable[str] = (),
+                   buckets: Iterable[float] = BUCKETS_DURACAO) -> Histograma:
+        return self._registrar(Histograma, nome, ajuda, rotulos, buckets)
+    
+    def obter(self, nome: str) -> Optional[_Metrica]:
+        return self._metricas.get(nome)
+    
+    def renderizar(self) -> str:
+        with self._lock:
+            metricas = [self._metricas[nome] for nome in sorted(self._metricas)]
+        linhas = []
+        for metrica in metricas:
+            linhas.extend(metrica.renderizar())
+        return '\n'.join(linhas) + '\n'
+
+
+class DesempenhoSessao:
+    """
+    Resumo de desempenho de uma execução de scraper (gravado em ScrapingSession.relatorio_desempenho)
+    Diferente das métricas do REGISTRO, que acumulam todas as execuções do processo
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.inicio = time.perf_counter()
+        self.requisicoes = 0
+        self.falhas = 0
+        self.retentativas = 0
+        self.acertos_cache = 0
+        self.bytes_recebidos = 0
+        # Histograma de buckets fixos: memória constante e resumo() sem ordenar as latências
+        # (chamado a cada checkpoint durante a coleta)
+        self.latencias = Histograma("sessao_latencia_segundos", "Latencia das requisicoes da sessao",
+                                    buckets=BUCKETS_LATENCIA_SESSAO)
+        self.parse_s = 0.0
+        self.parses = 0
+        self.espera_s = 0.0
+        self.duplicadas_puladas = 0
+    
+    def registrar_requisicao(self, duracao: float, tamanho: int = 0, falha: bool = False):
+        with self._lock:
+            self.requisicoes += 1
+            self.latencias.observar(duracao)
+            self.bytes_recebidos += tamanho
+            if falha:
+                self.falhas += 1
+    
+    def registrar_retentativa(self):
+        with self._lock:
+            self.retentativas += 1
+    
+    def registrar_acerto_cache(self):
+        with self._lock:
+            self.acertos_cache += 1
+    
+    def registrar_parse(self, duracao: float):
+        with self._lock:
+            self.parse_s += duracao
+            self.parses += 1
+    
+    def registrar_espera(self, segundos: float):
+        with self._lock:
+            self.espera_s += segundos
+    
+    def registrar_duplicada(self):
+        with self._lock:
+            self.duplicadas_puladas += 1
+    
+    def resumo(self, obras_coletadas: int = 0, duplicadas_no_banco: int = 0) -> Dict:
+        """Resumo serializável em JSON (tempos em segundos, exceto latências em ms)"""
+        with self._lock:
+            duracao = time.perf_counter() - self.inicio
+            medidas = self.latencias.contagem()
+            p95 = self.latencias.percentil(0.95)
+            
+            return {
+                "duracao_s": round(duracao, 1),
+                "requisicoes": self.requisicoes,
+                "requisicoes_com_falha": self.falhas,
+                "retentativas": self.retentativas,
+                "acertos_cache": self.acertos_cache,
+                "bytes_recebidos": self.bytes_recebidos,
+                "latencia_media_ms": round(self.latencias.soma() / medidas * 1000, 1) if medidas else None,
+                "latencia_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "parse_s": round(self.parse_s, 2),
+                "parse_medio_ms": round(self.parse_s / self.parses * 1000, 1) if self.parses else None,
+                "espera_s": round(self.espera_s, 1),
+                "obras_coletadas": obras_coletadas,
+                "duplicadas_puladas": self.duplicadas_puladas + duplicadas_no_banco,
+                "lotes_por_minuto": round(obras_coletadas / (duracao / 60), 2) if duracao > 0 else None
+            }
+
+
+REGISTRO = RegistroMetricas()
+
+# Requisições HTTP dos scrapers
+REQUISICOES_HTTP = REGISTRO.contador(
+    "scrapers_requisicoes_http_total", "Requisicoes HTTP feitas pelos scrapers", ("scraper", "host", "status"))
+REQUISICAO_HTTP_SEGUNDOS = REGISTRO.histograma(
+    "scrapers_requisicao_http_segundos", "Latencia das requisicoes HTTP por host", ("scraper", "host"))
+RETENTATIVAS_HTTP = REGISTRO.contador(
+    "scrapers_retentativas_http_total", "Novas tentativas de requisicoes HTTP que falharam", ("scraper", "host"))
+BYTES_RECEBIDOS = REGISTRO.contador(
+    "scrapers_bytes_recebidos_total", "Bytes recebidos nas respostas HTTP", ("scraper", "host"))
+CACHE_HTTP = REGISTRO.contador(
+    "scrapers_cache_http_total", "Consultas ao cache HTTP por resultado (acerto/falha)", ("scraper", "resultado"))
+CACHE_LEILOES = REGISTRO.contador(
+    "scrapers_cache_leiloes_total", "Dados de leilao reaproveitados (acerto) ou extraidos (falha) por lote", ("scraper", "resultado"))
+DISJUNTOR_ABERTURAS = REGISTRO.contador(
+    "scrapers_disjuntor_aberturas_total", "Vezes que o disjuntor pausou um site por falhas consecutivas", ("host",))
+LIMITADOR_ESPERA = REGISTRO.contador(
+    "scrapers_limitador_espera_segundos_total", "Tempo de espera imposto pelo limitador de taxa por host", ("host",))
+
+# Parse e extração
+PARSE_SEGUNDOS = REGISTRO.histograma(
+    "scrapers_parse_segundos", "Tempo de parse do HTML (BeautifulSoup)", ("scraper",))
+EXTRATOR_SEGUNDOS = REGISTRO.histograma(
+    "scrapers_extrator_segundos", "Tempo de cada extrator de campos", ("scraper", "extrator"))
+ESTRATEGIAS_EXTRACAO = REGISTRO.contador(
+    "scrapers_estrategia_extracao_total", "Campos extraidos por estrategia da cascata (modo: exploracao/aprendida/fixa)",
+    ("campo", "host", "estrategia", "modo"))
+ESTRATEGIA_CONCORDANCIA = REGISTRO.medidor(
+    "scrapers_estrategia_concordancia", "Fracao das amostras de exploracao em que a estrategia concorda com a ordem fixa",
+    ("campo", "host", "estrategia"))
+PERFIS_HOST = REGISTRO.contador(
+    "scrapers_perfil_host_total", "Campos buscados pelos seletores do perfil do host (acerto/falha)",
+    ("host", "campo", "resultado"))
+
+# Banco de dados
+BANCO_ESCRITA_SEGUNDOS = REGISTRO.histograma(
+    "scrapers_banco_escrita_segundos", "Latencia das gravacoes no banco (incluindo commit)", ("operacao",))
+
+# Filas e monitores
+FILA_PROFUNDIDADE = REGISTRO.medidor(
+    "scrapers_fila_profundidade", "Itens aguardando nas filas de trabalho", ("fila",))
+MONITOR_VERIFICACOES = REGISTRO.contador(
+    "scrapers_monitor_verificacoes_total", "Verificacoes de valor feitas pelos monitores", ("monitor", "resultado"))
+
+# API
+API_REQUISICOES = REGISTRO.contador(
+    "scrapers_api_requisicoes_total", "Requisicoes atendidas pela API", ("metodo", "rota", "status"))
+API_REQUISICAO_SEGUNDOS = REGISTRO.histograma(
+    "scrapers_api_requisicao_segundos", "Latencia das requisicoes da API", ("metodo", "rota"))
+
+
+def cronometrar_extrator(funcao):
+    """Decorator para métodos de extração: observa a duração em EXTRATOR_SEGUNDOS"""
+    @functools.wraps(funcao)
+    def medida(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcao(self, *args, **kwargs)
+        finally:
+            EXTRATOR_SEGUNDOS.observar(
+                time.perf_counter() - inicio,
+                scraper=getattr(self, 'scraper_name', type(self).__name__),
+                extrator=funcao.__name__
+            )
+    return medida
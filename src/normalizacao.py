@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalização de nomes de artistas para o índice de artistas do banco
+O nome_artista vem das heurísticas de extrair_nome_artista, com grafias e caixas diferentes
+para o mesmo artista ("DI CAVALCANTI", "Di Cavalcanti", "di cavalcanti."); chave_artista
+reduz o nome a uma chave sem acentos, caixa ou pontuação, usada na tabela artistas
+
+As funções de nome usam lru_cache: os mesmos artistas se repetem em muitos lotes
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+
+# Valores que os scrapers gravam quando não encontram o artista
+VALORES_SEM_ARTISTA = frozenset({'', 'n/a', 'na', 'nao tem', 'não tem', 'desconhecido', 'sem autoria'})
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+_ESPACOS = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=8192)
+def chave_artista(nome: Optional[str]) -> Optional[str]:
+    """Chave normalizada do artista: sem acentos, minúscula, só letras/números e espaços simples"""
+    if not nome or nome.strip().lower() in VALORES_SEM_ARTISTA:
+        return None
+    sem_acentos = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode('ascii')
+    chave = _NAO_ALFANUMERICO.sub(' ', sem_acentos.lower()).strip()
+    return chave[:255] or None
+
+
+@lru_cache(maxsize=8192)
+def limpar_nome_artista(nome: str) -> str:
+    """Grafia do nome sem espaços repetidos nem pontuação nas pontas (nome exibido do artista)"""
+    return _ESPACOS.sub(' ', nome).strip(' .,;:-–')[:255]
+
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfis de extração por host para os sites de leiloeiros para onde o LeilõesBR redireciona
+Cada perfil tem seletores CSS diretos para título, lote, leiloeiro e local; os extratores do
+LeiloesBRScraper tentam o perfil do host primeiro e só executam a busca genérica (várias
+estratégias com find_all em toda a página) quando os seletores não acham o campo
+
+Os valores passam pelas mesmas validações e limpezas da busca genérica, então um seletor que
+deixa de casar (mudança de layout) cai na busca genérica em vez de gravar um valor errado
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .metricas import PERFIS_HOST
+from .rate_limiter import normalizar_host
+
+
+@dataclass(frozen=True)
+class PerfilHost:
+    """Seletores CSS de um host, tentados em ordem para cada campo"""
+    host: str
+    nome_leiloeiro: Optional[str] = None  # Leiloeiro do site quando a página não informa
+    titulo: Tuple[str, ...] = field(default_factory=tuple)
+    lote: Tuple[str, ...] = field(default_factory=tuple)
+    leiloeiro: Tuple[str, ...] = field(default_factory=tuple)
+    local: Tuple[str, ...] = field(default_factory=tuple)
+    
+    def extrair(self, campo: str, soup: BeautifulSoup) -> Optional[str]:
+        """Valor do campo pelos seletores do perfil (None se nenhum seletor achar um valor válido)"""
+        seletores = getattr(self, campo)
+        if not seletores:
+            return None
+        limpar = _LIMPEZA[campo]
+        for seletor in seletores:
+            elemento = soup.select_one(seletor)
+            if elemento is None:
+                continue
+            valor = limpar(elemento)
+            if valor:
+                PERFIS_HOST.inc(host=self.host, campo=campo, resultado="acerto")
+                return valor
+        PERFIS_HOST.inc(host=self.host, campo=campo, resultado="falha")
+        return None
+
+
+# Limpeza e validação por campo: mesmas regras das estratégias genéricas do LeiloesBRScraper
+
+def _limpar_titulo(elemento) -> Optional[str]:
+    titulo = elemento.get_text(strip=True)
+    if (titulo and len(titulo) > 20 and
+        'lotes relacionados' not in titulo.lower() and
+        not titulo.lower().startswith('lote') and
+        not re.match(r'^[\d\sR$.,:LoteVisitasLance]+$', titulo, re.IGNORECASE)):
+        return titulo
+    return None
+
+
+def _limpar_lote(elemento) -> Optional[str]:
+    texto = elemento.get_text()
+    match = re.search(r'Lote\s+(\d+)', texto, re.IGNORECASE)
+    if match:
+        return match.group(1)
+    texto = texto.strip()
+    return texto if re.match(r'^\d+$', texto) else None
+
+
+def _limpar_leiloeiro(elemento) -> Optional[str]:
+    texto = re.sub(r'^(?:Leiloeiro|Leiloeira|Escritório)[:\s]+', '', elemento.get_text(strip=True), flags=re.IGNORECASE)
+    texto = texto.strip()
+    return texto if 3 < len(texto) < 100 else None
+
+
+def _limpar_local(elemento) -> Optional[str]:
+    texto = re.sub(r'^(?:Local|LOCAL|Cidade|Endereço)[:\s]+', '', elemento.get_text(strip=True), flags=re.IGNORECASE)
+    texto = texto.strip()
+    return texto if 3 < len(texto) < 100 else None
+
+
+_LIMPEZA: Dict[str, Callable] = {
+    'titulo': _limpar_titulo,
+    'lote': _limpar_lote,
+    'leiloeiro': _limpar_leiloeiro,
+    'local': _limpar_local,
+}
+
+
+# Miguel Salles e Roberto Haddad usam a mesma plataforma de catálogo (catalogo.asp / peca.asp):
+# descrição em div.lote-desc (ou div.is-pecadesc), "LOTE N" no breadcrumb
+_SELETORES_CATALOGO_ASP = dict(
+    titulo=('div.lote-desc p', 'div.lote-desc', 'div.is-pecadesc'),
+    lote=('div.breadcrumb', 'div.nlote'),
+    leiloeiro=('div.dados-leiloeiro', '.leiloeiro'),
+    local=('div.local', '.endereco'),
+)
+
+PERFIS_HOSTS: Dict[str, PerfilHost] = {
+    'miguelsalles.com.br': PerfilHost(host='miguelsalles.com.br', nome_leiloeiro='Miguel Salles', **_SELETORES_CATALOGO_ASP),
+    'robertohaddad.lel.br': PerfilHost(host='robertohaddad.lel.br', nome_leiloeiro='Roberto Haddad', **_SELETORES_CATALOGO_ASP),
+}
+
+
+def perfil_do_host(url_ou_host: Optional[str]) -> Optional[PerfilHost]:
+    """Perfil do host da URL (None se não houver perfil ou a URL não for informada)"""
+    if not url_ou_host:
+        return None
+    return PERFIS_HOSTS.get(normalizar_host(url_ou_host))
+
+
+def registrar_perfil(perfil: PerfilHost):
+    """Adiciona (ou substitui) o perfil de um host"""
+    PERFIS_HOSTS[normalizar_host(perfil.host)] = perfil
@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estágio de extração em processos separados, desacoplado da busca das páginas
+O parse (BeautifulSoup) e as cascatas de extração são Python puro e seguram o GIL: com mais
+threads buscando páginas, o parse vira o gargalo. PipelineExtracao envia os bytes do HTML das
+páginas de obras para um ProcessPoolExecutor, que faz o parse e roda os extratores
+(extrair_dados_obra_iarremate / extrair_dados_obra_leiloes_br) e devolve dicionários simples;
+a vazão da extração passa a crescer com o número de núcleos
+
+Configuração por variáveis de ambiente (usadas quando nenhum número de processos é passado):
+    SCRAPER_PROCESSOS_EXTRACAO  Processos de extração (padrão: número de núcleos, ou 0 com um núcleo;
+                                0 = na própria thread, sem processos)
+"""
+
+import os
+import re
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+from .iarremate_scraper import IArremateScraper
+from .leiloes_br_scraper import LeiloesBRScraper
+from .metricas import cronometrar_extrator
+from .perfis_hosts import perfil_do_host
+
+
+class ExtratorPaginaObra:
+    """
+    Extração dos dados de uma página de obra já baixada (sem rede e sem banco), usada pelo
+    ExtratorObrasEspecificas e pelos processos de PipelineExtracao
+    """
+    
+    def __init__(self, scraper_iarremate: IArremateScraper = None, scraper_leiloes_br: LeiloesBRScraper = None):
+        self.scraper_iarremate = scraper_iarremate or IArremateScraper()
+        self.scraper_leiloes_br = scraper_leiloes_br or LeiloesBRScraper()
+    
+    def extrair_pagina(self, site: str, url: str, url_final: str, conteudo: bytes,
+                       encoding: Optional[str] = None) -> Optional[Dict]:
+        """Parse dos bytes da página e extração pelo site; None se não for quadro ou escultura"""
+        # Sem encoding no cabeçalho, o BeautifulSoup detecta pelos bytes (meta charset)
+        html = conteudo.decode(encoding, errors='replace') if encoding else conteudo
+        if site == 'iarremate':
+            return self.extrair_dados_obra_iarremate(self.scraper_iarremate.criar_soup(html), url)
+        if site == 'leiloes_br':
+            return self.extrair_dados_obra_leiloes_br(self.scraper_leiloes_br.criar_soup(html), url, url_final)
+        raise ValueError(f"Site desconhecido: {site}")
+    
+    def extrair_dados_obra_iarremate(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
+        """Extrai os dados de uma página de obra do iArremate"""
+        # Extrair dados usando métodos do scraper
+        titulo = self.scraper_iarremate.extrair_titulo_iarremate(soup)
+        descricao = self.scraper_iarremate.extrair_descricao_iarremate(soup, titulo)
+        nome_artista = self.scraper_iarremate.extrair_nome_artista(titulo, descricao)
+        valor = self.scraper_iarremate.extrair_valor_iarremate(soup)
+        # Tentar extrair valor atual (com lances) se disponível
+        valor_atual, numero_lances = self._extrair_valor_atual_com_lances(soup, valor)
+        lote = self.scraper_iarremate.extrair_lote_iarremate(soup)
+        data_inicio_leilao = self.scraper_iarremate.extrair_data_inicio_leilao_iarremate(soup)
+        
+        # Extrair data final do leilão (se disponível)
+        data_final_leilao = self._extrair_data_final_iarremate(soup)
+        
+        # Verificar se é quadro ou escultura
+        if not self._verificar_se_eh_quadro_ou_escultura(soup, titulo):
+            return None  # Ignorar se não for quadro ou escultura
+        
+        # Extrair visitas e status
+        visitas = self._extrair_visitas(soup)
+        status_lote = self._extrair_status_lote(soup)
+        
+        obra_data = {
+            'url': url,
+            'scraper': 'iarremate',
+            'titulo': titulo or 'N/A',
+            'descricao': descricao or 'N/A',
+            'nome_artista': nome_artista or 'N/A',
+            'valor': valor or 'N/A',
+            'valor_atual': valor_atual or valor or 'N/A',
+            'numero_lances': numero_lances,
+            'lote': lote or 'N/A',
+            'visitas': visitas,
+            'status_lote': status_lote,
+            'data_inicio_leilao': data_inicio_leilao or 'N/A',
+            'data_final_leilao': data_final_leilao or 'N/A',
+            'leiloeiro': 'Vitor Braga',
+            'local': 'N/A',
+            'categoria': 'Quadros',
+            'status_leilao': self._determinar_status_leilao(data_inicio_leilao, data_final_leilao)
+        }
+        
+        return obra_data
+    
+    def extrair_dados_obra_leiloes_br(self, soup: BeautifulSoup, url: str, url_final: str) -> Optional[Dict]:
+        """Extrai os dados de uma página de obra do LeilõesBR (url: link da listagem, url_final: após redirecionamentos)"""
+        # Extrair dados usando métodos do scraper
+        titulo = self.scraper_leiloes_br.extrair_titulo_leiloes_br(soup, 'N/A', url_final)
+        descricao = self.scraper_leiloes_br.extrair_descricao_leiloes_br(soup, titulo)
+        nome_artista = self.scraper_leiloes_br.extrair_nome_artista(titulo, descricao)
+        valor = self.scraper_leiloes_br.extrair_valor_leiloes_br(soup, 'N/A')
+        # Tentar extrair valor atual (com lances) se disponível
+        valor_atual, numero_lances = self._extrair_valor_atual_com_lances(soup, valor)
+        lote = self.scraper_leiloes_br.extrair_lote_leiloes_br(soup, url_final)
+        data_inicio_leilao = self.scraper_leiloes_br.extrair_data_inicio_leilao_leiloes_br(soup)
+        data_leilao = self.scraper_leiloes_br.extrair_data_leilao_leiloes_br(soup)
+        # Leiloeiro e local: uma extração por leilão (cache do scraper)
+        leilao = self.scraper_leiloes_br.dados_leilao(soup, url, url_final)
+        if leilao:
+            leiloeiro, local = leilao.leiloeiro, leilao.local
+        else:
+            leiloeiro = self.scraper_leiloes_br.extrair_leiloeiro_leiloes_br(soup, url_final)
+            local = self.scraper_leiloes_br.extrair_local_leiloes_br(soup, url_final)
+        
+        # Extrair data final do leilão (se disponível)
+        data_final_leilao = self._extrair_data_final_leiloes_br(soup)
+        
+        # Determinar leiloeiro do URL se não encontrado
+        if not leiloeiro or leiloeiro == 'N/A':
+            perfil = perfil_do_host(url)
+            if perfil and perfil.nome_leiloeiro:
+                leiloeiro = perfil.nome_leiloeiro
+        
+        # Verificar se é quadro ou escultura
+        if not self._verificar_se_eh_quadro_ou_escultura(soup, titulo):
+            return None  # Ignorar se não for quadro ou escultura
+        
+        # Extrair visitas e status
+        visitas = self._extrair_visitas(soup)
+        status_lote = self._extrair_status_lote(soup)
+        
+        obra_data = {
+            'url': url_final,
+            'url_original': url,
+            'scraper': 'leiloes_br',
+            'titulo': titulo or 'N/A',
+            'descricao': descricao or 'N/A',
+            'nome_artista': nome_artista or 'N/A',
+            'valor': valor or 'N/A',
+            'valor_atual': valor_atual or valor or 'N/A',
+            'numero_lances': numero_lances,
+            'lote': lote or 'N/A',
+            'visitas': visitas,
+            'status_lote': status_lote,
+            'data_inicio_leilao': data_inicio_leilao or data_leilao or 'N/A',
+            'data_final_leilao': data_final_leilao or 'N/A',
+            'leiloeiro': leiloeiro or 'N/A',
+            'local': local or 'N/A',
+            'chave_leilao': leilao.chave if leilao else None,
+            'categoria': 'Quadros',
+            'status_leilao': self._determinar_status_leilao(data_inicio_leilao or data_leilao, data_final_leilao)
+        }
+        
+        return obra_data
+    
+    @cronometrar_extrator
+    def _extrair_visitas(self, soup: BeautifulSoup) -> str:
+        """Extrai o número de visitas da obra"""
+        try:
+            # Estratégia 1: Buscar ícone de pessoa caminhando seguido de número
+            # (comum no Roberto Haddad)
+            # Buscar por ícones SVG ou imagens de pessoa/visita
+            visita_elements = soup.find_all(['span', 'div', 'p'], 
+                                         class_=lambda x: x and any(
+                                             keyword in str(x).lower() 
+                                             for keyword in ['visita', 'visit', 'view', 'views', 'pessoa', 'person']
+                                         ))
+            
+            for elem in visita_elements:
+                # Buscar número próximo ao elemento
+                texto = elem.get_text(strip=True)
+                match = re.search(r'(\d+)', texto)
+                if match:
+                    return match.group(1)
+                
+                # Buscar no próximo irmão ou elemento próximo
+                next_elem = elem.find_next_sibling()
+                if next_elem:
+                    texto_next = next_elem.get_text(strip=True)
+                    match = re.search(r'(\d+)', texto_next)
+                    if match:
+                        return match.group(1)
+            
+            # Estratégia 2: Buscar padrão "Visitas: 312" ou "312 Visita(s)"
+            texto_completo = soup.get_text()
+            match = re.search(r'Visitas?[:\s]*(\d+)', texto_completo, re.IGNORECASE)
+            if match:
+                return match.group(1)
+            
+            # Estratégia 3: Buscar número próximo a ícones (Roberto Haddad específico)
+            # Buscar elementos que contenham ícones de pessoa
+            icons = soup.find_all(['i', 'svg', 'img'], 
+                                class_=lambda x: x and any(
+                                    keyword in str(x).lower() 
+                                    for keyword in ['person', 'user', 'visita', 'walk', 'pessoa']
+                                ))
+            for icon in icons:
+                # Buscar número no elemento pai ou próximo
+                parent = icon.parent
+                if parent:
+                    texto = parent.get_text(strip=True)
+                    match = re.search(r'(\d+)', texto)
+                    if match:
+                        return match.group(1)
+                
+                # Buscar próximo elemento
+                next_elem = icon.find_next_sibling()
+                if next_elem:
+                    texto = next_elem.get_text(strip=True)
+                    match = re.search(r'(\d+)', texto)
+                    if match:
+                        return match.group(1)
+            
+            # Estratégia 4: Buscar em elementos com classes relacionadas
+            visita_elements = soup.find_all(['div', 'span'], 
+                                         class_=lambda x: x and any(
+                                             keyword in str(x).lower() 
+                                             for keyword in ['visita', 'visit', 'view', 'views']
+                                         ))
+            for elem in visita_elements:
+                texto = elem.get_text(strip=True)
+                match = re.search(r'(\d+)', texto)
+                if match:
+                    return match.group(1)
+        except Exception as e:
+            print(f"  ⚠️ Erro ao extrair visitas: {e}")
+        return 'N/A'
+    
+    @cronometrar_extrator
+    def _extrair_status_lote(self, soup: BeautifulSoup) -> str:
+        """Extrai o status do lote (vendido, disponível, arrematado, etc.)"""
+        try:
+            # Estratégia 1: Buscar botão "Lote vendido" (Roberto Haddad específico)
+            buttons = soup.find_all(['button', 'a', 'div'], 
+                                  class_=lambda x: x and any(
+                                      keyword in str(x).lower() 
+                                      for keyword in ['vendido', 'sold', 'lote', 'lot', 'status']
+                                  ))
+            for button in buttons:
+                texto = button.get_text(strip=True).lower()
+                if 'vendido' in texto or 'sold' in texto:
+                    return 'Vendido'
+                if 'arrematado' in texto:
+                    return 'Arrematado'
+                if 'disponível' in texto or 'disponivel' in texto:
+                    return 'Disponível'
+            
+            # Estratégia 2: Buscar por texto "Lote vendido" na página
+            texto_completo = soup.get_text().lower()
+            
+            # Buscar por status conhecidos
+            status_keywords = {
+                'vendido': ['lote vendido', 'vendido', 'sold', 'arrematado', 'adquirido'],
+                'disponível': ['disponível', 'disponivel', 'available', 'em leilão', 'em leilao'],
+                'finalizado': ['finalizado', 'encerrado', 'closed', 'terminado'],
+                'reservado': ['reservado', 'reserved']
+            }
+            
+            for status, keywords in status_keywords.items():
+                for keyword in keywords:
+                    if keyword in texto_completo:
+                        # Verificar se está próximo a "lote" ou "obra"
+                        pos = texto_completo.find(keyword)
+                        contexto = texto_completo[max(0, pos-50):pos+50]
+                        if any(palavra in contexto for palavra in ['lote', 'obra', 'peça', 'peca', 'item']):
+                            return status.capitalize()
+            
+            # Estratégia 3: Buscar em elementos específicos com classes de status
+            status_elements = soup.find_all(['div', 'span', 'strong', 'p', 'button'], 
+                                         class_=lambda x: x and any(
+                                             keyword in str(x).lower() 
+                                             for keyword in ['status', 'estado', 'situacao', 'situação', 'vendido', 'sold']
+                                         ))
+            for elem in status_elements:
+                texto = elem.get_text(strip=True).lower()
+                if 'vendido' in texto or 'sold' in texto:
+                    return 'Vendido'
+                if 'arrematado' in texto:
+                    return 'Arrematado'
+                for status, keywords in status_keywords.items():
+                    for keyword in keywords:
+                        if keyword in texto:
+                            return status.capitalize()
+            
+            # Estratégia 4: Buscar "Valor de venda: --" pode indicar vendido
+            if 'valor de venda' in texto_completo and '--' in texto_completo:
+                # Verificar se há botão de vendido próximo
+                valor_elements = soup.find_all(text=re.compile(r'Valor de venda', re.IGNORECASE))
+                for elem in valor_elements:
+                    parent = elem.parent
+                    if parent:
+                        # Buscar botão vendido próximo
+                        proximo = parent.find_next(['button', 'div', 'span'], 
+                                                  string=re.compile(r'vendido|sold', re.IGNORECASE))
+                        if proximo:
+                            return 'Vendido'
+        except Exception as e:
+            print(f"  ⚠️ Erro ao extrair status: {e}")
+        return 'Disponível'  # Default se não encontrar
+    
+    def _verificar_se_eh_quadro_ou_escultura(self, soup: BeautifulSoup, titulo: str = '', categoria_card: str = '') -> bool:
+        """Verifica se a obra é um quadro ou escultura"""
+        try:
+            # Verificar no título
+            texto_busca = (titulo + ' ' + categoria_card).lower()
+            
+            # Palavras-chave de quadros
+            keywords_quadros = ['quadro', 'pintura', 'painting', 'tela', 'canvas', 'óleo', 'oleo', 'aquarela', 
+                               'desenho', 'drawing', 'gravura', 'litografia', 'serigrafia']
+            
+            # Palavras-chave de esculturas
+            keywords_esculturas = ['escultura', 'sculpture', 'estátua', 'estatua', 'bronze', 'mármore', 'marmore',
+                                  'madeira', 'cerâmica', 'ceramica', 'porcelana']
+            
+            # Verificar se contém palavras-chave de quadros ou esculturas
+            if any(keyword in texto_busca for keyword in keywords_quadros):
+                return True
+            if any(keyword in texto_busca for keyword in keywords_esculturas):
+                return True
+            
+            # Verificar na página completa
+            texto_completo = soup.get_text().lower()
+            
+            # Buscar por categorias na página
+            categoria_elements = soup.find_all(['div', 'span', 'a'], 
+                                              class_=lambda x: x and any(
+                                                  keyword in str(x).lower() 
+                                                  for keyword in ['categoria', 'category', 'tipo', 'type']
+                                              ))
+            for elem in categoria_elements:
+                texto = elem.get_text().lower()
+                if any(keyword in texto for keyword in keywords_quadros + keywords_esculturas):
+                    return True
+            
+            # Verificar em breadcrumbs ou navegação
+            breadcrumbs = soup.find_all(['nav', 'div'], 
+                                       class_=lambda x: x and 'breadcrumb' in str(x).lower())
+            for breadcrumb in breadcrumbs:
+                texto = breadcrumb.get_text().lower()
+                if any(keyword in texto for keyword in keywords_quadros + keywords_esculturas):
+                    return True
+        
+        except:
+            pass
+        
+        # Se não conseguir determinar, retornar True para não filtrar (pode ser ajustado)
+        return True
+    
+    @cronometrar_extrator
+    def _extrair_data_final_iarremate(self, soup: BeautifulSoup) -> str:
+        """Extrai a data final do leilão do iArremate"""
+        try:
+            # Buscar por "Fim", "Término", "Encerramento"
+            keywords = ['fim', 'término', 'encerramento', 'final', 'data final']
+            for keyword in keywords:
+                textos = soup.find_all(text=re.compile(keyword, re.IGNORECASE))
+                for texto in textos:
+                    parent = texto.parent
+                    if parent:
+                        texto_completo = parent.get_text()
+                        # Padrão: DD/MM/YYYY HH:MM
+                        match = re.search(r'(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2})', texto_completo)
+                        if match:
+                            return f"{match.group(1)} {match.group(2)}"
+        except:
+            pass
+        return 'N/A'
+    
+    @cronometrar_extrator
+    def _extrair_data_final_leiloes_br(self, soup: BeautifulSoup) -> str:
+        """Extrai a data final do leilão do LeilõesBR"""
+        try:
+            # Buscar por "Fim", "Término", "Encerramento", "Último dia"
+            keywords = ['fim', 'término', 'encerramento', 'final', 'último dia', 'ultimo dia']
+            for keyword in keywords:
+                textos = soup.find_all(text=re.compile(keyword, re.IGNORECASE))
+                for texto in textos:
+                    parent = texto.parent
+                    if parent:
+                        texto_completo = parent.get_text()
+                        # Padrão: DD/MM/YYYY - HHh ou DD/MM/YYYY HH:MM
+                        match = re.search(r'(\d{2}/\d{2}/\d{4})\s*[-–]\s*(\d{1,2})h', texto_completo)
+                        if match:
+                            return f"{match.group(1)} {match.group(2)}:00"
+                        
+                        match = re.search(r'(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2})', texto_completo)
+                        if match:
+                            return f"{match.group(1)} {match.group(2)}"
+            
+            # Buscar em seções de "Dias do Leilão" que podem ter múltiplas datas
+            # Exemplo: "3º DIA - 4/12/2025 - 20:00"
+            dias_sections = soup.find_all(['div', 'section', 'ul', 'li'], 
+                                        class_=lambda x: x and ('dia' in str(x).lower() or 'dias' in str(x).lower()))
+            todas_datas = []
+            for section in dias_sections:
+                texto = section.get_text()
+                # Buscar padrão: "Xº DIA - DD/MM/YYYY - HH:MM" ou "Xº DIA - DD/MM/YYYY HH:MM"
+                matches = list(re.finditer(r'(\d{1,2})[º°]\s*DIA\s*[-–]\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*[-–]?\s*(\d{1,2}):(\d{2})', texto, re.IGNORECASE))
+                for match in matches:
+                    dia = match.group(2)
+                    mes = match.group(3)
+                    ano = match.group(4)
+                    hora = match.group(5)
+                    minuto = match.group(6)
+                    data_str = f"{dia}/{mes}/{ano} {hora}:{minuto}"
+                    todas_datas.append((int(match.group(1)), data_str))  # (número do dia, data)
+            
+            # Se encontrou múltiplas datas, pegar a última (maior número do dia)
+            if todas_datas:
+                todas_datas.sort(key=lambda x: x[0], reverse=True)
+                return todas_datas[0][1]
+            
+            # Se não encontrou no formato específico, buscar última data mencionada
+            dias_sections = soup.find_all(['div', 'section'], 
+                                        class_=lambda x: x and 'dia' in str(x).lower())
+            for section in dias_sections:
+                texto = section.get_text()
+                matches = list(re.finditer(r'(\d{2}/\d{2}/\d{4})', texto))
+                if matches:
+                    return matches[-1].group(1)
+        except Exception as e:
+            print(f"  ⚠️ Erro ao extrair data final: {e}")
+        return 'N/A'
+    
+    @cronometrar_extrator
+    def _extrair_valor_atual_com_lances(self, soup: BeautifulSoup, valor_fallback: str) -> Tuple[str, int]:
+        """Extrai o valor atual e número de lances (para leilões em andamento)
+        Retorna: (valor, numero_lances)
+        """
+        try:
+            # Estratégia 1: Buscar número de lances pelo ícone de martelo (Roberto Haddad)
+            # Buscar ícones de martelo/hammer
+            hammer_icons = soup.find_all(['i', 'svg', 'img', 'span'], 
+                                       class_=lambda x: x and any(
+                                           keyword in str(x).lower() 
+                                           for keyword in ['hammer', 'martelo', 'lance', 'bid']
+                                       ))
+            numero_lances = 0
+            for icon in hammer_icons:
+                # Buscar número no elemento pai ou próximo
+                parent = icon.parent
+                if parent:
+                    texto = parent.get_text(strip=True)
+                    match = re.search(r'(\d+)', texto)
+                    if match:
+                        numero_lances = int(match.group(1))
+                        break
+                
+                # Buscar próximo elemento
+                next_elem = icon.find_next_sibling()
+                if next_elem:
+                    texto = next_elem.get_text(strip=True)
+                    match = re.search(r'(\d+)', texto)
+                    if match:
+                        numero_lances = int(match.group(1))
+                        break
+            
+            # Estratégia 2: Buscar por "Valor atual" com número de lances
+            # Exemplo: "Valor atual: (12 Lance(s)) R$ 8,000.00"
+            texto_completo = soup.get_text()
+            
+            # Padrão: "Valor atual" seguido de número de lances e valor
+            match = re.search(
+                r'Valor\s+atual[:\s]*\(?\s*(\d+)\s*Lance\(s\)\s*\)?\s*R\$\s*([\d.,]+)',
+                texto_completo,
+                re.IGNORECASE
+            )
+            if match:
+                numero_lances = int(match.group(1))
+                valor = match.group(2)
+                return (valor, numero_lances)
+            
+            # Padrão alternativo: "Valor atual:" seguido de valor (sem número de lances)
+            match = re.search(
+                r'Valor\s+atual[:\s]+R\$\s*([\d.,]+)',
+                texto_completo,
+                re.IGNORECASE
+            )
+            if match:
+                valor = match.group(1)
+                # Se já encontrou número de lances pelo ícone, usar ele
+                if numero_lances == 0:
+                    # Tentar encontrar número de lances em outro lugar
+                    match_lances = re.search(r'(\d+)\s*Lance\(s\)', texto_completo, re.IGNORECASE)
+                    numero_lances = int(match_lances.group(1)) if match_lances else 0
+                return (valor, numero_lances)
+            
+            # Estratégia 3: Buscar "Valor de venda" (Roberto Haddad)
+            match = re.search(
+                r'Valor\s+de\s+venda[:\s]+R\$\s*([\d.,]+)',
+                texto_completo,
+                re.IGNORECASE
+            )
+            if match:
+                valor = match.group(1)
+                return (valor, numero_lances if numero_lances > 0 else 0)
+            
+            # Estratégia 4: Buscar em elementos com texto "Valor atual"
+            valor_atual_elements = soup.find_all(
+                text=re.compile(r'Valor\s+atual|Valor de venda', re.IGNORECASE)
+            )
+            for element in valor_atual_elements:
+                parent = element.parent
+                if parent:
+                    texto = parent.get_text()
+                    match = re.search(r'R\$\s*([\d.,]+)', texto)
+                    if match:
+                        valor = match.group(1)
+                        # Tentar encontrar número de lances próximo
+                        if numero_lances == 0:
+                            match_lances = re.search(r'(\d+)\s*Lance\(s\)', texto, re.IGNORECASE)
+                            numero_lances = int(match_lances.group(1)) if match_lances else 0
+                        return (valor, numero_lances)
+        except Exception as e:
+            print(f"  ⚠️ Erro ao extrair valor atual: {e}")
+        
+        # Se não encontrou número de lances, retornar valor_fallback com 0 lances
+        return (valor_fallback if isinstance(valor_fallback, str) else str(valor_fallback), 0)
+    
+    def _determinar_status_leilao(self, data_inicio: str, data_final: str) -> str:
+        """Determina o status do leilão: 'agendado', 'em_andamento', 'finalizado'"""
+        agora = datetime.utcnow()
+        
+        # Tentar parsear data de início
+        data_inicio_dt = self._parsear_data(data_inicio)
+        data_final_dt = self._parsear_data(data_final)
+        
+        if data_inicio_dt and data_final_dt:
+            if agora < data_inicio_dt:
+                return 'agendado'
+            elif data_inicio_dt <= agora <= data_final_dt:
+                return 'em_andamento'
+            else:
+                return 'finalizado'
+        elif data_inicio_dt:
+            if agora < data_inicio_dt:
+                return 'agendado'
+            elif (agora - data_inicio_dt).total_seconds() < 86400:  # Menos de 24h
+                return 'em_andamento'
+            else:
+                return 'finalizado'
+        
+        return 'desconhecido'
+    
+    def _parsear_data(self, data_str: str) -> Optional[datetime]:
+        """Parseia uma string de data para datetime"""
+        if not data_str or data_str == 'N/A' or data_str == 'nao tem':
+            return None
+        
+        try:
+            # Formato: DD/MM/YYYY HH:MM ou DD/MM/YYYY
+            match = re.search(r'(\d{2})/(\d{2})/(\d{4})(?:\s+(\d{2}):(\d{2}))?', data_str)
+            if match:
+                dia, mes, ano = int(match.group(1)), int(match.group(2)), int(match.group(3))
+                hora = int(match.group(4)) if match.group(4) else 0
+                minuto = int(match.group(5)) if match.group(5) else 0
+                return datetime(ano, mes, dia, hora, minuto)
+        except:
+            pass
+        
+        return None
+
+
+# Um processo por núcleo; com um só núcleo, processos só somariam a cópia das páginas ao parse
+PROCESSOS_PADRAO = os.cpu_count() if (os.cpu_count() or 1) > 1 else 0
+
+# Extrator de cada processo de trabalho (criado em _iniciar_processo)
+_extrator: Optional[ExtratorPaginaObra] = None
+
+
+def _iniciar_processo():
+    """Cria os scrapers (só usados para extrair, sem rede) uma vez por processo de trabalho"""
+    global _extrator
+    # Só avisos e erros dos scrapers (antes de BaseScraper._setup_logging, que não reconfigura)
+    logging.basicConfig(level=logging.WARNING)
+    _extrator = ExtratorPaginaObra()
+
+
+def _extrair_pagina(site: str, url: str, url_final: str, conteudo: bytes,
+                    encoding: Optional[str]) -> Optional[Dict]:
+    return _extrator.extrair_pagina(site, url, url_final, conteudo, encoding)
+
+
+class PipelineExtracao:
+    """
+    Estágio de extração: quem busca as páginas envia cada resposta com enviar() e continua
+    buscando; os processos fazem parse + extração e os resultados chegam como Futures de dicts
+    
+    Uso:
+        with PipelineExtracao() as pipeline:
+            futuro = pipeline.enviar('leiloes_br', url, response)
+            ...
+            obra = futuro.result()  # Dict ou None (não é quadro/escultura)
+    """
+    
+    def __init__(self, processos: Optional[int] = None, extrator: Optional[ExtratorPaginaObra] = None):
+        """
+        Args:
+            processos: Processos de extração (padrão: SCRAPER_PROCESSOS_EXTRACAO ou PROCESSOS_PADRAO);
+                0 extrai na thread de quem envia, sem processos
+            extrator: Extrator usado quando processos é 0 (padrão: um novo ExtratorPaginaObra)
+        """
+        if processos is None:
+            processos = int(os.getenv("SCRAPER_PROCESSOS_EXTRACAO", PROCESSOS_PADRAO))
+        self.processos = max(processos, 0)
+        self._extrator = extrator
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.processos:
+            self._executor = ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo)
+        elif self._extrator is None:
+            self._extrator = ExtratorPaginaObra()
+    
+    def enviar(self, site: str, url: str, response: requests.Response) -> Future:
+        """Agenda a extração da página de uma obra ('iarremate' ou 'leiloes_br') já baixada"""
+        argumentos = (site, url, response.url, response.content, response.encoding)
+        if self._executor:
+            return self._executor.submit(_extrair_pagina, *argumentos)
+        
+        futuro = Future()
+        try:
+            futuro.set_result(self._extrator.extrair_pagina(*argumentos))
+        except Exception as e:
+            futuro.set_exception(e)
+        return futuro
+    
+    def fechar(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
+        return False
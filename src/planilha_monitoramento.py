@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planilhas Excel do monitoramento de obras (extrair_obras_especificas.py), gravadas de forma incremental
+A aba de obras é gravada no modo write-only do openpyxl, com estilos nomeados aplicados por linha
+(em vez de Border/Alignment célula a célula depois de gravar). O histórico de lances vai para um
+CSV ao lado da planilha, onde cada exportação só acrescenta os lances novos; a aba
+"Histórico de Valores" aponta para esse CSV
+
+Cada reexportação custa o número de lotes mais os lances novos desde a anterior, não o histórico
+inteiro. A planilha é gravada num arquivo temporário e renomeada: quem está com ela aberta nunca
+lê um arquivo pela metade
+"""
+
+import os
+import csv
+import time
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+
+_BORDA = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+
+# Estilos nomeados: registrados uma vez no livro e aplicados por nome em cada célula
+ESTILO_CABECALHO = 'monitor_cabecalho'
+ESTILO_OBRA = 'monitor_obra'
+ESTILO_HISTORICO = 'monitor_historico'
+
+
+def _estilos() -> List[NamedStyle]:
+    return [
+        NamedStyle(name=ESTILO_CABECALHO,
+                   fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+                   font=Font(bold=True, color="FFFFFF", size=11),
+                   alignment=Alignment(horizontal='center', vertical='center'), border=_BORDA),
+        NamedStyle(name=ESTILO_OBRA, alignment=Alignment(vertical='top', wrap_text=True), border=_BORDA),
+        NamedStyle(name=ESTILO_HISTORICO, alignment=Alignment(vertical='top'), border=_BORDA),
+    ]
+
+
+# Colunas da aba Obras: cabeçalho, largura e valor a partir do dicionário da obra
+COLUNAS_OBRAS: Tuple[Tuple[str, int, Callable[[Dict], object]], ...] = (
+    ('URL', 50, lambda obra: obra.get('url', 'N/A')),
+    ('Scraper', 12, lambda obra: obra.get('scraper', 'N/A')),
+    ('Título', 40, lambda obra: obra.get('titulo', 'N/A')),
+    ('Artista', 25, lambda obra: obra.get('nome_artista', 'N/A')),
+    ('Lote', 10, lambda obra: obra.get('lote', 'N/A')),
+    ('Valor Atual', 15, lambda obra: obra.get('valor_atual', obra.get('valor', 'N/A'))),
+    ('Nº Lances', 12, lambda obra: obra.get('numero_lances', 0)),
+    ('Valor Inicial', 15, lambda obra: obra.get('valor', 'N/A')),
+    ('Visitas', 12, lambda obra: obra.get('visitas', 'N/A')),
+    ('Status Lote', 15, lambda obra: obra.get('status_lote', 'Disponível')),
+    ('Data Início Leilão', 20, lambda obra: obra.get('data_inicio_leilao', 'N/A')),
+    ('Data Final Leilão', 20, lambda obra: obra.get('data_final_leilao', 'N/A')),
+    ('Status Leilão', 15, lambda obra: obra.get('status_leilao', 'N/A')),
+    ('Leiloeiro', 20, lambda obra: obra.get('leiloeiro', 'N/A')),
+    ('Local', 20, lambda obra: obra.get('local', 'N/A')),
+    ('Categoria', 15, lambda obra: obra.get('categoria', 'N/A')),
+)
+
+COLUNAS_HISTORICO = ('URL', 'Lance', 'Valor', 'Data/Hora', 'Mudança')
+LARGURAS_HISTORICO = (50, 15, 15, 20, 15)
+
+
+def _valor_numerico(valor: str) -> Optional[float]:
+    try:
+        return float(valor.replace('.', '').replace(',', '.').replace('R$', '').strip())
+    except (AttributeError, ValueError):
+        return None
+
+
+def mudanca_valor(anterior: Optional[str], atual: str) -> str:
+    """Diferença entre dois valores em reais ("+R$ 1.500,00"), vazia se não houver anterior ou não forem números"""
+    if not anterior:
+        return ''
+    valor_anterior, valor_atual = _valor_numerico(anterior), _valor_numerico(atual)
+    if valor_anterior is None or valor_atual is None or valor_atual == valor_anterior:
+        return ''
+    diferenca = valor_atual - valor_anterior
+    texto = f"R$ {diferenca:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return f"+{texto}" if diferenca > 0 else texto
+
+
+class PlanilhaMonitoramento:
+    """
+    Planilha de um site durante o monitoramento: <prefixo>_<início>.xlsx, regravada a cada
+    exportação, e <prefixo>_<início>_historico.csv, só acrescentado
+    """
+    
+    def __init__(self, nome_site: str, prefixo: str, diretorio: str = "output"):
+        self.nome_site = nome_site
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        inicio = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.arquivo = self.diretorio / f"{prefixo}_{inicio}.xlsx"
+        self.arquivo_historico = self.diretorio / f"{prefixo}_{inicio}_historico.csv"
+        self.lances_registrados = 0
+        self._lances_exportados: Dict[str, int] = {}  # {url: lances do histórico já no CSV}
+        self._ultimo_valor: Dict[str, str] = {}  # {url: último valor gravado no CSV} (coluna Mudança)
+        self._lock = threading.Lock()
+    
+    def exportar(self, obras: List[Dict], historicos: Dict) -> str:
+        """
+        Acrescenta os lances novos ao CSV e regrava a planilha de obras
+        Args:
+            obras: Obras do site (dicionários do extrator)
+            historicos: {url: HistoricoValor}
+        Returns:
+            Caminho da planilha gravada
+        """
+        with self._lock:
+            self._anexar_historico(obras, historicos)
+            return self._gravar_planilha(obras)
+    
+    def _anexar_historico(self, obras: List[Dict], historicos: Dict):
+        novo_arquivo = not self.arquivo_historico.exists()
+        with open(self.arquivo_historico, 'a', newline='', encoding='utf-8-sig' if novo_arquivo else 'utf-8') as arquivo:
+            escritor = csv.writer(arquivo)
+            if novo_arquivo:
+                escritor.writerow(COLUNAS_HISTORICO)
+            for obra in obras:
+                url = obra.get('url_original') or obra.get('url', '')
+                historico = historicos.get(url)
+                if historico is None:
+                    continue
+                novos = historico.obter_valores_desde(self._lances_exportados.get(url, 0))
+                for valor, momento, numero_lance in novos:
+                    escritor.writerow([
+                        url,
+                        f"Lance {numero_lance}" if numero_lance > 0 else "Valor Inicial",
+                        valor,
+                        momento.strftime('%d/%m/%Y %H:%M:%S'),
+                        mudanca_valor(self._ultimo_valor.get(url), valor)
+                    ])
+                    self._ultimo_valor[url] = valor
+                self._lances_exportados[url] = self._lances_exportados.get(url, 0) + len(novos)
+                self.lances_registrados += len(novos)
+    
+    def _gravar_planilha(self, obras: List[Dict]) -> str:
+        livro = Workbook(write_only=True)
+        for estilo in _estilos():
+            livro.add_named_style(estilo)
+        
+        # Aba Obras
+        aba_obras = livro.create_sheet("Obras")
+        for indice, (_, largura, _) in enumerate(COLUNAS_OBRAS, 1):
+            aba_obras.column_dimensions[get_column_letter(indice)].width = largura
+        aba_obras.append(self._linha(aba_obras, [cabecalho for cabecalho, _, _ in COLUNAS_OBRAS], ESTILO_CABECALHO))
+        for obra in obras:
+            aba_obras.append(self._linha(aba_obras, [valor(obra) for _, _, valor in COLUNAS_OBRAS], ESTILO_OBRA))
+        
+        # Aba Histórico de Valores: o histórico completo fica no CSV ao lado
+        aba_historico = livro.create_sheet("Histórico de Valores")
+        for indice, largura in enumerate(LARGURAS_HISTORICO, 1):
+            aba_historico.column_dimensions[get_column_letter(indice)].width = largura
+        aba_historico.append(self._linha(aba_historico, ['Histórico de lances (CSV)', 'Lances'], ESTILO_CABECALHO))
+        nome_csv = self.arquivo_historico.name
+        aba_historico.append(self._linha(
+            aba_historico, [f'=HYPERLINK("{nome_csv}", "{nome_csv}")', self.lances_registrados], ESTILO_HISTORICO
+        ))
+        
+        temporario = self.arquivo.with_name(f".{self.arquivo.name}.tmp")
+        livro.save(temporario)
+        return self._substituir(temporario)
+    
+    @staticmethod
+    def _linha(aba, valores: List, estilo: str) -> List[WriteOnlyCell]:
+        linha = []
+        for valor in valores:
+            celula = WriteOnlyCell(aba, value=valor)
+            celula.style = estilo
+            linha.append(celula)
+        return linha
+    
+    def _substituir(self, temporario: Path, tentativas: int = 3) -> str:
+        """Troca a planilha pela nova; se estiver aberta (Windows), tenta de novo e depois grava com outro nome"""
+        for tentativa in range(tentativas):
+            try:
+                os.replace(temporario, self.arquivo)
+                print(f"  ✅ Arquivo Excel {self.nome_site} salvo: {self.arquivo}")
+                return str(self.arquivo)
+            except PermissionError:
+                if tentativa < tentativas - 1:
+                    print(f"  ⚠️ Arquivo está aberto (tentativa {tentativa + 1}/{tentativas}). Aguardando...")
+                    time.sleep(2)
+        
+        timestamp_novo = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        alternativo = self.arquivo.with_name(f"{self.arquivo.stem}_{timestamp_novo}.xlsx")
+        os.replace(temporario, alternativo)
+        print(f"  ✅ Arquivo Excel salvo (novo nome): {alternativo}")
+        print(f"  ⚠️ O arquivo original ({self.arquivo}) estava aberto.")
+        return str(alternativo)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limitador de taxa por host (token bucket) compartilhado por todos os scrapers do processo
+Cada host tem um balde com capacidade de rajada e taxa de reposição (requisições/segundo);
+sessões da API, monitores e atualizadores que acessam o mesmo site dividem o mesmo balde
+
+Configuração por variáveis de ambiente:
+    SCRAPER_TAXA_REQUISICOES  taxa padrão por host em requisições/segundo (padrão: 1.0)
+    SCRAPER_RAJADA            capacidade padrão do balde (padrão: 3)
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# Taxa (requisições/segundo, None = sem limite) e rajada por site; hosts não listados usam a taxa padrão
+TAXAS_POR_HOST: Dict[str, Tuple[Optional[float], float]] = {
+    'iarremate.com': (1.0, 3),
+    'leiloesbr.com.br': (1.0, 3),
+    'miguelsalles.com.br': (1 / 1.5, 2),
+    'robertohaddad.lel.br': (1 / 1.5, 2),
+}
+
+
+def normalizar_host(url_ou_host: str) -> str:
+    """Host sem 'www.' (aceita URL completa ou apenas o host)"""
+    if not url_ou_host:
+        return ""
+    host = urlparse(url_ou_host).netloc if '://' in url_ou_host else url_ou_host
+    host = host.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class BaldeTokens:
+    """
+    Token bucket thread-safe com reserva: cada chamada a reservar() consome um token (o saldo
+    pode ficar negativo) e retorna quanto o chamador deve esperar antes de fazer a requisição.
+    Assim a taxa nunca é ultrapassada, qualquer que seja o número de threads, e as threads
+    são atendidas na ordem em que reservaram
+    """
+    
+    def __init__(self, taxa: float, capacidade: float = 1):
+        if taxa <= 0:
+            raise ValueError("taxa deve ser maior que zero")
+        self.taxa = taxa
+        self.capacidade = max(capacidade, 1)
+        self._tokens = float(self.capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reservar(self) -> float:
+        """Consome um token; retorna a espera em segundos (0 se havia token disponível)"""
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.taxa
+
+
+class LimitadorPorHost:
+    """
+    Um BaldeTokens por host, criado sob demanda com a taxa configurada para o site
+    Taxa None (por host ou padrão): sem limite
+    """
+    
+    def __init__(self, taxa_padrao: Optional[float] = 1.0, rajada_padrao: float = 3,
+                 taxas_por_host: Optional[Dict[str, Tuple[Optional[float], float]]] = None):
+        self.taxa_padrao = taxa_padrao
+        self.rajada_padrao = rajada_padrao
+        self.taxas_por_host = dict(TAXAS_POR_HOST if taxas_por_host is None else taxas_por_host)
+        self._baldes: Dict[str, BaldeTokens] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def do_ambiente(cls) -> 'LimitadorPorHost':
+        """Cria o limitador a partir das variáveis de ambiente"""
+        return cls(
+            taxa_padrao=float(os.getenv("SCRAPER_TAXA_REQUISICOES", 1.0)),
+            rajada_padrao=float(os.getenv("SCRAPER_RAJADA", 3))
+        )
+    
+    def configurar(self, host: str, taxa: Optional[float], rajada: Optional[float] = None):
+        """Define a taxa de um site (substitui o balde existente); taxa None: sem limite"""
+        host = normalizar_host(host)
+        with self._lock:
+            self.taxas_por_host[host] = (taxa, rajada if rajada is not None else self.rajada_padrao)
+            self._baldes.pop(host, None)
+    
+    def taxa(self, host: str) -> Tuple[Optional[float], float]:
+        """(taxa, rajada) configuradas para o host"""
+        return self.taxas_por_host.get(normalizar_host(host), (self.taxa_padrao, self.rajada_padrao))
+    
+    def intervalo(self, host: str) -> float:
+        """Intervalo médio entre requisições ao host (segundos; 0 se não houver limite)"""
+        taxa = self.taxa(host)[0]
+        return 1 / taxa if taxa else 0.0
+    
+    def balde(self, host: str) -> Optional[BaldeTokens]:
+        """Balde do host (None se o host não tiver limite)"""
+        host = normalizar_host(host)
+        with self._lock:
+            balde = self._baldes.get(host)
+            if balde is None:
+                taxa, rajada = self.taxas_por_host.get(host, (self.taxa_padrao, self.rajada_padrao))
+                if not taxa:
+                    return None
+                balde = self._baldes[host] = BaldeTokens(taxa, rajada)
+            return balde
+    
+    def reservar(self, url: str) -> float:
+        """Reserva a vez de uma requisição à URL; retorna a espera em segundos"""
+        balde = self.balde(url)
+        return balde.reservar() if balde is not None else 0.0
+
+
+# Limitador compartilhado pelos scrapers do processo (BaseScraper usa este por padrão)
+LIMITADOR_GLOBAL = LimitadorPorHost.do_ambiente()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro tipado de um lote coletado pelos scrapers (BaseScraper.dados_obras)
+Um único formato para as obras coletadas, com conversores diretos para as linhas de Obra
+(gravação no banco), as colunas da planilha (DataFrame) e JSON, no lugar dos dicionários com
+chaves montadas à mão em cada scraper e traduzidas de novo na gravação
+
+Os registros usam __slots__ (sem __dict__ por lote) e os campos que se repetem entre lotes
+(scraper, categoria, artista, leiloeiro, local, datas do leilão) são internados com sys.intern,
+então milhares de lotes do mesmo leilão compartilham as mesmas strings
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+
+# Campos internados: poucos valores distintos repetidos em muitos lotes
+CAMPOS_INTERNADOS = frozenset({
+    'scraper_name', 'categoria', 'nome_artista', 'data_inicio_leilao', 'data_leilao',
+    'leiloeiro', 'local', 'site_redirecionado', 'chave_leilao'
+})
+
+# Campos do registro que não são colunas de Obra
+CAMPOS_FORA_DE_OBRA = frozenset({'chave_leilao'})
+
+# Colunas da planilha dos scrapers (salvar_planilha), na ordem: campo do registro -> coluna
+COLUNAS_PLANILHA = (
+    ('nome_artista', 'Nome_Artista'),
+    ('categoria', 'Categoria'),
+    ('pagina', 'Pagina'),
+    ('titulo', 'Titulo'),
+    ('descricao', 'Descricao'),
+    ('descricao_completa', 'Descricao_Completa'),
+    ('valor', 'Valor'),
+    ('lote', 'Lote'),
+    ('data_inicio_leilao', 'Data_Inicio_Leilao'),
+    ('data_leilao', 'Data_Leilao'),
+    ('leiloeiro', 'Leiloeiro'),
+    ('local', 'Local'),
+    ('url', 'URL'),
+    ('url_original', 'URL_Original'),
+    ('site_redirecionado', 'Site_Redirecionado'),
+    ('data_coleta', 'Data_Coleta'),
+)
+
+FORMATO_DATA_COLETA = '%d/%m/%Y %H:%M:%S'
+
+
+class LoteRecord:
+    """
+    Lote coletado: os campos têm o nome das colunas de Obra; todos são opcionais exceto url
+    chave_leilao ("host:numero", ver src/cache_leiloes.py) liga o lote ao leilão (Obra.leilao_id)
+    
+    Uso:
+        lote = LoteRecord(url=url, scraper_name='iarremate', titulo=titulo, valor=valor, ...)
+        Obra(**lote.para_linha_obra(session_id))
+    """
+    
+    __slots__ = (
+        'url', 'scraper_name', 'categoria', 'nome_artista', 'titulo', 'descricao', 'descricao_completa',
+        'valor', 'valor_atualizado', 'numero_lances', 'lote', 'data_inicio_leilao', 'data_leilao',
+        'leiloeiro', 'local', 'url_original', 'site_redirecionado', 'pagina', 'data_coleta', 'chave_leilao'
+    )
+    
+    url: str
+    scraper_name: Optional[str]
+    categoria: Optional[str]
+    nome_artista: Optional[str]
+    titulo: Optional[str]
+    descricao: Optional[str]
+    descricao_completa: Optional[str]
+    valor: Optional[str]
+    valor_atualizado: Optional[str]
+    numero_lances: Optional[int]
+    lote: Optional[str]
+    data_inicio_leilao: Optional[str]
+    data_leilao: Optional[str]
+    leiloeiro: Optional[str]
+    local: Optional[str]
+    url_original: Optional[str]
+    site_redirecionado: Optional[str]
+    pagina: Optional[int]
+    data_coleta: Optional[datetime]
+    chave_leilao: Optional[str]
+    
+    def __init__(self, url: str, **campos):
+        """
+        Args:
+            url: URL final da obra
+            **campos: Demais campos de __slots__ (ausentes ficam None)
+        """
+        self.url = url
+        for campo in self.__slots__[1:]:
+            valor = campos.pop(campo, None)
+            if campo in CAMPOS_INTERNADOS and type(valor) is str:
+                valor = sys.intern(valor)
+            setattr(self, campo, valor)
+        if campos:
+            raise TypeError(f"Campos desconhecidos em LoteRecord: {', '.join(sorted(campos))}")
+    
+    @classmethod
+    def do_extrator(cls, obra_data: Dict) -> 'LoteRecord':
+        """Registro a partir do dicionário de ExtratorObrasEspecificas (extrair_dados_obra_*)"""
+        return cls(
+            url=obra_data.get('url', ''),
+            scraper_name=obra_data.get('scraper'),
+            categoria=obra_data.get('categoria', 'Quadros'),
+            nome_artista=obra_data.get('nome_artista'),
+            titulo=obra_data.get('titulo'),
+            descricao=obra_data.get('descricao'),
+            valor=obra_data.get('valor'),
+            valor_atualizado=obra_data.get('valor_atual'),
+            numero_lances=obra_data.get('numero_lances', 0),
+            lote=obra_data.get('lote'),
+            data_inicio_leilao=obra_data.get('data_inicio_leilao'),
+            data_leilao=obra_data.get('data_final_leilao'),
+            leiloeiro=obra_data.get('leiloeiro'),
+            local=obra_data.get('local'),
+            url_original=obra_data.get('url_original'),
+            chave_leilao=obra_data.get('chave_leilao')
+        )
+    
+    def para_linha_obra(self, session_id: int) -> Dict:
+        """Argumentos de Obra (ou linha para insert em lote) deste registro (sem leilao_id)"""
+        # Campos None ficam de fora: as colunas com padrão (numero_lances) usam o padrão de Obra
+        linha = {campo: getattr(self, campo) for campo in self.__slots__
+                 if campo not in CAMPOS_FORA_DE_OBRA and getattr(self, campo) is not None}
+        linha['url'] = self.url or ''
+        linha['data_coleta'] = self.data_coleta or datetime.utcnow()
+        linha['session_id'] = session_id
+        return linha
+    
+    def para_json(self) -> Dict:
+        """Dicionário serializável em JSON (nomes das colunas de Obra, data_coleta em ISO 8601)"""
+        dados = {campo: getattr(self, campo) for campo in self.__slots__}
+        dados['data_coleta'] = self.data_coleta.isoformat() if self.data_coleta else None
+        return dados
+    
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, LoteRecord):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outro, campo) for campo in self.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"LoteRecord(url={self.url!r}, scraper_name={self.scraper_name!r}, lote={self.lote!r}, valor={self.valor!r})"
+
+
+def lotes_para_dataframe(lotes: Iterable[LoteRecord]) -> pd.DataFrame:
+    """DataFrame com as colunas da planilha (COLUNAS_PLANILHA), montado coluna a coluna"""
+    lotes = list(lotes)
+    colunas = {}
+    for campo, coluna in COLUNAS_PLANILHA:
+        if campo == 'data_coleta':
+            colunas[coluna] = [lote.data_coleta.strftime(FORMATO_DATA_COLETA) if lote.data_coleta else ''
+                               for lote in lotes]
+        else:
+            colunas[coluna] = [getattr(lote, campo) for lote in lotes]
+    return pd.DataFrame(colunas)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Política de novas tentativas das requisições HTTP e disjuntor (circuit breaker) por host
+
+- PoliticaRetentativa: backoff exponencial com jitter, respeitando Retry-After em 429/503;
+  erros do cliente (404, 403...) não são repetidos
+- DisjuntorPorHost: após falhas consecutivas em um site, pausa as requisições a ele em vez de
+  gastar tentativas em cada URL da fila; depois da pausa uma única requisição de teste decide se
+  o site voltou (sucesso fecha o disjuntor, falha reabre com pausa maior)
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from .rate_limiter import normalizar_host
+
+
+# Status que indicam falha temporária do servidor (vale tentar de novo)
+STATUS_RETENTAVEIS = frozenset({408, 425, 429, 500, 502, 503, 504})
+STATUS_REDIRECIONAMENTO = frozenset({301, 302, 303, 307, 308})
+
+
+def interpretar_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Segundos indicados pelo cabeçalho Retry-After (número ou data HTTP); None se ausente/inválido"""
+    if not valor:
+        return None
+    valor = valor.strip()
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return max((data - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class PoliticaRetentativa:
+    """Quando repetir uma requisição e quanto esperar antes da próxima tentativa"""
+    
+    def __init__(self, base: float = 1.0, maximo: float = 30.0, maximo_retry_after: float = 300.0):
+        """
+        Args:
+            base: Espera de referência da primeira nova tentativa (segundos)
+            maximo: Teto do backoff exponencial (segundos)
+            maximo_retry_after: Teto para o Retry-After informado pelo servidor (segundos)
+        """
+        self.base = base
+        self.maximo = maximo
+        self.maximo_retry_after = maximo_retry_after
+    
+    def deve_retentar(self, status: Optional[int]) -> bool:
+        """None = exceção (timeout, conexão recusada...)"""
+        return status is None or status in STATUS_RETENTAVEIS
+    
+    def espera(self, tentativa: int, response=None) -> float:
+        """
+        Espera antes da tentativa seguinte à `tentativa` (1 = primeira falha)
+        Usa o Retry-After de respostas 429/503; senão backoff exponencial com jitter
+        (sorteio entre metade e o valor cheio, para as threads não repetirem juntas)
+        """
+        if response is not None and response.status_code in (429, 503):
+            retry_after = interpretar_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.maximo_retry_after)
+        
+        teto = min(self.maximo, self.base * (2 ** (tentativa - 1)))
+        return random.uniform(teto / 2, teto)
+
+
+class DisjuntorPorHost:
+    """
+    Circuit breaker por site, compartilhado pelos scrapers do processo
+    
+    Estados de cada site:
+    - fechado: requisições liberadas; limite_falhas falhas consecutivas abrem o disjuntor
+    - aberto: ninguém acessa o site até o fim da pausa; falhas de requisições que já estavam
+      em andamento são ignoradas (não reabrem nem aumentam a pausa)
+    - meio_aberto: fim da pausa; uma única thread faz a requisição de teste e as demais esperam.
+      Sucesso fecha o disjuntor; falha do teste reabre com a pausa dobrada
+    """
+    
+    FECHADO = 'fechado'
+    ABERTO = 'aberto'
+    MEIO_ABERTO = 'meio_aberto'
+    
+    def __init__(self, limite_falhas: int = 5, pausa: float = 60.0, pausa_maxima: float = 600.0,
+                 tempo_teste: float = 60.0, intervalo_consulta: float = 1.0):
+        """
+        Args:
+            limite_falhas: Falhas consecutivas que abrem o disjuntor
+            pausa: Primeira pausa do site (segundos); dobra a cada requisição de teste que falha
+            pausa_maxima: Teto da pausa (segundos)
+            tempo_teste: Sem resposta da requisição de teste neste tempo, outra thread pode testar
+            intervalo_consulta: Espera das demais threads enquanto o teste está em andamento (segundos)
+        """
+        self.limite_falhas = limite_falhas
+        self.pausa = pausa
+        self.pausa_maxima = pausa_maxima
+        self.tempo_teste = tempo_teste
+        self.intervalo_consulta = intervalo_consulta
+        self._estados: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _estado(self, host: str) -> Dict:
+        host = normalizar_host(host)
+        estado = self._estados.get(host)
+        if estado is None:
+            estado = self._estados[host] = {
+                'estado': self.FECHADO, 'falhas': 0, 'aberto_ate': 0.0, 'pausa': self.pausa,
+                'testador': None, 'teste_desde': 0.0
+            }
+        return estado
+    
+    def _abrir(self, estado: Dict, agora: float):
+        estado['estado'] = self.ABERTO
+        estado['aberto_ate'] = agora + estado['pausa']
+        estado['testador'] = None
+    
+    def estado(self, host: str) -> str:
+        with self._lock:
+            return self._estado(host)['estado']
+    
+    def espera(self, host: str) -> float:
+        """Segundos até o fim da pausa do site (0 se o disjuntor não está aberto)"""
+        with self._lock:
+            estado = self._estado(host)
+            if estado['estado'] != self.ABERTO:
+                return 0.0
+            return max(estado['aberto_ate'] - time.monotonic(), 0.0)
+    
+    def aberto(self, host: str) -> bool:
+        return self.espera(host) > 0
+    
+    def liberar(self, host: str) -> float:
+        """
+        Pede a vez de uma requisição ao site; retorna 0 se pode seguir ou os segundos a esperar
+        antes de pedir de novo. No fim da pausa, a primeira thread que pedir faz o teste
+        """
+        with self._lock:
+            estado = self._estado(host)
+            agora = time.monotonic()
+            if estado['estado'] == self.FECHADO:
+                return 0.0
+            if estado['estado'] == self.ABERTO:
+                if agora < estado['aberto_ate']:
+                    return estado['aberto_ate'] - agora
+                estado['estado'] = self.MEIO_ABERTO
+                estado['testador'] = None
+            
+            # Meio aberto: uma requisição de teste por vez
+            if estado['testador'] is None or agora - estado['teste_desde'] > self.tempo_teste:
+                estado['testador'] = threading.get_ident()
+                estado['teste_desde'] = agora
+                return 0.0
+            if estado['testador'] == threading.get_ident():
+                return 0.0
+            return self.intervalo_consulta
+    
+    def registrar_sucesso(self, host: str):
+        with self._lock:
+            estado = self._estado(host)
+            estado['estado'] = self.FECHADO
+            estado['falhas'] = 0
+            estado['pausa'] = self.pausa
+            estado['testador'] = None
+    
+    def registrar_falha(self, host: str) -> bool:
+        """Registra uma falha; retorna True se o disjuntor abriu (ou reabriu) agora"""
+        with self._lock:
+            estado = self._estado(host)
+            agora = time.monotonic()
+            
+            if estado['estado'] == self.ABERTO:
+                return False  # Requisição iniciada antes da abertura
+            
+            if estado['estado'] == self.MEIO_ABERTO:
+                if estado['testador'] != threading.get_ident():
+                    return False  # Só a requisição de teste decide
+                # Teste falhou: reabrir com a pausa dobrada
+                estado['pausa'] = min(estado['pausa'] * 2, self.pausa_maxima)
+                self._abrir(estado, agora)
+                return True
+            
+            estado['falhas'] += 1
+            if estado['falhas'] < self.limite_falhas:
+                return False
+            estado['falhas'] = 0
+            self._abrir(estado, agora)
+            return True
+
+
+# Disjuntor compartilhado pelos scrapers do processo (BaseScraper usa este por padrão)
+DISJUNTOR_GLOBAL = DisjuntorPorHost()